@@ -7,8 +7,12 @@ from sqlalchemy.orm import Session
 from typing import List, Dict, Any, Optional
 from pydantic import BaseModel
 
-from database.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from database.database import get_db, get_async_db
 from database.operations import AnnotationOperations, ImageOperations
+from database.async_operations import (
+    AsyncAnnotationOperations, AsyncImageOperations, AsyncDatasetOperations, AsyncLabelOperations
+)
 from database.models import Annotation
 
 router = APIRouter()
@@ -181,10 +185,10 @@ class AnnotationData(BaseModel):
     annotations: List[Dict[str, Any]]
 
 @router.get("/{image_id}/annotations")
-async def get_image_annotations(image_id: str, db: Session = Depends(get_db)):
+async def get_image_annotations(image_id: str, db: AsyncSession = Depends(get_async_db)):
     """Get all annotations for a specific image"""
     try:
-        annotations = AnnotationOperations.get_annotations_by_image(db, image_id)
+        annotations = await AsyncAnnotationOperations.get_annotations_by_image(db, image_id)
         
         # Convert to frontend format (x, y, width, height)
         annotation_list = []
@@ -212,7 +216,7 @@ async def get_image_annotations(image_id: str, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Error retrieving annotations: {str(e)}")
 
 @router.post("/{image_id}/annotations")
-async def save_image_annotations(image_id: str, data: AnnotationData, db: Session = Depends(get_db)):
+async def save_image_annotations(image_id: str, data: AnnotationData, db: AsyncSession = Depends(get_async_db)):
     """Save annotations for a specific image"""
     try:
         annotations = data.annotations
@@ -222,90 +226,51 @@ async def save_image_annotations(image_id: str, data: AnnotationData, db: Sessio
         # AnnotationOperations.delete_annotations_by_image(db, image_id)
         
         # First, get the project_id for this image
-        from database.models import Image, Dataset
-        image = db.query(Image).filter(Image.id == image_id).first()
+        image = await AsyncImageOperations.get_image(db, image_id)
         if not image:
             raise HTTPException(status_code=404, detail=f"Image with ID {image_id} not found")
             
-        dataset = db.query(Dataset).filter(Dataset.id == image.dataset_id).first()
+        dataset = await AsyncDatasetOperations.get_dataset(db, image.dataset_id)
         if not dataset:
             raise HTTPException(status_code=404, detail=f"Dataset with ID {image.dataset_id} not found")
             
         project_id = dataset.project_id
         print(f"Image {image_id} is in dataset {image.dataset_id}, project {project_id}")
         
-        # Create new annotations
-        saved_annotations = []
+        # CRITICAL: Ensure every label used exists in the labels table for this project
+        # (a new label takes the color of its first annotation, or a random one)
+        colors = {}
+        for ann in annotations:
+            if ann.get("color"):
+                colors.setdefault(ann.get("class_name", "unknown"), ann["color"])
+        new_labels = await AsyncLabelOperations.ensure_labels(
+            db, project_id, [ann.get("class_name", "unknown") for ann in annotations], colors
+        )
+        for label in new_labels:
+            print(f"Created new label '{label.name}' with color {label.color} for project {project_id}")
+        
+        new_annotations = []
         for ann in annotations:
-            # Get the class name for this annotation
-            class_name = ann.get("class_name", "unknown")
-            
-            # CRITICAL: Ensure this label exists in the labels table for this project
-            from database.models import Label
-            
-            # First check if the label already exists
-            existing_label = db.query(Label).filter(
-                Label.name == class_name,
-                Label.project_id == project_id
-            ).first()
-            
-            if not existing_label:
-                # Label doesn't exist, create it
-                import random
-                
-                # Generate a random color if not provided
-                color = ann.get("color")
-                if not color:
-                    r = random.randint(0, 255)
-                    g = random.randint(0, 255)
-                    b = random.randint(0, 255)
-                    color = f"#{r:02x}{g:02x}{b:02x}"
-                
-                print(f"Creating new label '{class_name}' with color {color} for project {project_id}")
-                new_label = Label(
-                    name=class_name,
-                    color=color,
-                    project_id=project_id
-                )
-                
-                db.add(new_label)
-                db.commit()
-                print(f"Created new label with ID {new_label.id}")
-            
             # Convert from x, y, width, height to x_min, y_min, x_max, y_max
             x = float(ann.get("x", 0))
             y = float(ann.get("y", 0))
             width = float(ann.get("width", 0))
             height = float(ann.get("height", 0))
             
-            x_min = x
-            y_min = y
-            x_max = x + width
-            y_max = y + height
-            
-            # Create annotation in database
-            new_annotation = AnnotationOperations.create_annotation(
-                db=db,
-                image_id=image_id,
-                class_name=class_name,
-                class_id=ann.get("class_id", 0),
-                x_min=x_min,
-                y_min=y_min,
-                x_max=x_max,
-                y_max=y_max,
-                confidence=float(ann.get("confidence", 1.0)),
-                segmentation=ann.get("segmentation")
-            )
-            
-            if new_annotation:
-                saved_annotations.append(new_annotation)
+            new_annotations.append({
+                "class_name": ann.get("class_name", "unknown"),
+                "class_id": ann.get("class_id", 0),
+                "x_min": x,
+                "y_min": y,
+                "x_max": x + width,
+                "y_max": y + height,
+                "confidence": float(ann.get("confidence", 1.0)),
+                "segmentation": ann.get("segmentation")
+            })
         
-        # Update image status to labeled if annotations exist
-        if saved_annotations:
-            ImageOperations.update_image_status(db, image_id, is_labeled=True)
-        else:
-            # If no annotations, mark as unlabeled
-            ImageOperations.update_image_status(db, image_id, is_labeled=False)
+        # Create annotations in one transaction; the image is marked labeled
+        # (or unlabeled when there are none) and its dataset stats refreshed
+        saved_annotations = await AsyncAnnotationOperations.create_annotations(db, image_id, new_annotations)
         
         return {
             "message": "Annotations saved successfully",
@@ -270,14 +270,18 @@ async def get_dataset_split_stats(
 async def get_images_by_split(
     dataset_id: str,
     split_section: Optional[str] = None,
+    limit: int = 100,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
     """
-    Get a list of images for a dataset, optionally filtered by split section
+    Get a page of labeled images for a dataset, optionally filtered by split section
     
     Parameters:
     - dataset_id: The dataset ID
     - split_section: Optional filter for split section (train, val, test)
+    - limit: Images per page
+    - cursor: next_cursor of the previous page
     
     Returns a list of images with their split section information
     """
@@ -286,31 +290,20 @@ async def get_images_by_split(
         dataset = DatasetOperations.get_dataset(db, dataset_id)
         if not dataset:
             raise HTTPException(status_code=404, detail="Dataset not found")
-            
-        # Get all labeled images for this dataset
-        labeled_images = ImageOperations.get_images_by_dataset(
-            db, dataset_id, labeled_only=True
-        )
         
-        # Filter by split section if provided
-        if split_section:
-            if split_section not in ["train", "val", "test"]:
-                raise HTTPException(status_code=400, detail="Invalid split section. Must be train, val, or test")
-            
-            # Filter images safely, handling the case where split_section column doesn't exist
-            filtered_images = []
-            for img in labeled_images:
-                try:
-                    img_split = getattr(img, "split_section", "train")
-                    if img_split == split_section:
-                        filtered_images.append(img)
-                except Exception as e:
-                    print(f"Error accessing split_section: {str(e)}")
-                    # Default behavior: include in train split if no split_section
-                    if split_section == "train":
-                        filtered_images.append(img)
+        if split_section and split_section not in ["train", "val", "test"]:
+            raise HTTPException(status_code=400, detail="Invalid split section. Must be train, val, or test")
             
-            labeled_images = filtered_images
+        # Labeled images of the split, filtered and paged in SQL
+        try:
+            labeled_images, next_cursor = ImageOperations.get_images_by_dataset_page(
+                db, dataset_id, limit=limit, cursor=cursor, labeled_only=True, split_section=split_section
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        total = ImageOperations.count_images_by_dataset(
+            db, dataset_id, labeled_only=True, split_section=split_section
+        )
         
         # Format response
         result = []
@@ -325,8 +318,10 @@ async def get_images_by_split(
             })
         
         return {
-            "total": len(result),
-            "images": result
+            "total": total,
+            "images": result,
+            "has_more": next_cursor is not None,
+            "next_cursor": next_cursor
         }
         
     except HTTPException:
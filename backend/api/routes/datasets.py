@@ -8,11 +8,13 @@ from sqlalchemy.orm import Session
 from typing import List, Dict, Any, Optional
 from pydantic import BaseModel
 
-from database.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from database.database import get_db, get_async_db
 from database.operations import (
     DatasetOperations, ProjectOperations, ImageOperations, 
     AutoLabelJobOperations
 )
+from database.async_operations import AsyncDatasetOperations, AsyncImageOperations
 from core.file_handler import file_handler
 from core.auto_labeler import auto_labeler
 from models.model_manager import model_manager
@@ -349,19 +351,28 @@ async def get_dataset_images(
     skip: int = 0,
     limit: int = 50,
     labeled_only: Optional[bool] = None,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get images in a dataset"""
+    """
+    Get images in a dataset, oldest first
+    
+    Pass the returned next_cursor as cursor to fetch the following page;
+    skip still works for jumping to a page.
+    """
     try:
         # Verify dataset exists
-        dataset = DatasetOperations.get_dataset(db, dataset_id)
+        dataset = await AsyncDatasetOperations.get_dataset(db, dataset_id)
         if not dataset:
             raise HTTPException(status_code=404, detail="Dataset not found")
         
         # Get images
-        images = ImageOperations.get_images_by_dataset(
-            db, dataset_id, skip=skip, limit=limit, labeled_only=labeled_only
-        )
+        try:
+            images, next_cursor = await AsyncImageOperations.get_images_by_dataset_page(
+                db, dataset_id, limit=limit, cursor=cursor, skip=skip, labeled_only=labeled_only
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         
         image_list = []
         for image in images:
@@ -387,7 +398,9 @@ async def get_dataset_images(
             "images": image_list,
             "total_returned": len(image_list),
             "skip": skip,
-            "limit": limit
+            "limit": limit,
+            "has_more": next_cursor is not None,
+            "next_cursor": next_cursor
         }
         
     except HTTPException:
@@ -400,12 +413,12 @@ async def get_dataset_images(
 @router.get("/images/{image_id}")
 async def get_image_by_id(
     image_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get individual image information by ID"""
     try:
         # Get image
-        image = ImageOperations.get_image(db, image_id)
+        image = await AsyncImageOperations.get_image(db, image_id)
         if not image:
             raise HTTPException(status_code=404, detail="Image not found")
         
@@ -16,6 +16,7 @@ from core.transformation_config import (
     get_dual_value_range,
     calculate_max_images_per_original
 )
+from core.release_plan import get_release_plan, load_plan_records, invalidate_release_plan
 
 router = APIRouter(prefix="/image-transformations", tags=["transformations"])
 logger = logging.getLogger(__name__)
@@ -314,6 +315,7 @@ def update_release_version(
             updated_count += 1
         
         db.commit()
+        invalidate_release_plan(update_data.old_release_version)
         
         logger.info(f"Updated {updated_count} transformations from version {update_data.old_release_version} to {update_data.new_release_version}")
         
@@ -369,6 +371,7 @@ def update_transformation(
 
         if not db_transformation:
             raise HTTPException(status_code=404, detail=f"Transformation with ID {transformation_id} not found")
+        previous_release_version = db_transformation.release_version
 
         # Update fields if provided
         if transformation.transformation_type is not None:
@@ -403,6 +406,11 @@ def update_transformation(
 
         db.commit()
         db.refresh(db_transformation)
+        
+        # Plans compiled from the old records are never looked up again
+        invalidate_release_plan(previous_release_version)
+        if db_transformation.release_version != previous_release_version:
+            invalidate_release_plan(db_transformation.release_version)
 
         logger.info(f"Updated transformation: {db_transformation.id}")
         return db_transformation
@@ -429,8 +437,10 @@ def delete_transformation(
         if not transformation:
             raise HTTPException(status_code=404, detail=f"Transformation with ID {transformation_id} not found")
 
+        release_version = transformation.release_version
         db.delete(transformation)
         db.commit()
+        invalidate_release_plan(release_version)
 
         logger.info(f"Deleted transformation: {transformation_id}")
         return {"message": f"Transformation {transformation_id} deleted successfully"}
@@ -590,29 +600,15 @@ def calculate_max_images_endpoint(
     Shows the calculated limit before user clicks Release button
     """
     try:
-        # Get transformations for the release version
-        transformations = db.query(ImageTransformation).filter(
-            ImageTransformation.release_version == release_version,
-            ImageTransformation.is_enabled == True
-        ).all()
-
-        # Convert to list format for calculation
-        transformation_list = []
-        for t in transformations:
-            transformation_list.append({
-                "transformation_type": t.transformation_type,
-                "enabled": t.is_enabled,
-                "is_dual_value": t.is_dual_value,
-                "parameters": t.parameters
-            })
-
-        # Calculate max images
-        result = calculate_max_images_per_original(transformation_list)
+        # Same records as release generation, so the compiled plan is shared with it and the priority preview
+        transformation_records = load_plan_records(db, release_version)
+        plan = get_release_plan(release_version, transformation_records)
+        result = plan.max_images()
         
         # Add additional info for UI
         result.update({
             "release_version": release_version,
-            "total_transformations": len(transformation_list),
+            "total_transformations": len(transformation_records),
             "calculation_timestamp": datetime.now().isoformat()
         })
 
@@ -634,61 +630,7 @@ def get_priority_preview(
     Shows what images will be generated in what order
     """
     try:
-        # Get transformations for the release version
-        transformations = db.query(ImageTransformation).filter(
-            ImageTransformation.release_version == release_version,
-            ImageTransformation.is_enabled == True
-        ).all()
-
-        preview = {
-            "release_version": release_version,
-            "has_dual_value": False,
-            "priority_order": [],
-            "total_guaranteed_images": 0
-        }
-
-        dual_value_transformations = []
-        for t in transformations:
-            if is_dual_value_transformation(t.transformation_type):
-                dual_value_transformations.append(t)
-                preview["has_dual_value"] = True
-
-        if dual_value_transformations:
-            # Generate priority order preview
-            priority_order = []
-            
-            # Priority 1: User values
-            for i, t in enumerate(dual_value_transformations, 1):
-                priority_order.append({
-                    "priority": 1,
-                    "order": i,
-                    "type": "user_value",
-                    "transformation": t.transformation_type,
-                    "parameters": t.parameters,
-                    "description": f"User selected {t.transformation_type}"
-                })
-            
-            # Priority 2: Auto values
-            for i, t in enumerate(dual_value_transformations, len(dual_value_transformations) + 1):
-                auto_params = {}
-                for param_name, param_value in t.parameters.items():
-                    if isinstance(param_value, dict) and 'user_value' in param_value:
-                        auto_params[param_name] = param_value.get('auto_value', 
-                                                               generate_auto_value(t.transformation_type, param_value['user_value']))
-                    else:
-                        auto_params[param_name] = generate_auto_value(t.transformation_type, param_value)
-                
-                priority_order.append({
-                    "priority": 2,
-                    "order": i,
-                    "type": "auto_value",
-                    "transformation": t.transformation_type,
-                    "parameters": auto_params,
-                    "description": f"Auto-generated {t.transformation_type} (opposite value)"
-                })
-            
-            preview["priority_order"] = priority_order
-            preview["total_guaranteed_images"] = len(priority_order)
+        preview = get_release_plan(release_version, load_plan_records(db, release_version)).priority_preview()
 
         logger.info(f"Generated priority preview for version {release_version}")
         return preview
@@ -849,7 +791,7 @@ def get_release_config(
             "release_version": release_version,
             "max_images_per_original": max_allowed,
             "user_selected_images_per_original": user_selected,
-            "total_transformations": len(transformations),
+            "total_transformations": len(transformation_records),
             "transformation_types": [t.transformation_type for t in transformations]
         }
         
@@ -1,7 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, Body
+from sqlalchemy import select, delete
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from database.models import Label
-from database.database import get_db
+from database.database import get_db, get_async_db
+from database.async_operations import AsyncProjectOperations, AsyncLabelOperations
 from typing import List, Optional
 from pydantic import BaseModel
 
@@ -19,15 +22,14 @@ class LabelResponse(BaseModel):
     project_id: int
 
 @router.get("/{project_id}/labels")
-def get_labels(
+async def get_labels(
     project_id: int, 
     force_refresh: bool = False,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all labels for a project"""
     # First verify the project exists
-    from database.models import Project
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = await AsyncProjectOperations.get_project(db, project_id)
     if not project:
         raise HTTPException(status_code=404, detail=f"Project with ID {project_id} not found")
     
@@ -37,65 +39,38 @@ def get_labels(
         
         # 1. Clean up any orphaned labels
         from database.models import Project
-        existing_project_ids = [p.id for p in db.query(Project).all()]
-        orphaned_count = db.query(Label).filter(
-            (Label.project_id.is_(None)) | 
-            (~Label.project_id.in_(existing_project_ids))
-        ).delete(synchronize_session=False)
+        result = await db.execute(
+            delete(Label).where(
+                (Label.project_id.is_(None)) | 
+                (~Label.project_id.in_(select(Project.id)))
+            ).execution_options(synchronize_session=False)
+        )
+        orphaned_count = result.rowcount
         
         if orphaned_count > 0:
             print(f"Deleted {orphaned_count} orphaned labels")
-            db.commit()
+            await db.commit()
     
     # Get all labels for this project
-    labels = db.query(Label).filter(Label.project_id == project_id).all()
+    labels = await AsyncLabelOperations.get_labels_by_project(db, project_id)
     
     # Log for debugging
     print(f"GET /projects/{project_id}/labels with force_refresh={force_refresh}")
     print(f"Found {len(labels)} labels for project {project_id}")
-    print(f"Found {len(labels)} labels in database")
     
     # Get all annotation labels used in this project (across all datasets)
     # This ensures we show labels from all datasets in the project
-    from database.models import Annotation, Image, Dataset
-    
-    # Get annotations with labels used in this project
-    annotations_query = db.query(Annotation.class_name).distinct().join(
-        Image, Annotation.image_id == Image.id
-    ).join(
-        Dataset, Image.dataset_id == Dataset.id
-    ).filter(
-        Dataset.project_id == project_id
-    ).all()
-    
-    annotation_classes = set(ann[0] for ann in annotations_query if ann[0])
+    annotation_classes = set(await AsyncLabelOperations.get_project_class_names(db, project_id))
     
     # Check if there are any class names not in the labels table
     existing_label_names = set(label.name for label in labels)
     missing_labels = annotation_classes - existing_label_names
     
     # If we found labels used in annotations but not in the labels table,
-    # generate and add them
+    # generate them (random colors) and refresh the labels list
     if missing_labels:
-        import random
-        for class_name in missing_labels:
-            # Generate a random color
-            r = random.randint(0, 255)
-            g = random.randint(0, 255)
-            b = random.randint(0, 255)
-            color = f"#{r:02x}{g:02x}{b:02x}"
-            
-            # Create the new label
-            new_label = Label(
-                name=class_name,
-                color=color,
-                project_id=project_id
-            )
-            db.add(new_label)
-        
-        # Commit changes and refresh the labels list
-        db.commit()
-        labels = db.query(Label).filter(Label.project_id == project_id).all()
+        await AsyncLabelOperations.ensure_labels(db, project_id, sorted(missing_labels))
+        labels = await AsyncLabelOperations.get_labels_by_project(db, project_id)
     
     return labels
 
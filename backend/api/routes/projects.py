@@ -16,9 +16,13 @@ from PIL import Image
 import io
 from pathlib import Path
 
-from database.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from database.database import get_db, get_async_db
 from database.operations import ProjectOperations, DatasetOperations, ImageOperations, AnnotationOperations
+from database.async_operations import AsyncProjectOperations, AsyncImageOperations
+from database.models import Release
 from models.model_manager import model_manager
+from core.blob_store import BlobStore
 from core.config import settings
 
 # Helper function to get standard project paths
@@ -29,6 +33,14 @@ def get_project_path(project_name):
 def get_dataset_path(project_name, workflow_stage, dataset_name):
     """Get the standard path to a dataset folder"""
     return get_project_path(project_name) / workflow_stage / dataset_name
+
+def release_project_blobs(db: Session, project_id):
+    """Drop the blob store references of a project's releases once their folders are deleted"""
+    blob_store = BlobStore(db)
+    for (release_id,) in db.query(Release.id).filter(Release.project_id == project_id).all():
+        blob_store.release_owner(f"release:{release_id}")
+    # Unreferenced blobs are evicted once the store is over its size cap
+    blob_store.collect_garbage()
 from utils.path_utils import path_manager
 
 router = APIRouter()
@@ -336,6 +348,12 @@ async def delete_project(project_id: str, db: Session = Depends(get_db)):
             print(f"Warning: Failed to delete project folder: {str(folder_error)}")
             # Don't fail the entire operation if folder deletion fails
         
+        # The project's releases were in its folder
+        try:
+            release_project_blobs(db, project_id)
+        except Exception as blob_error:
+            print(f"Warning: Failed to release the project's derived blobs: {str(blob_error)}")
+        
         return {"message": "Project deleted successfully"}
         
     except HTTPException:
@@ -860,6 +878,12 @@ async def clear_project_data(project_id: str, db: Session = Depends(get_db)):
         except Exception as folder_error:
             print(f"Warning: Failed to clear project folder: {str(folder_error)}")
         
+        # Clearing the folder also removed the project's releases
+        try:
+            release_project_blobs(db, project_id)
+        except Exception as blob_error:
+            print(f"Warning: Failed to release the project's derived blobs: {str(blob_error)}")
+        
         return {
             "success": True,
             "message": f"All data cleared from project '{project.name}'",
@@ -1488,80 +1512,79 @@ async def get_project_images(
     limit: int = 50,
     offset: int = 0,
     split_type: Optional[str] = None,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get images for a project with pagination and optional split_type filtering"""
+    """
+    Get images for a project with pagination and optional split_type filtering
+    
+    Pass the returned next_cursor as cursor to fetch the following page in
+    constant time; offset still works for jumping to a page.
+    """
     try:
         # Check if project exists
-        project = ProjectOperations.get_project(db, project_id)
+        project = await AsyncProjectOperations.get_project(db, project_id)
         if not project:
             raise HTTPException(status_code=404, detail="Project not found")
         
-        # Get all datasets for this project
-        datasets = DatasetOperations.get_datasets_by_project(db, project_id)
-        
-        # Get images from all datasets
-        all_images = []
-        for dataset in datasets:
-            images = ImageOperations.get_images_by_dataset(db, dataset.id)
-            for image in images:
-                # Filter by split_type if specified
-                if split_type and hasattr(image, 'split_type') and image.split_type != split_type:
-                    continue
-                    
-                # Get annotations for this image to extract class names
-                annotations = AnnotationOperations.get_annotations_by_image(db, image.id)
-                annotation_data = []
-                class_names = []
-                
-                for annotation in annotations:
-                    annotation_info = {
-                        "id": annotation.id,
-                        "class_name": annotation.class_name,
-                        "class_id": annotation.class_id,
-                        "x_min": annotation.x_min,
-                        "y_min": annotation.y_min,
-                        "x_max": annotation.x_max,
-                        "y_max": annotation.y_max,
-                        "confidence": annotation.confidence,
-                        "is_auto_generated": annotation.is_auto_generated
-                    }
-                    annotation_data.append(annotation_info)
-                    if annotation.class_name and annotation.class_name not in class_names:
-                        class_names.append(annotation.class_name)
+        try:
+            rows, total_images, next_cursor = await AsyncImageOperations.get_project_images_page(
+                db, project_id, limit=limit, offset=offset, split_type=split_type, cursor=cursor
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        
+        paginated_images = []
+        for image, dataset_name in rows:
+            # Annotations were loaded with the page, in one query
+            annotation_data = []
+            class_names = []
+            
+            for annotation in image.annotations:
+                annotation_info = {
+                    "id": annotation.id,
+                    "class_name": annotation.class_name,
+                    "class_id": annotation.class_id,
+                    "x_min": annotation.x_min,
+                    "y_min": annotation.y_min,
+                    "x_max": annotation.x_max,
+                    "y_max": annotation.y_max,
+                    "confidence": annotation.confidence,
+                    "is_auto_generated": annotation.is_auto_generated
+                }
+                annotation_data.append(annotation_info)
+                if annotation.class_name and annotation.class_name not in class_names:
+                    class_names.append(annotation.class_name)
 
-                all_images.append({
-                    "id": image.id,
-                    "filename": image.filename,
-                    "original_filename": image.original_filename,
-                    "file_path": image.file_path,
-                    "dataset_id": image.dataset_id,
-                    "dataset_name": dataset.name,
-                    "width": image.width,
-                    "height": image.height,
-                    "file_size": image.file_size,
-                    "format": image.format,
-                    "split_type": getattr(image, 'split_type', None),
-                    "split_section": getattr(image, 'split_section', None),
-                    "is_labeled": getattr(image, 'is_labeled', False),
-                    "has_annotation": getattr(image, 'is_labeled', False),
-                    "annotation_status": "labeled" if getattr(image, 'is_labeled', False) else "unlabeled",
-                    "annotations": annotation_data,
-                    "class_names": class_names,
-                    "created_at": image.created_at,
-                    "updated_at": image.updated_at
-                })
-        
-        # Apply pagination
-        total_images = len(all_images)
-        paginated_images = all_images[offset:offset + limit]
+            paginated_images.append({
+                "id": image.id,
+                "filename": image.filename,
+                "original_filename": image.original_filename,
+                "file_path": image.file_path,
+                "dataset_id": image.dataset_id,
+                "dataset_name": dataset_name,
+                "width": image.width,
+                "height": image.height,
+                "file_size": image.file_size,
+                "format": image.format,
+                "split_type": getattr(image, 'split_type', None),
+                "split_section": getattr(image, 'split_section', None),
+                "is_labeled": getattr(image, 'is_labeled', False),
+                "has_annotation": getattr(image, 'is_labeled', False),
+                "annotation_status": "labeled" if getattr(image, 'is_labeled', False) else "unlabeled",
+                "annotations": annotation_data,
+                "class_names": class_names,
+                "created_at": image.created_at,
+                "updated_at": image.updated_at
+            })
         
         return {
             "images": paginated_images,
             "total": total_images,
             "limit": limit,
             "offset": offset,
-            "has_more": offset + limit < total_images
+            "has_more": next_cursor is not None,
+            "next_cursor": next_cursor
         }
         
     except HTTPException:
@@ -4,10 +4,10 @@ Integrates new release generation system with existing functionality
 """
 
 from pathlib import Path
-from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
+from fastapi import APIRouter, HTTPException, Depends
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
-from typing import List, Optional
+from typing import List, Optional, Dict, Any
 from datetime import datetime
 import os
 import json
@@ -20,11 +20,17 @@ import logging
 import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), "..", ".."))
 from core.release_controller import ReleaseController, ReleaseConfig, create_release_controller
+from core.release_jobs import (
+    enqueue_release_job, get_latest_job_for_release, get_release_job_async,
+    get_latest_job_for_release_async, release_job_to_dict
+)
 from core.transformation_schema import generate_release_configurations
+from core.image_generator import ENCODER_PROFILES
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent.parent
 
-from database.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from database.database import get_db, get_async_db
 from database.models import Project, Dataset, Image, Annotation, Release, ImageTransformation
 from pydantic import BaseModel
 
@@ -46,6 +52,9 @@ class EnhancedReleaseCreate(BaseModel):
     sampling_strategy: str = "intelligent"
     output_format: str = "jpg"
     include_original: bool = True
+    max_workers: Optional[int] = None  # Worker processes for image generation (None = server default)
+    random_seed: Optional[int] = None  # Release seed for reproducible augmentation (None = derived from the project id)
+    encoder_profile: Optional[str] = None  # fast, balanced or archival output encoding (None = server default)
 
 class ReleaseProgressResponse(BaseModel):
     release_id: str
@@ -58,6 +67,7 @@ class ReleaseProgressResponse(BaseModel):
     error_message: Optional[str] = None
     started_at: Optional[str] = None
     completed_at: Optional[str] = None
+    pipeline_stats: Optional[Dict[str, Any]] = None
 
 # Original release creation model (for backward compatibility)
 class ReleaseCreate(BaseModel):
@@ -83,11 +93,13 @@ class DatasetRebalanceRequest(BaseModel):
 @router.post("/releases/generate")
 async def generate_enhanced_release(
     payload: EnhancedReleaseCreate, 
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """
     Generate a release using the new enhanced release system
+    
+    The release is queued as a job and generated by a release worker process
+    (see release_worker.py); poll /releases/jobs/{job_id} for its progress.
     """
     try:
         # Validate project exists
@@ -101,6 +113,9 @@ async def generate_enhanced_release(
             if not dataset:
                 raise HTTPException(status_code=404, detail=f"Dataset {dataset_id} not found")
         
+        if payload.encoder_profile and payload.encoder_profile not in ENCODER_PROFILES:
+            raise HTTPException(status_code=400, detail=f"Unknown encoder profile: {payload.encoder_profile}")
+        
         # Create release configuration
         config = ReleaseConfig(
             release_name=payload.release_name,
@@ -111,26 +126,20 @@ async def generate_enhanced_release(
             task_type=payload.task_type,
             images_per_original=payload.images_per_original,
             output_format=payload.output_format,
-            include_original=payload.include_original
+            include_original=payload.include_original,
+            max_workers=payload.max_workers,
+            random_seed=payload.random_seed,
+            encoder_profile=payload.encoder_profile
         )
         
-        # Create release controller
-        controller = create_release_controller(db)
-        
-        # Start release generation in background
-        def generate_release_task():
-            try:
-                release_id = controller.generate_release(config, payload.release_version)
-                logger.info(f"Successfully generated release: {release_id}")
-            except Exception as e:
-                logger.error(f"Failed to generate release: {str(e)}")
-        
-        background_tasks.add_task(generate_release_task)
+        # Queue release generation for a release worker
+        job = enqueue_release_job(db, config, payload.release_version)
         
         # Return immediate response
         return {
-            "message": "Release generation started",
-            "status": "processing",
+            "message": "Release generation queued",
+            "status": "queued",
+            "job_id": job.id,
             "release_version": payload.release_version
         }
         
@@ -141,43 +150,46 @@ async def generate_enhanced_release(
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/releases/{release_id}/progress")
-async def get_release_progress(release_id: str, db: Session = Depends(get_db)):
+async def get_release_progress(release_id: str, db: AsyncSession = Depends(get_async_db)):
     """
     Get progress of release generation
+    
+    Polled by the UI while a release runs; every query is awaited, so polling
+    never holds up other requests.
     """
     try:
-        controller = create_release_controller(db)
-        progress = controller.get_release_progress(release_id)
-        
-        if not progress:
-            # Check if release exists in database
-            release = db.query(Release).filter(Release.id == release_id).first()
-            if not release:
-                raise HTTPException(status_code=404, detail="Release not found")
-            
-            # Return completed status if release exists but no progress tracking
+        # Progress published by the release worker
+        job = await get_latest_job_for_release_async(db, release_id)
+        if job and job.status != "completed":
             return ReleaseProgressResponse(
                 release_id=release_id,
-                status="completed",
-                progress_percentage=100.0,
-                current_step="completed",
-                total_images=release.total_original_images or 0,
-                processed_images=release.total_original_images or 0,
-                generated_images=release.total_augmented_images or 0,
-                completed_at=release.created_at.isoformat() if release.created_at else None
+                status="processing" if job.status == "running" else job.status,
+                progress_percentage=job.progress_percentage or 0.0,
+                current_step=job.current_step or job.status,
+                total_images=job.total_images or 0,
+                processed_images=job.processed_images or 0,
+                generated_images=job.generated_images or 0,
+                error_message=job.error_message,
+                started_at=job.started_at.isoformat() if job.started_at else None,
+                completed_at=job.completed_at.isoformat() if job.completed_at else None,
+                pipeline_stats=job.pipeline_stats
             )
         
+        # Check if release exists in database
+        release = await db.get(Release, release_id)
+        if not release:
+            raise HTTPException(status_code=404, detail="Release not found")
+        
+        # Return completed status if release exists but no job is working on it
         return ReleaseProgressResponse(
-            release_id=progress.release_id,
-            status=progress.status,
-            progress_percentage=progress.progress_percentage,
-            current_step=progress.current_step,
-            total_images=progress.total_images,
-            processed_images=progress.processed_images,
-            generated_images=progress.generated_images,
-            error_message=progress.error_message,
-            started_at=progress.started_at.isoformat() if progress.started_at else None,
-            completed_at=progress.completed_at.isoformat() if progress.completed_at else None
+            release_id=release_id,
+            status="completed",
+            progress_percentage=100.0,
+            current_step="completed",
+            total_images=release.total_original_images or 0,
+            processed_images=release.total_original_images or 0,
+            generated_images=release.total_augmented_images or 0,
+            completed_at=release.created_at.isoformat() if release.created_at else None
         )
         
     except HTTPException:
@@ -186,6 +198,58 @@ async def get_release_progress(release_id: str, db: Session = Depends(get_db)):
         logger.error(f"Failed to get release progress: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/releases/jobs/{job_id}")
+async def get_release_job_status(job_id: str, db: AsyncSession = Depends(get_async_db)):
+    """
+    Get status and progress of a queued or running release job
+    """
+    job = await get_release_job_async(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Release job not found")
+    return release_job_to_dict(job)
+
+@router.post("/releases/{release_id}/resume")
+async def resume_release(
+    release_id: str,
+    db: Session = Depends(get_db)
+):
+    """
+    Resume an interrupted or failed release from its checkpoint manifest
+    """
+    try:
+        release = db.query(Release).filter(Release.id == release_id).first()
+        if not release:
+            raise HTTPException(status_code=404, detail="Release not found")
+        
+        controller = create_release_controller(db)
+        manifest = controller.get_release_manifest(release_id)
+        if manifest is None:
+            raise HTTPException(status_code=409, detail="Release has no checkpoint manifest and cannot be resumed")
+        if manifest.status == "completed":
+            raise HTTPException(status_code=409, detail="Release is already completed")
+        
+        active_job = get_latest_job_for_release(db, release_id)
+        if active_job and active_job.status in ("queued", "running"):
+            raise HTTPException(status_code=409, detail=f"Release already has an active job: {active_job.id}")
+        
+        # Queue the remainder of the release for a release worker
+        job = enqueue_release_job(db, ReleaseConfig(**manifest.config), manifest.release_version, release_id)
+        
+        return {
+            "message": "Release generation resume queued",
+            "status": "queued",
+            "job_id": job.id,
+            "release_id": release_id,
+            "release_version": manifest.release_version,
+            "completed_augmentations": manifest.completed_count()
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to resume release: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.get("/projects/{project_id}/releases/history")
 async def get_project_release_history(project_id: int, limit: int = 10, db: Session = Depends(get_db)):
     """
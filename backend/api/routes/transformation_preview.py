@@ -5,8 +5,12 @@ Handles real-time image transformation preview generation
 
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException
 from fastapi.responses import JSONResponse
-from typing import Dict, Any, List
+from fastapi.concurrency import run_in_threadpool
+from typing import Dict, Any, List, Optional, Tuple
 import json
+import time
+import base64
+import hashlib
 import tempfile
 import os
 import numpy as np
@@ -23,6 +27,9 @@ router = APIRouter(prefix="/api/transformation", tags=["transformation"])
 logger = logging.getLogger(__name__)
 transformer = ImageTransformer()
 
+# Longest side of previews returned by /preview-with-image-id
+PREVIEW_MAX_SIZE = 400
+
 @router.post("/preview")
 async def generate_transformation_preview(
     image: UploadFile = File(...),
@@ -224,6 +231,81 @@ async def get_transformation_presets():
 
 # ==================== NEW UI ENHANCEMENT ENDPOINTS ====================
 
+def _preview_cache_key(image_path: str, transform_config: Dict[str, Any]) -> Optional[str]:
+    """Derivation key of an image preview, or None if it must not be cached (random transforms, missing file)"""
+    from core.image_generator import ImageAugmentationEngine
+    from core.augmentation_cache import transform_engine_fields
+    
+    if not all(ImageAugmentationEngine._is_shareable_step(name, params) for name, params in transform_config.items()):
+        return None
+    try:
+        stat = os.stat(image_path)
+    except OSError:
+        return None
+    # Same engine fields as release outputs, so switching backend or mode never serves old pixels
+    payload = ["preview", image_path, stat.st_size, stat.st_mtime_ns, transform_config, PREVIEW_MAX_SIZE,
+               transformer.execution_mode, transform_engine_fields()]
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+def _load_cached_preview(preview_key: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """(base64 data URL, meta) of a preview stored under preview_key"""
+    from database.database import SessionLocal
+    from core.blob_store import BlobStore
+    
+    db = SessionLocal()
+    try:
+        cached = BlobStore(db).lookup(preview_key)
+    except Exception as e:
+        logger.warning(f"Preview cache lookup failed: {e}")
+        return None
+    finally:
+        db.close()
+    if not cached:
+        return None
+    path, meta = cached
+    with open(path, 'rb') as f:
+        return f"data:image/jpeg;base64,{base64.b64encode(f.read()).decode()}", meta
+
+def _store_cached_preview(preview_key: str, preview_base64: str,
+                          image_size: Tuple[int, int], preview_size: Tuple[int, int]) -> None:
+    """Keep an encoded preview in the blob store (unreferenced, so it is evicted first)"""
+    from database.database import SessionLocal
+    from core.blob_store import BlobStore
+    
+    db = SessionLocal()
+    try:
+        BlobStore(db).put_bytes(
+            base64.b64decode(preview_base64.split(',', 1)[1]), ".jpg", key=preview_key,
+            meta={"image_size": list(image_size), "preview_size": list(preview_size)}
+        )
+    except Exception as e:
+        logger.warning(f"Failed to cache preview: {e}")
+    finally:
+        db.close()
+
+def _preview_response(preview_base64: str, image_id: str, transform_config: Dict[str, Any], start_time: float,
+                      original_size: Tuple[int, int], preview_size: Tuple[int, int]) -> JSONResponse:
+    processing_time = int((time.time() - start_time) * 1000)
+    
+    return JSONResponse({
+        "success": True,
+        "data": {
+            "preview_image": preview_base64,
+            "original_image_id": image_id,
+            "applied_transformations": list(transform_config.keys()),
+            "transformation_count": len(transform_config),
+            "processing_time_ms": processing_time,
+            "image_dimensions": {
+                "width": original_size[0],
+                "height": original_size[1]
+            },
+            "preview_dimensions": {
+                "width": preview_size[0],
+                "height": preview_size[1]
+            }
+        }
+    })
+
 @router.post("/preview-with-image-id")
 async def generate_preview_with_image_id(
     image_id: str = Form(...),
@@ -291,6 +373,17 @@ async def generate_preview_with_image_id(
             # Join with forward slashes for Linux
             image_file_normalized = os.path.join(project_root, image_file_normalized).replace('\\', '/')
         
+        # Previews are derived images too: a repeated request is served from the blob store
+        preview_key = _preview_cache_key(image_file_normalized, transform_config)
+        if preview_key:
+            cached = await run_in_threadpool(_load_cached_preview, preview_key)
+            if cached:
+                preview_base64, meta = cached
+                return _preview_response(
+                    preview_base64, image_id, transform_config, start_time,
+                    tuple(meta["image_size"]), tuple(meta["preview_size"])
+                )
+        
         logger.info(f"Attempting to load image from: {image_file_normalized}")
         sample_image = cv2.imread(image_file_normalized)
         if sample_image is None:
@@ -310,7 +403,7 @@ async def generate_preview_with_image_id(
         
         # Resize for preview (max 400px)
         original_size = transformed_image.size
-        max_size = 400
+        max_size = PREVIEW_MAX_SIZE
         if max(original_size) > max_size:
             ratio = max_size / max(original_size)
             new_size = (int(original_size[0] * ratio), int(original_size[1] * ratio))
@@ -325,27 +418,14 @@ async def generate_preview_with_image_id(
             preview_array = cv2.cvtColor(preview_array, cv2.COLOR_RGB2BGR)
         
         preview_base64 = encode_image_to_base64(preview_array)
-        
-        processing_time = int((time.time() - start_time) * 1000)
-        
-        return JSONResponse({
-            "success": True,
-            "data": {
-                "preview_image": preview_base64,
-                "original_image_id": image_id,
-                "applied_transformations": list(transform_config.keys()),
-                "transformation_count": len(transform_config),
-                "processing_time_ms": processing_time,
-                "image_dimensions": {
-                    "width": original_size[0],
-                    "height": original_size[1]
-                },
-                "preview_dimensions": {
-                    "width": transformed_image.size[0],
-                    "height": transformed_image.size[1]
-                }
-            }
-        })
+        if preview_key:
+            await run_in_threadpool(
+                _store_cached_preview, preview_key, preview_base64, original_size, transformed_image.size
+            )
+        
+        return _preview_response(
+            preview_base64, image_id, transform_config, start_time, original_size, transformed_image.size
+        )
         
     except HTTPException:
         raise
@@ -0,0 +1,296 @@
+"""
+Array Transformer Service
+NumPy/OpenCV implementation of ImageTransformer that works on HWC uint8 arrays
+"""
+
+import numpy as np
+import cv2
+from PIL import Image
+from typing import Dict, Any, Tuple, Optional
+import logging
+
+from api.services.image_transformer import ImageTransformer
+
+logger = logging.getLogger(__name__)
+
+WHITE = (255, 255, 255)
+
+
+class ArrayImageTransformer(ImageTransformer):
+    """
+    ImageTransformer backend that takes and returns numpy arrays
+
+    Images are contiguous uint8 RGB arrays in HWC layout. A chain copies the
+    input once and then works on that buffer, in place wherever an operation
+    keeps the image size; PIL is only needed to decode and encode. Geometry,
+    parameter parsing and the fused execution mode are shared with the PIL
+    implementation, so annotations stay correct with either backend.
+    """
+
+    @staticmethod
+    def to_array(image: Image.Image) -> np.ndarray:
+        """Decoded PIL image to the contiguous RGB array this backend works on"""
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
+        return np.ascontiguousarray(np.asarray(image))
+
+    @staticmethod
+    def to_image(img_array: np.ndarray) -> Image.Image:
+        """Array back to a PIL image (for encoding)"""
+        return Image.fromarray(img_array)
+
+    # Image container hooks
+
+    def _image_size(self, img_array: np.ndarray) -> Tuple[int, int]:
+        return img_array.shape[1], img_array.shape[0]
+
+    def _copy_image(self, img_array: np.ndarray) -> np.ndarray:
+        return np.array(img_array, dtype=np.uint8, order='C', copy=True)
+
+    def _supports_fused(self, img_array: np.ndarray) -> bool:
+        return img_array.ndim == 3 and img_array.shape[2] == 3
+
+    def _warp_image(self, img_array: np.ndarray, matrix: np.ndarray, size: Tuple[int, int],
+                    fill: Optional[Tuple[int, int, int]]) -> np.ndarray:
+        return self._warp_array(img_array, matrix, size, fill)
+
+    def _apply_photometric_run(self, img_array: np.ndarray, run) -> np.ndarray:
+        return self._photometric_run_array(img_array, run)
+
+    def _warp_step(self, img_array: np.ndarray, transform_name: str, params: Dict[str, Any]) -> np.ndarray:
+        """Apply one geometric step as a single warp"""
+        size = self._image_size(img_array)
+        params = self.freeze_random_parameters(transform_name, params, size)
+        matrix = self.get_geometric_matrix(transform_name, params, size)
+        output_size = self.get_geometric_output_size(transform_name, params, size)
+        fill = self._geometric_fill(transform_name, params) or WHITE
+        return self._warp_array(img_array, matrix, output_size, fill)
+
+    @staticmethod
+    def _resize_array(img_array: np.ndarray, size: Tuple[int, int]) -> np.ndarray:
+        """Resize with area averaging when shrinking and Lanczos when enlarging"""
+        width, height = size
+        shrinking = width * height < img_array.shape[0] * img_array.shape[1]
+        return cv2.resize(img_array, (width, height),
+                          interpolation=cv2.INTER_AREA if shrinking else cv2.INTER_LANCZOS4)
+
+    @staticmethod
+    def _blend_with_constant(img_array: np.ndarray, factor: float, constant: float) -> None:
+        """In place: img = constant + factor * (img - constant), saturated (ImageEnhance semantics)"""
+        cv2.addWeighted(img_array, factor, img_array, 0, constant * (1.0 - factor), dst=img_array)
+
+    # Basic transformation methods
+
+    def _apply_resize(self, img_array: np.ndarray, params: Dict[str, Any]) -> np.ndarray:
+        """Resize with the same modes as the PIL implementation"""
+        target_width, target_height = self._resize_target(params)
+        resize_mode = params.get('resize_mode', 'stretch_to')
+        original_width, original_height = self._image_size(img_array)
+        original_aspect = original_width / original_height
+        target_aspect = target_width / target_height
+
+        if resize_mode == 'fill_center_crop':
+            if original_aspect > target_aspect:
+                scale_width, scale_height = int(target_height * original_aspect), target_height
+            else:
+                scale_width, scale_height = target_width, int(target_width / original_aspect)
+            scaled = self._resize_array(img_array, (scale_width, scale_height))
+            left = (scale_width - target_width) // 2
+            top = (scale_height - target_height) // 2
+            return np.ascontiguousarray(scaled[top:top + target_height, left:left + target_width])
+
+        if resize_mode in ('fit_within', 'fit_reflect_edges', 'fit_black_edges', 'fit_white_edges'):
+            if original_aspect > target_aspect:
+                new_width, new_height = target_width, int(target_width / original_aspect)
+            else:
+                new_width, new_height = int(target_height * original_aspect), target_height
+            fitted = self._resize_array(img_array, (new_width, new_height))
+            if resize_mode == 'fit_within':
+                return fitted
+
+            canvas = np.empty((target_height, target_width, 3), dtype=np.uint8)
+            canvas[...] = self._geometric_fill('resize', params)
+            paste_x = (target_width - new_width) // 2
+            paste_y = (target_height - new_height) // 2
+            canvas[paste_y:paste_y + new_height, paste_x:paste_x + new_width] = fitted
+            return canvas
+
+        # stretch_to (and unknown modes)
+        return self._resize_array(img_array, (target_width, target_height))
+
+    def _apply_rotate(self, img_array: np.ndarray, params: Dict[str, Any]) -> np.ndarray:
+        """Rotate counter-clockwise, expanding the canvas like PIL"""
+        angle = params.get('angle', 0) % 360
+        if angle == 0:
+            return img_array
+        if angle in (90, 180, 270):
+            # Exact, lossless transposes
+            return np.ascontiguousarray(np.rot90(img_array, k=int(angle // 90)))
+        return self._warp_step(img_array, 'rotate', params)
+
+    def _apply_flip(self, img_array: np.ndarray, params: Dict[str, Any]) -> np.ndarray:
+        """Flip horizontally and/or vertically"""
+        horizontal = params.get('horizontal', False)
+        vertical = params.get('vertical', False)
+        if horizontal and vertical:
+            return cv2.flip(img_array, -1)
+        if horizontal:
+            return cv2.flip(img_array, 1)
+        if vertical:
+            return cv2.flip(img_array, 0)
+        return img_array
+
+    def _apply_crop(self, img_array: np.ndarray, params: Dict[str, Any]) -> np.ndarray:
+        """Crop a window and scale it back to the original size"""
+        size = self._image_size(img_array)
+        window = self._crop_window(size, params)
+        if not window:
+            return img_array
+        left, top, new_width, new_height = window
+        return self._resize_array(img_array[top:top + new_height, left:left + new_width], size)
+
+    def _apply_brightness(self, img_array: np.ndarray, params: Dict[str, Any]) -> np.ndarray:
+        """Scale brightness in place"""
+        self._blend_with_constant(img_array, self._enhance_factor(params), 0.0)
+        return img_array
+
+    def _apply_contrast(self, img_array: np.ndarray, params: Dict[str, Any]) -> np.ndarray:
+        """Scale contrast around the mean grey level in place"""
+        mean = int(cv2.cvtColor(img_array, cv2.COLOR_RGB2GRAY).mean() + 0.5)
+        self._blend_with_constant(img_array, self._enhance_factor(params), mean)
+        return img_array
+
+    def _apply_blur(self, img_array: np.ndarray, params: Dict[str, Any]) -> np.ndarray:
+        """Gaussian, motion or box blur in place"""
+        blur_type, radius = self._blur_parameters(params)
+        if blur_type == 'motion':
+            box_radius = max(1, int(radius * 1.5))
+        elif blur_type == 'box':
+            box_radius = max(1, int(radius))
+        else:
+            # PIL's Gaussian radius is the standard deviation
+            cv2.GaussianBlur(img_array, (0, 0), sigmaX=radius, dst=img_array)
+            return img_array
+        cv2.blur(img_array, (2 * box_radius + 1, 2 * box_radius + 1), dst=img_array)
+        return img_array
+
+    def _apply_noise(self, img_array: np.ndarray, params: Dict[str, Any]) -> np.ndarray:
+        """Add gaussian, salt & pepper or uniform noise"""
+        noise_type, intensity = self._noise_parameters(params)
+        # Seed drawn up front by freeze_random_parameters (fresh entropy if called directly)
+        rng = np.random.default_rng(params.get('_noise_seed'))
+
+        if noise_type == 'salt_pepper':
+            salt = rng.random(img_array.shape[:2]) < intensity / 2
+            pepper = rng.random(img_array.shape[:2]) < intensity / 2
+            img_array[salt] = 255
+            img_array[pepper] = 0
+            return img_array
+
+        if noise_type == 'uniform':
+            noise = rng.uniform(-intensity * 255, intensity * 255, img_array.shape).astype(np.float32)
+        else:
+            noise = rng.normal(0, intensity * 255, img_array.shape).astype(np.float32)
+        noise += img_array
+        np.clip(noise, 0, 255, out=noise)
+        img_array[...] = noise
+        return img_array
+
+    # Advanced transformation methods
+
+    def _apply_color_jitter(self, img_array: np.ndarray, params: Dict[str, Any]) -> np.ndarray:
+        """Hue, brightness, contrast and saturation jitter in place"""
+        hue_factor, brightness_factor, contrast_factor, saturation_factor = self._color_jitter_factors(params)
+
+        if hue_factor != 0:
+            hsv = cv2.cvtColor(img_array, cv2.COLOR_RGB2HSV)
+            hsv[:, :, 0] = (hsv[:, :, 0] + hue_factor * 180) % 180
+            cv2.cvtColor(hsv, cv2.COLOR_HSV2RGB, dst=img_array)
+
+        if brightness_factor != 1.0:
+            self._blend_with_constant(img_array, brightness_factor, 0.0)
+
+        if contrast_factor != 1.0:
+            mean = int(cv2.cvtColor(img_array, cv2.COLOR_RGB2GRAY).mean() + 0.5)
+            self._blend_with_constant(img_array, contrast_factor, mean)
+
+        if saturation_factor != 1.0:
+            # ImageEnhance.Color blends with the greyscale image
+            grey = cv2.cvtColor(cv2.cvtColor(img_array, cv2.COLOR_RGB2GRAY), cv2.COLOR_GRAY2RGB)
+            cv2.addWeighted(img_array, saturation_factor, grey, 1.0 - saturation_factor, 0, dst=img_array)
+
+        return img_array
+
+    def _apply_cutout(self, img_array: np.ndarray, params: Dict[str, Any]) -> np.ndarray:
+        """Black out random square holes in place"""
+        hole_size = params.get('hole_size', 32)
+        # Hole positions drawn up front by freeze_random_parameters
+        params = self.freeze_random_parameters('cutout', params, self._image_size(img_array))
+
+        for x, y in params['_holes']:
+            img_array[y:y + hole_size, x:x + hole_size] = 0
+
+        return img_array
+
+    def _apply_random_zoom(self, img_array: np.ndarray, params: Dict[str, Any]) -> np.ndarray:
+        """Zoom in (crop and scale up) or out (scale down and pad with white)"""
+        zoom_factor = params.get('zoom_factor', params.get('zoom_range', 1.0))
+        if zoom_factor == 1.0:
+            return img_array
+
+        width, height = self._image_size(img_array)
+        if zoom_factor > 1.0:
+            new_width, new_height = int(width / zoom_factor), int(height / zoom_factor)
+            left, top = (width - new_width) // 2, (height - new_height) // 2
+            return self._resize_array(img_array[top:top + new_height, left:left + new_width], (width, height))
+
+        new_width, new_height = int(width * zoom_factor), int(height * zoom_factor)
+        canvas = np.full_like(img_array, 255)
+        left, top = (width - new_width) // 2, (height - new_height) // 2
+        canvas[top:top + new_height, left:left + new_width] = self._resize_array(img_array, (new_width, new_height))
+        return canvas
+
+    def _apply_affine_transform(self, img_array: np.ndarray, params: Dict[str, Any]) -> np.ndarray:
+        """Rotation, scale and shift resampled in a single warp"""
+        return self._warp_step(img_array, 'affine_transform', params)
+
+    def _apply_perspective_warp(self, img_array: np.ndarray, params: Dict[str, Any]) -> np.ndarray:
+        """Random perspective warp"""
+        if self._perspective_distortion(params) == 0:
+            return img_array
+        return self._warp_step(img_array, 'perspective_warp', params)
+
+    def _apply_grayscale(self, img_array: np.ndarray, params: Dict[str, Any]) -> np.ndarray:
+        """Convert to greyscale, keeping three channels, in place"""
+        cv2.cvtColor(cv2.cvtColor(img_array, cv2.COLOR_RGB2GRAY), cv2.COLOR_GRAY2RGB, dst=img_array)
+        return img_array
+
+    def _apply_shear(self, img_array: np.ndarray, params: Dict[str, Any]) -> np.ndarray:
+        """Horizontal shear"""
+        if params.get('shear_angle', params.get('angle', 0)) == 0:
+            return img_array
+        return self._warp_step(img_array, 'shear', params)
+
+    def _apply_gamma_correction(self, img_array: np.ndarray, params: Dict[str, Any]) -> np.ndarray:
+        """Gamma correction through a lookup table, in place"""
+        gamma = params.get('gamma', 1.0)
+        if gamma == 1.0:
+            return img_array
+        table = (np.power(np.arange(256) / 255.0, gamma) * 255).astype(np.uint8)
+        cv2.LUT(img_array, table, dst=img_array)
+        return img_array
+
+    def _apply_equalize(self, img_array: np.ndarray, params: Dict[str, Any]) -> np.ndarray:
+        """Per-channel histogram equalization"""
+        for channel in range(img_array.shape[2]):
+            img_array[:, :, channel] = cv2.equalizeHist(np.ascontiguousarray(img_array[:, :, channel]))
+        return img_array
+
+    def _apply_clahe(self, img_array: np.ndarray, params: Dict[str, Any]) -> np.ndarray:
+        """Per-channel CLAHE"""
+        clip_limit = params.get('clip_limit', 2.0)
+        grid_size = params.get('grid_size', 8)
+        clahe = cv2.createCLAHE(clipLimit=clip_limit, tileGridSize=(grid_size, grid_size))
+        for channel in range(img_array.shape[2]):
+            img_array[:, :, channel] = clahe.apply(np.ascontiguousarray(img_array[:, :, channel]))
+        return img_array
@@ -6,7 +6,6 @@ Core image processing logic for applying transformations
 import numpy as np
 import cv2
 from PIL import Image, ImageEnhance, ImageFilter, ImageOps
-import random
 import math
 from typing import Dict, Any, List, Tuple, Optional
 import logging
@@ -28,15 +27,36 @@ from core.transformation_config import (
     get_clahe_clip_limit_parameters, get_clahe_grid_size_parameters,
     get_cutout_num_holes_parameters, get_cutout_hole_size_parameters
 )
+from core.annotation_geometry import (
+    identity_matrix, translation_matrix, scale_matrix,
+    rotation_matrix, expanded_rotation_size
+)
 
 logger = logging.getLogger(__name__)
 
+# Transformations that move pixels (and therefore annotations)
+GEOMETRIC_TRANSFORMATIONS = {
+    'resize', 'rotate', 'flip', 'crop', 'random_zoom',
+    'affine_transform', 'perspective_warp', 'shear'
+}
+
+# Per-pixel photometric transformations that fused mode compiles into one lookup table
+FOLDABLE_PHOTOMETRIC_TRANSFORMATIONS = {'brightness', 'contrast', 'gamma_correction', 'equalize', 'grayscale'}
+
+# sequential: one PIL/OpenCV pass per transformation
+# fused: consecutive geometric steps share one warp, consecutive photometric steps one pass
+EXECUTION_MODES = ('sequential', 'fused')
+
 class ImageTransformer:
     """
     Handles all image transformation operations
     """
     
-    def __init__(self):
+    def __init__(self, execution_mode: str = "sequential"):
+        if execution_mode not in EXECUTION_MODES:
+            raise ValueError(f"Unknown execution mode: {execution_mode} (expected one of {EXECUTION_MODES})")
+        self.execution_mode = execution_mode
+        
         # Helper methods to get transformation parameters from central config
         self._get_shear_params = get_shear_parameters
         self._get_rotation_params = get_rotation_parameters
@@ -87,23 +107,629 @@ class ImageTransformer:
         Returns:
             Transformed PIL Image
         """
+        return self.apply_transformations_with_geometry(image, config)[0]
+    
+    def apply_transformations_with_geometry(self, image: Image.Image, config: Dict[str, Any],
+                                            rng: Optional[np.random.Generator] = None) -> Tuple[Image.Image, np.ndarray]:
+        """
+        Apply a series of transformations and report how they moved the pixels
+        
+        Random choices (random crop position, perspective corners, cutout holes,
+        noise) are drawn once from `rng` and used for both the image and the
+        returned matrix, so annotations can be moved exactly like the pixels.
+        
+        Args:
+            image: PIL Image to transform
+            config: Dictionary containing transformation parameters
+            rng: Source of every random choice (None = fresh OS entropy); the same
+                 seed gives the same output in either execution mode
+            
+        Returns:
+            (transformed PIL Image, 3x3 homography from source to output pixel coordinates)
+        """
+        if rng is None:
+            rng = np.random.default_rng()
+        
+        if self.execution_mode == 'fused' and self._supports_fused(image):
+            return self._apply_fused(image, config, rng)
+        
+        geometry = identity_matrix()
         try:
-            result_image = image.copy()
+            result_image = self._copy_image(image)
             
             # Apply transformations in order
             for transform_name, params in config.items():
                 if transform_name in self.transformation_methods and params.get('enabled', True):
                     try:
+                        size = self._image_size(result_image)
+                        params = self.freeze_random_parameters(transform_name, params, size, rng)
+                        step_geometry = self.get_geometric_matrix(transform_name, params, size)
                         result_image = self.transformation_methods[transform_name](result_image, params)
+                        if step_geometry is not None:
+                            geometry = step_geometry @ geometry
                     except Exception as e:
                         logger.warning(f"Failed to apply {transform_name}: {str(e)}")
                         continue
             
-            return result_image
+            return result_image, geometry
             
         except Exception as e:
             logger.error(f"Error applying transformations: {str(e)}")
-            return image
+            return image, identity_matrix()
+    
+    def _apply_fused(self, image: Image.Image, config: Dict[str, Any],
+                     rng: np.random.Generator) -> Tuple[Image.Image, np.ndarray]:
+        """
+        Fused execution: resample once per run of geometric steps
+        
+        Consecutive geometric steps are composed into one homography and applied
+        with a single cv2 warp, as long as the areas they expose share one fill
+        colour. Consecutive per-pixel photometric steps are compiled into one
+        lookup table and applied with a single cv2.LUT call. Single steps and
+        everything else run exactly as in sequential mode.
+        """
+        geometry = identity_matrix()
+        try:
+            result_image = image
+            
+            # Freeze random choices first so runs can be planned with known sizes
+            steps = []
+            size = self._image_size(image)
+            for transform_name, params in config.items():
+                if transform_name in self.transformation_methods and params.get('enabled', True):
+                    params = self.freeze_random_parameters(transform_name, params, size, rng)
+                    steps.append((transform_name, params, size))
+                    size = self.get_geometric_output_size(transform_name, params, size)
+            
+            for kind, run in self._plan_fused_runs(steps):
+                try:
+                    if kind == 'geometric' and len(run) > 1:
+                        run_geometry = identity_matrix()
+                        fill = None
+                        for transform_name, params, step_size in run:
+                            run_geometry = self.get_geometric_matrix(transform_name, params, step_size) @ run_geometry
+                            fill = fill or self._geometric_fill(transform_name, params)
+                        output_size = self.get_geometric_output_size(*run[-1])
+                        result_image = self._warp_image(result_image, run_geometry, output_size, fill)
+                        geometry = run_geometry @ geometry
+                    elif kind == 'photometric' and len(run) > 1:
+                        result_image = self._apply_photometric_run(result_image, run)
+                    else:
+                        # Single steps may work in place; never on the caller's image
+                        if result_image is image:
+                            result_image = self._copy_image(image)
+                        for transform_name, params, step_size in run:
+                            step_geometry = self.get_geometric_matrix(transform_name, params, step_size)
+                            result_image = self.transformation_methods[transform_name](result_image, params)
+                            if step_geometry is not None:
+                                geometry = step_geometry @ geometry
+                except Exception as e:
+                    logger.warning(f"Failed to apply {[step[0] for step in run]}: {str(e)}")
+                    continue
+            
+            if result_image is image:
+                result_image = self._copy_image(image)
+            return result_image, geometry
+            
+        except Exception as e:
+            logger.error(f"Error applying transformations: {str(e)}")
+            return image, identity_matrix()
+    
+    # Image container hooks (overridden by the ndarray backend)
+    
+    def _image_size(self, image: Image.Image) -> Tuple[int, int]:
+        """(width, height) of an image"""
+        return image.size
+    
+    def _copy_image(self, image: Image.Image) -> Image.Image:
+        """Independent copy of an image that may be modified freely"""
+        return image.copy()
+    
+    def _supports_fused(self, image: Image.Image) -> bool:
+        """Whether fused execution can handle this image"""
+        return image.mode == 'RGB'
+    
+    def _plan_fused_runs(self, steps: List[Tuple[str, Dict[str, Any], Tuple[int, int]]]) -> List[Tuple[str, list]]:
+        """Group steps into geometric runs (one fill colour), photometric runs and single steps"""
+        runs = []
+        for step in steps:
+            transform_name, params, _ = step
+            if transform_name in GEOMETRIC_TRANSFORMATIONS:
+                kind = 'geometric'
+            elif transform_name in FOLDABLE_PHOTOMETRIC_TRANSFORMATIONS:
+                kind = 'photometric'
+            else:
+                kind = 'single'
+            
+            if runs and kind != 'single' and runs[-1][0] == kind:
+                if kind == 'photometric':
+                    runs[-1][1].append(step)
+                    continue
+                # Exposed areas of every step in a fused warp get the same colour
+                run_fill = next((f for f in (self._geometric_fill(n, p) for n, p, _ in runs[-1][1]) if f), None)
+                step_fill = self._geometric_fill(transform_name, params)
+                if run_fill is None or step_fill is None or run_fill == step_fill:
+                    runs[-1][1].append(step)
+                    continue
+            runs.append((kind, [step]))
+        return runs
+    
+    @staticmethod
+    def _fill_color(fill_color: Any, default: Tuple[int, int, int]) -> Tuple[int, int, int]:
+        """RGB tuple for a 'white' / 'black' fill colour parameter"""
+        if isinstance(fill_color, str):
+            return {'white': (255, 255, 255), 'black': (0, 0, 0)}.get(fill_color.lower(), default)
+        if isinstance(fill_color, (list, tuple)) and len(fill_color) >= 3:
+            return tuple(int(c) for c in fill_color[:3])
+        return default
+    
+    def _geometric_fill(self, transform_name: str, params: Dict[str, Any]) -> Optional[Tuple[int, int, int]]:
+        """Colour a geometric step paints areas it exposes with, or None if it exposes none"""
+        white = (255, 255, 255)
+        if transform_name == 'rotate':
+            return self._fill_color(params.get('fill_color', 'white'), white) if params.get('angle', 0) % 360 else None
+        if transform_name == 'resize':
+            resize_mode = params.get('resize_mode', 'stretch_to')
+            if resize_mode == 'fit_black_edges':
+                return (0, 0, 0)
+            if resize_mode == 'fit_white_edges':
+                return white
+            if resize_mode == 'fit_reflect_edges':
+                return self._fill_color(params.get('fill_color', 'black'), (0, 0, 0))
+            return None
+        if transform_name == 'random_zoom':
+            return white if params.get('zoom_factor', params.get('zoom_range', 1.0)) < 1.0 else None
+        if transform_name in ('affine_transform', 'perspective_warp', 'shear'):
+            return white
+        # flip and crop never expose new areas
+        return None
+    
+    def _warp_image(self, image: Image.Image, matrix: np.ndarray, size: Tuple[int, int],
+                    fill: Optional[Tuple[int, int, int]]) -> Image.Image:
+        """Resample an image once through a homography given in pixel-corner coordinates"""
+        return Image.fromarray(self._warp_array(np.asarray(image), matrix, size, fill))
+    
+    def _warp_array(self, img_array: np.ndarray, matrix: np.ndarray, size: Tuple[int, int],
+                    fill: Optional[Tuple[int, int, int]]) -> np.ndarray:
+        """Resample an HWC array once through a homography given in pixel-corner coordinates"""
+        width, height = size
+        
+        # Strong downscales alias under a single interpolated warp; shrink with area averaging first.
+        # Each source axis is shrunk by its own scale (the column norms of the linear part), and
+        # only when that scale is below 1/2, so an axis that is barely reduced is never upsampled back
+        scale_x = scale_y = 1.0
+        if abs(matrix[2, 0]) + abs(matrix[2, 1]) < 1e-12:
+            column_norms = np.linalg.norm(matrix[:2, :2], axis=0)
+            scale_x = column_norms[0] if column_norms[0] < 0.5 else 1.0
+            scale_y = column_norms[1] if column_norms[1] < 0.5 else 1.0
+        if scale_x < 1.0 or scale_y < 1.0:
+            src_height, src_width = img_array.shape[:2]
+            shrunk_width = max(1, int(round(src_width * scale_x)))
+            shrunk_height = max(1, int(round(src_height * scale_y)))
+            img_array = cv2.resize(img_array, (shrunk_width, shrunk_height), interpolation=cv2.INTER_AREA)
+            matrix = matrix @ scale_matrix(src_width / shrunk_width, src_height / shrunk_height)
+        
+        # OpenCV addresses pixel centres, the geometry engine pixel corners
+        cv_matrix = translation_matrix(-0.5, -0.5) @ matrix @ translation_matrix(0.5, 0.5)
+        border_value = fill or (0, 0, 0)
+        
+        if np.allclose(cv_matrix[2], (0.0, 0.0, 1.0)):
+            warped = cv2.warpAffine(img_array, cv_matrix[:2], (width, height), flags=cv2.INTER_CUBIC,
+                                    borderMode=cv2.BORDER_CONSTANT, borderValue=border_value)
+        else:
+            warped = cv2.warpPerspective(img_array, cv_matrix, (width, height), flags=cv2.INTER_CUBIC,
+                                         borderMode=cv2.BORDER_CONSTANT, borderValue=border_value)
+        return warped
+    
+    def _apply_photometric_run(self, image: Image.Image,
+                               run: List[Tuple[str, Dict[str, Any], Tuple[int, int]]]) -> Image.Image:
+        """Apply consecutive per-pixel photometric steps as one lookup table pass"""
+        return Image.fromarray(self._photometric_run_array(np.asarray(image), run))
+    
+    def _photometric_run_array(self, img_array: np.ndarray,
+                               run: List[Tuple[str, Dict[str, Any], Tuple[int, int]]]) -> np.ndarray:
+        """
+        Apply a photometric run to an HWC uint8 RGB array with one cv2.LUT call
+        
+        Every step of the run maps each channel value independently, so the run
+        compiles to one 256-entry table per channel. A grayscale step mixes the
+        channels; it starts a new segment whose table is applied to the single
+        grey channel before it is expanded back to RGB.
+        """
+        segments = []
+        for step in run:
+            if step[0] == 'grayscale' or not segments:
+                segments.append([])
+            segments[-1].append(step)
+        
+        result = img_array
+        for segment in segments:
+            if segment[0][0] == 'grayscale':
+                grey = cv2.cvtColor(result, cv2.COLOR_RGB2GRAY)
+                if len(segment) > 1:
+                    lut = self._compile_photometric_lut(segment[1:], grey[:, :, np.newaxis])
+                    grey = cv2.LUT(grey, lut[:, 0])
+                result = cv2.cvtColor(grey, cv2.COLOR_GRAY2RGB)
+            else:
+                lut = self._compile_photometric_lut(segment, result)
+                result = cv2.LUT(result, lut.reshape(1, 256, -1))
+        return result
+    
+    def _compile_photometric_lut(self, run: List[Tuple[str, Dict[str, Any], Tuple[int, int]]],
+                                 img_array: np.ndarray) -> np.ndarray:
+        """
+        Compile per-channel photometric steps into a (256, channels) uint8 lookup table
+        
+        Steps that depend on image statistics (contrast uses the mean grey level,
+        equalize the channel histograms) read them from the input histograms
+        pushed through the table compiled so far, so no intermediate image is
+        ever materialized. Values are clipped after every step and rounded once.
+        """
+        channels = img_array.shape[2]
+        lut = np.tile(np.arange(256, dtype=np.float64)[:, np.newaxis], (1, channels))
+        
+        histograms = None
+        if any(name in ('contrast', 'equalize') for name, _, _ in run):
+            histograms = np.stack([
+                cv2.calcHist([img_array], [channel], None, [256], [0, 256]).ravel()
+                for channel in range(channels)
+            ], axis=1).astype(np.float64)
+        
+        for transform_name, params, _ in run:
+            if transform_name == 'brightness':
+                # ImageEnhance.Brightness blends with black
+                lut *= self._enhance_factor(params)
+                np.clip(lut, 0, 255, out=lut)
+            elif transform_name == 'contrast':
+                # ImageEnhance.Contrast blends with the mean grey level
+                factor = self._enhance_factor(params)
+                channel_means = (histograms * lut).sum(axis=0) / histograms.sum(axis=0)
+                weights = np.array([0.299, 0.587, 0.114]) if channels == 3 else np.full(channels, 1.0 / channels)
+                mean = int(float(channel_means @ weights) + 0.5)
+                lut -= mean
+                lut *= factor
+                lut += mean
+                np.clip(lut, 0, 255, out=lut)
+            elif transform_name == 'gamma_correction':
+                gamma = params.get('gamma', 1.0)
+                if gamma != 1.0:
+                    lut = np.power(lut / 255.0, gamma) * 255.0
+            elif transform_name == 'equalize':
+                # Equalization works on quantized values, like running it on its own
+                quantized = np.rint(lut).astype(np.intp)
+                for channel in range(channels):
+                    histogram = np.bincount(quantized[:, channel], weights=histograms[:, channel], minlength=256)
+                    lut[:, channel] = self._equalize_lut(histogram)[quantized[:, channel]]
+        
+        return np.rint(lut).astype(np.uint8)
+    
+    @staticmethod
+    def _equalize_lut(histogram: np.ndarray) -> np.ndarray:
+        """Equalization table for one channel histogram (same mapping as ImageOps.equalize)"""
+        histogram = np.asarray(histogram, dtype=np.int64)
+        used = histogram[histogram > 0]
+        identity = np.arange(256, dtype=np.float64)
+        if len(used) <= 1:
+            return identity
+        step = (int(used.sum()) - int(used[-1])) // 255
+        if not step:
+            return identity
+        cumulative = np.concatenate(([0], np.cumsum(histogram)[:-1]))
+        return np.minimum((step // 2 + cumulative) // step, 255).astype(np.float64)
+    
+    def freeze_random_parameters(self, transform_name: str, params: Dict[str, Any],
+                                 size: Tuple[int, int],
+                                 rng: Optional[np.random.Generator] = None) -> Dict[str, Any]:
+        """
+        Draw the random choices of a transformation up front
+        
+        The drawn values are stored under private keys (`_crop_origin`,
+        `_dst_points`, `_holes`, `_noise_seed`) that the _apply_* methods and
+        get_geometric_matrix honour, so the output only depends on `rng`.
+        """
+        if rng is None:
+            rng = np.random.default_rng()
+        
+        if transform_name == 'crop' and params.get('crop_mode') == 'random' and '_crop_origin' not in params:
+            window = self._crop_window(size, params)
+            if window:
+                width, height = size
+                _, _, new_width, new_height = window
+                return {**params, '_crop_origin': (int(rng.integers(0, width - new_width + 1)),
+                                                   int(rng.integers(0, height - new_height + 1)))}
+        
+        if transform_name == 'perspective_warp' and '_dst_points' not in params:
+            distortion = self._perspective_distortion(params)
+            if distortion != 0:
+                width, height = size
+                max_distortion = int(min(width, height) * distortion)
+                dx, dy = rng.integers(0, max_distortion + 1, size=(2, 4)).tolist()
+                return {**params, '_dst_points': [
+                    [dx[0], dy[0]],
+                    [width - dx[1], dy[1]],
+                    [width - dx[2], height - dy[2]],
+                    [dx[3], height - dy[3]]
+                ]}
+        
+        if transform_name == 'cutout' and '_holes' not in params:
+            width, height = size
+            hole_size = params.get('hole_size', 32)
+            num_holes = params.get('num_holes', 1)
+            xs = rng.integers(0, max(0, width - hole_size) + 1, size=num_holes).tolist()
+            ys = rng.integers(0, max(0, height - hole_size) + 1, size=num_holes).tolist()
+            return {**params, '_holes': list(zip(xs, ys))}
+        
+        if transform_name == 'noise' and '_noise_seed' not in params:
+            return {**params, '_noise_seed': int(rng.integers(2 ** 63))}
+        
+        return params
+    
+    def get_geometric_matrix(self, transform_name: str, params: Dict[str, Any],
+                             size: Tuple[int, int]) -> Optional[np.ndarray]:
+        """
+        3x3 homography describing how one transformation moves pixels
+        
+        Mirrors the corresponding _apply_* method. Random transformations must
+        have been through freeze_random_parameters first.
+        
+        Args:
+            transform_name: Transformation name
+            params: Transformation parameters
+            size: (width, height) of the image the transformation is applied to
+            
+        Returns:
+            Matrix mapping input to output pixel coordinates, or None for
+            transformations that do not move pixels
+        """
+        if transform_name not in GEOMETRIC_TRANSFORMATIONS or not params.get('enabled', True):
+            return None
+        
+        width, height = size
+        
+        if transform_name == 'resize':
+            return self._resize_geometry(size, params)
+        
+        if transform_name == 'rotate':
+            angle = params.get('angle', 0)
+            new_width, new_height = expanded_rotation_size(size, angle)
+            return rotation_matrix(angle, (width / 2.0, height / 2.0), (new_width / 2.0, new_height / 2.0))
+        
+        if transform_name == 'flip':
+            matrix = identity_matrix()
+            if params.get('horizontal', False):
+                matrix = translation_matrix(width, 0) @ scale_matrix(-1, 1) @ matrix
+            if params.get('vertical', False):
+                matrix = translation_matrix(0, height) @ scale_matrix(1, -1) @ matrix
+            return matrix
+        
+        if transform_name == 'crop':
+            window = self._crop_window(size, params)
+            if not window:
+                return identity_matrix()
+            left, top, new_width, new_height = window
+            return scale_matrix(width / new_width, height / new_height) @ translation_matrix(-left, -top)
+        
+        if transform_name == 'random_zoom':
+            zoom_factor = params.get('zoom_factor', params.get('zoom_range', 1.0))
+            if zoom_factor == 1.0:
+                return identity_matrix()
+            if zoom_factor > 1.0:
+                new_width, new_height = int(width / zoom_factor), int(height / zoom_factor)
+                left, top = (width - new_width) // 2, (height - new_height) // 2
+                return scale_matrix(width / new_width, height / new_height) @ translation_matrix(-left, -top)
+            new_width, new_height = int(width * zoom_factor), int(height * zoom_factor)
+            left, top = (width - new_width) // 2, (height - new_height) // 2
+            return translation_matrix(left, top) @ scale_matrix(new_width / width, new_height / height)
+        
+        if transform_name == 'affine_transform':
+            rotation_angle, scale_factor, shift_x_factor, shift_y_factor = self._affine_parameters(params)
+            matrix = identity_matrix()
+            if rotation_angle != 0:
+                matrix = rotation_matrix(rotation_angle, (width / 2.0, height / 2.0))
+            if scale_factor != 1.0:
+                new_width, new_height = int(width * scale_factor), int(height * scale_factor)
+                matrix = scale_matrix(new_width / width, new_height / height) @ matrix
+                if scale_factor > 1.0:
+                    matrix = translation_matrix(-((new_width - width) // 2), -((new_height - height) // 2)) @ matrix
+                else:
+                    matrix = translation_matrix((width - new_width) // 2, (height - new_height) // 2) @ matrix
+            if shift_x_factor != 0 or shift_y_factor != 0:
+                matrix = translation_matrix(int(width * shift_x_factor), int(height * shift_y_factor)) @ matrix
+            return matrix
+        
+        if transform_name == 'perspective_warp':
+            if '_dst_points' not in params:
+                return identity_matrix()
+            src_points = np.float32([[0, 0], [width, 0], [width, height], [0, height]])
+            dst_points = np.float32(params['_dst_points'])
+            return cv2.getPerspectiveTransform(src_points, dst_points).astype(np.float64)
+        
+        if transform_name == 'shear':
+            shear_angle = params.get('shear_angle', params.get('angle', 0))
+            if shear_angle == 0:
+                return identity_matrix()
+            shear_factor = math.tan(math.radians(shear_angle))
+            return np.array([[1.0, shear_factor, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]], dtype=np.float64)
+        
+        return None
+    
+    def get_geometric_output_size(self, transform_name: str, params: Dict[str, Any],
+                                  size: Tuple[int, int]) -> Tuple[int, int]:
+        """(width, height) of the image after one transformation"""
+        if not params.get('enabled', True):
+            return size
+        
+        if transform_name == 'resize':
+            original_width, original_height = size
+            target_width, target_height = self._resize_target(params)
+            if params.get('resize_mode', 'stretch_to') == 'fit_within':
+                if original_width / original_height > target_width / target_height:
+                    return target_width, int(target_width / (original_width / original_height))
+                return int(target_height * (original_width / original_height)), target_height
+            return target_width, target_height
+        
+        if transform_name == 'rotate':
+            return expanded_rotation_size(size, params.get('angle', 0))
+        
+        return size
+    
+    def compose_geometry(self, config: Dict[str, Any],
+                         size: Tuple[int, int]) -> Tuple[np.ndarray, Tuple[int, int]]:
+        """
+        Compose the geometric steps of a config into one homography without touching pixels
+        
+        Random steps are only reproduced if their choices were frozen into the
+        config beforehand (see freeze_random_parameters).
+        
+        Returns:
+            (3x3 matrix from source to output pixel coordinates, output (width, height))
+        """
+        geometry = identity_matrix()
+        for transform_name, params in config.items():
+            if not isinstance(params, dict) or transform_name not in self.transformation_methods:
+                continue
+            step_geometry = self.get_geometric_matrix(transform_name, params, size)
+            if step_geometry is not None:
+                geometry = step_geometry @ geometry
+            size = self.get_geometric_output_size(transform_name, params, size)
+        return geometry, size
+    
+    def _resize_target(self, params: Dict[str, Any]) -> Tuple[int, int]:
+        """Target (width, height) of a resize from its preset or custom size"""
+        preset_resolution = params.get('preset_resolution', 'custom')
+        if preset_resolution != 'custom':
+            # Parse preset resolution (e.g., '640x640' -> width=640, height=640)
+            try:
+                width, height = map(int, preset_resolution.split('x'))
+                return width, height
+            except (ValueError, AttributeError):
+                pass
+        return params.get('width', 640), params.get('height', 640)
+    
+    def _resize_geometry(self, size: Tuple[int, int], params: Dict[str, Any]) -> np.ndarray:
+        """Homography of _apply_resize for every resize mode"""
+        original_width, original_height = size
+        target_width, target_height = self._resize_target(params)
+        resize_mode = params.get('resize_mode', 'stretch_to')
+        original_aspect = original_width / original_height
+        target_aspect = target_width / target_height
+        
+        if resize_mode == 'fill_center_crop':
+            if original_aspect > target_aspect:
+                scale_width, scale_height = int(target_height * original_aspect), target_height
+            else:
+                scale_width, scale_height = target_width, int(target_width / original_aspect)
+            left = (scale_width - target_width) // 2
+            top = (scale_height - target_height) // 2
+            return (translation_matrix(-left, -top) @
+                    scale_matrix(scale_width / original_width, scale_height / original_height))
+        
+        if resize_mode in ('fit_within', 'fit_reflect_edges', 'fit_black_edges', 'fit_white_edges'):
+            if original_aspect > target_aspect:
+                new_width, new_height = target_width, int(target_width / original_aspect)
+            else:
+                new_width, new_height = int(target_height * original_aspect), target_height
+            matrix = scale_matrix(new_width / original_width, new_height / original_height)
+            if resize_mode == 'fit_within':
+                return matrix
+            paste_x = (target_width - new_width) // 2
+            paste_y = (target_height - new_height) // 2
+            return translation_matrix(paste_x, paste_y) @ matrix
+        
+        # stretch_to (and unknown modes)
+        return scale_matrix(target_width / original_width, target_height / original_height)
+    
+    def _crop_window(self, size: Tuple[int, int], params: Dict[str, Any]) -> Optional[Tuple[int, int, int, int]]:
+        """(left, top, width, height) of the region _apply_crop keeps, or None if it keeps everything"""
+        crop_percentage = params.get('crop_percentage', params.get('scale', 1.0))  # Support both old and new parameter names
+        crop_mode = params.get('crop_mode', 'center')  # Default to center crop
+        
+        # Convert percentage to scale if needed
+        if crop_percentage > 1.0:
+            # New percentage format (50-100)
+            scale = crop_percentage / 100.0
+        else:
+            # Old scale format (0.8-1.0) for backwards compatibility
+            scale = crop_percentage
+            
+        if scale >= 1.0:
+            return None
+        
+        width, height = size
+        new_width = int(width * scale)
+        new_height = int(height * scale)
+        
+        # Calculate crop position based on mode
+        if '_crop_origin' in params:
+            # Position drawn up front by freeze_random_parameters
+            left, top = params['_crop_origin']
+        elif crop_mode == 'center':
+            # Center crop (consistent results)
+            left = (width - new_width) // 2
+            top = (height - new_height) // 2
+        elif crop_mode == 'random':
+            # Random crop (for augmentation)
+            rng = np.random.default_rng()
+            left = int(rng.integers(0, width - new_width + 1))
+            top = int(rng.integers(0, height - new_height + 1))
+        elif crop_mode == 'top_left':
+            # Top-left corner
+            left = 0
+            top = 0
+        elif crop_mode == 'top_right':
+            # Top-right corner
+            left = width - new_width
+            top = 0
+        elif crop_mode == 'bottom_left':
+            # Bottom-left corner
+            left = 0
+            top = height - new_height
+        elif crop_mode == 'bottom_right':
+            # Bottom-right corner
+            left = width - new_width
+            top = height - new_height
+        else:
+            # Default to center if unknown mode
+            left = (width - new_width) // 2
+            top = (height - new_height) // 2
+        
+        return left, top, new_width, new_height
+    
+    def _affine_parameters(self, params: Dict[str, Any]) -> Tuple[float, float, float, float]:
+        """(rotation angle, scale factor, horizontal shift factor, vertical shift factor) of an affine transform"""
+        rotation_angle = params.get('rotation_angle', params.get('rotate', 0))  # Support both old and new parameter names
+        scale_factor = params.get('scale_factor', params.get('scale', 1.0))  # Support both old and new parameter names
+        
+        # Handle horizontal shift (new parameter name: horizontal_shift)
+        horizontal_shift = params.get('horizontal_shift', params.get('shift_x', 0))  # Support both old and new parameter names
+        if isinstance(horizontal_shift, int) and -20 <= horizontal_shift <= 20:
+            # New percentage format (-20 to +20) - convert to factor
+            shift_x_factor = horizontal_shift / 100.0
+        else:
+            # Old factor format (-0.1 to 0.1) for backwards compatibility
+            shift_x_factor = horizontal_shift
+        
+        # Handle vertical shift (new parameter name: vertical_shift)
+        vertical_shift = params.get('vertical_shift', params.get('shift_y', 0))  # Support both old and new parameter names
+        if isinstance(vertical_shift, int) and -20 <= vertical_shift <= 20:
+            # New percentage format (-20 to +20) - convert to factor
+            shift_y_factor = vertical_shift / 100.0
+        else:
+            # Old factor format (-0.1 to 0.1) for backwards compatibility
+            shift_y_factor = vertical_shift
+        
+        return rotation_angle, scale_factor, shift_x_factor, shift_y_factor
+    
+    def _perspective_distortion(self, params: Dict[str, Any]) -> float:
+        """Distortion factor (0.0-0.3) of a perspective warp"""
+        distortion_strength = params.get('distortion_strength', params.get('distortion', 0.1))  # Support both old and new parameter names
+        
+        # Convert distortion strength to factor if needed
+        if isinstance(distortion_strength, int) and 0 <= distortion_strength <= 30:
+            # New percentage format (0-30) - convert to factor
+            return distortion_strength / 100.0
+        # Old factor format (0.0-0.3) for backwards compatibility
+        return distortion_strength
     
     def get_available_transformations(self) -> Dict[str, Dict[str, Any]]:
         """
@@ -503,21 +1129,9 @@ class ImageTransformer:
     # Basic transformation methods
     def _apply_resize(self, image: Image.Image, params: Dict[str, Any]) -> Image.Image:
         """Resize image with professional resize modes and high-quality resampling"""
-        # Handle preset resolutions
-        preset_resolution = params.get('preset_resolution', 'custom')
-        if preset_resolution != 'custom':
-            # Parse preset resolution (e.g., '640x640' -> width=640, height=640)
-            try:
-                width, height = map(int, preset_resolution.split('x'))
-            except (ValueError, AttributeError):
-                # Fallback to custom values if preset parsing fails
-                width = params.get('width', 640)
-                height = params.get('height', 640)
-        else:
-            # Use custom width and height
-            width = params.get('width', 640)
-            height = params.get('height', 640)
-            
+        # Handle preset resolutions (falls back to custom width/height)
+        width, height = self._resize_target(params)
+        
         resize_mode = params.get('resize_mode', 'stretch_to')
         fill_color = params.get('fill_color', 'black')
         
@@ -693,102 +1307,41 @@ class ImageTransformer:
     
     def _apply_crop(self, image: Image.Image, params: Dict[str, Any]) -> Image.Image:
         """Apply crop with specified percentage and position mode"""
-        crop_percentage = params.get('crop_percentage', params.get('scale', 1.0))  # Support both old and new parameter names
-        crop_mode = params.get('crop_mode', 'center')  # Default to center crop
-        
-        # Convert percentage to scale if needed
-        if crop_percentage > 1.0:
-            # New percentage format (50-100)
-            scale = crop_percentage / 100.0
-        else:
-            # Old scale format (0.8-1.0) for backwards compatibility
-            scale = crop_percentage
-            
-        if scale >= 1.0:
+        window = self._crop_window(image.size, params)
+        if not window:
             return image
         
         width, height = image.size
-        new_width = int(width * scale)
-        new_height = int(height * scale)
-        
-        # Calculate crop position based on mode
-        if crop_mode == 'center':
-            # Center crop (consistent results)
-            left = (width - new_width) // 2
-            top = (height - new_height) // 2
-        elif crop_mode == 'random':
-            # Random crop (for augmentation)
-            left = random.randint(0, width - new_width)
-            top = random.randint(0, height - new_height)
-        elif crop_mode == 'top_left':
-            # Top-left corner
-            left = 0
-            top = 0
-        elif crop_mode == 'top_right':
-            # Top-right corner
-            left = width - new_width
-            top = 0
-        elif crop_mode == 'bottom_left':
-            # Bottom-left corner
-            left = 0
-            top = height - new_height
-        elif crop_mode == 'bottom_right':
-            # Bottom-right corner
-            left = width - new_width
-            top = height - new_height
-        else:
-            # Default to center if unknown mode
-            left = (width - new_width) // 2
-            top = (height - new_height) // 2
+        left, top, new_width, new_height = window
         
         cropped = image.crop((left, top, left + new_width, top + new_height))
         return cropped.resize((width, height), Image.Resampling.LANCZOS)
     
     def _apply_brightness(self, image: Image.Image, params: Dict[str, Any]) -> Image.Image:
         """Adjust image brightness"""
-        # Get percentage value (new format) or fallback to old formats
-        percentage = params.get('percentage', params.get('adjustment', params.get('factor', 0)))
-        
-        # Convert percentage to factor
-        if isinstance(percentage, int) and -50 <= percentage <= 50:
-            # New percentage format (-50 to +50) -> factor (0.5 to 1.5)
-            factor = 1.0 + (percentage / 100.0)
-        else:
-            # Old factor format for backwards compatibility
-            factor = percentage if percentage > 0 else 1.0
-            
         enhancer = ImageEnhance.Brightness(image)
-        return enhancer.enhance(factor)
+        return enhancer.enhance(self._enhance_factor(params))
     
     def _apply_contrast(self, image: Image.Image, params: Dict[str, Any]) -> Image.Image:
         """Adjust image contrast"""
+        enhancer = ImageEnhance.Contrast(image)
+        return enhancer.enhance(self._enhance_factor(params))
+    
+    def _enhance_factor(self, params: Dict[str, Any]) -> float:
+        """ImageEnhance factor of a brightness or contrast step"""
         # Get percentage value (new format) or fallback to old formats
         percentage = params.get('percentage', params.get('adjustment', params.get('factor', 0)))
         
         # Convert percentage to factor
         if isinstance(percentage, int) and -50 <= percentage <= 50:
             # New percentage format (-50 to +50) -> factor (0.5 to 1.5)
-            factor = 1.0 + (percentage / 100.0)
-        else:
-            # Old factor format for backwards compatibility
-            factor = percentage if percentage > 0 else 1.0
-            
-        enhancer = ImageEnhance.Contrast(image)
-        return enhancer.enhance(factor)
+            return 1.0 + (percentage / 100.0)
+        # Old factor format for backwards compatibility
+        return percentage if percentage > 0 else 1.0
     
     def _apply_blur(self, image: Image.Image, params: Dict[str, Any]) -> Image.Image:
         """Apply high-quality blur with specified radius"""
-        blur_type = params.get('blur_type', 'gaussian')
-        radius = params.get('radius', params.get('intensity', 1.0))  # Support both old and new parameter names
-        
-        # Convert old intensity to radius if needed
-        if 'intensity' in params and 'radius' not in params:
-            # Old intensity format (0.1-5.0) - convert to radius
-            intensity = params.get('intensity', 1.0)
-            radius = max(0.5, intensity * 2.0)
-        else:
-            # New radius format (0.5-20.0) - use directly
-            radius = max(0.5, radius)
+        blur_type, radius = self._blur_parameters(params)
         
         if blur_type == 'gaussian':
             # Gaussian blur with direct radius
@@ -805,51 +1358,98 @@ class ImageTransformer:
             # Default to Gaussian
             return image.filter(ImageFilter.GaussianBlur(radius=radius))
     
-    def _apply_noise(self, image: Image.Image, params: Dict[str, Any]) -> Image.Image:
-        """Add noise to image with specified strength"""
-        noise_type = params.get('noise_type', 'gaussian')
-        strength = params.get('strength', params.get('intensity', 0.01))  # Support both old and new parameter names
+    def _blur_parameters(self, params: Dict[str, Any]) -> Tuple[str, float]:
+        """(blur type, radius) of a blur step"""
+        blur_type = params.get('blur_type', 'gaussian')
+        radius = params.get('radius', params.get('intensity', 1.0))  # Support both old and new parameter names
         
-        # Convert strength to intensity if needed
-        if isinstance(strength, int) and 1 <= strength <= 50:
-            # New percentage format (1-50) - convert to intensity
-            intensity = strength / 1000.0  # 5% = 0.005 intensity
+        # Convert old intensity to radius if needed
+        if 'intensity' in params and 'radius' not in params:
+            # Old intensity format (0.1-5.0) - convert to radius
+            intensity = params.get('intensity', 1.0)
+            radius = max(0.5, intensity * 2.0)
         else:
-            # Old intensity format (0.001-0.1) for backwards compatibility
-            intensity = strength
+            # New radius format (0.5-20.0) - use directly
+            radius = max(0.5, radius)
+        return blur_type, radius
+    
+    def _apply_noise(self, image: Image.Image, params: Dict[str, Any]) -> Image.Image:
+        """Add noise to image with specified strength"""
+        noise_type, intensity = self._noise_parameters(params)
+        # Seed drawn up front by freeze_random_parameters (fresh entropy if called directly)
+        rng = np.random.default_rng(params.get('_noise_seed'))
         
         # Convert to numpy array
         img_array = np.array(image).astype(np.float32)
         
         if noise_type == 'gaussian':
             # Gaussian noise
-            noise = np.random.normal(0, intensity * 255, img_array.shape)
+            noise = rng.normal(0, intensity * 255, img_array.shape)
         elif noise_type == 'salt_pepper':
             # Salt and pepper noise
             noise = np.zeros_like(img_array)
             # Salt noise (white pixels)
-            salt_coords = np.random.random(img_array.shape[:2]) < intensity / 2
+            salt_coords = rng.random(img_array.shape[:2]) < intensity / 2
             noise[salt_coords] = 255 - img_array[salt_coords]
             # Pepper noise (black pixels)
-            pepper_coords = np.random.random(img_array.shape[:2]) < intensity / 2
+            pepper_coords = rng.random(img_array.shape[:2]) < intensity / 2
             noise[pepper_coords] = -img_array[pepper_coords]
         elif noise_type == 'uniform':
             # Uniform noise
-            noise = np.random.uniform(-intensity * 255, intensity * 255, img_array.shape)
+            noise = rng.uniform(-intensity * 255, intensity * 255, img_array.shape)
         else:
             # Default to Gaussian
-            noise = np.random.normal(0, intensity * 255, img_array.shape)
+            noise = rng.normal(0, intensity * 255, img_array.shape)
         
         # Add noise and clip values
         noisy_array = np.clip(img_array + noise, 0, 255).astype(np.uint8)
         
         return Image.fromarray(noisy_array)
     
+    def _noise_parameters(self, params: Dict[str, Any]) -> Tuple[str, float]:
+        """(noise type, intensity) of a noise step"""
+        noise_type = params.get('noise_type', 'gaussian')
+        strength = params.get('strength', params.get('intensity', 0.01))  # Support both old and new parameter names
+        
+        # Convert strength to intensity if needed
+        if isinstance(strength, int) and 1 <= strength <= 50:
+            # New percentage format (1-50) - convert to intensity
+            intensity = strength / 1000.0  # 5% = 0.005 intensity
+        else:
+            # Old intensity format (0.001-0.1) for backwards compatibility
+            intensity = strength
+        return noise_type, intensity
+    
     # Advanced transformation methods
     def _apply_color_jitter(self, image: Image.Image, params: Dict[str, Any]) -> Image.Image:
         """Apply color jittering with improved parameter names"""
         result = image
+        hue_factor, brightness_factor, contrast_factor, saturation_factor = self._color_jitter_factors(params)
+        
+        if hue_factor != 0:
+            # Convert to HSV, shift hue, convert back
+            img_array = np.array(result)
+            hsv = cv2.cvtColor(img_array, cv2.COLOR_RGB2HSV)
+            hsv[:, :, 0] = (hsv[:, :, 0] + hue_factor * 180) % 180
+            rgb = cv2.cvtColor(hsv, cv2.COLOR_HSV2RGB)
+            result = Image.fromarray(rgb)
+        
+        if brightness_factor != 1.0:
+            enhancer = ImageEnhance.Brightness(result)
+            result = enhancer.enhance(brightness_factor)
+        
+        if contrast_factor != 1.0:
+            enhancer = ImageEnhance.Contrast(result)
+            result = enhancer.enhance(contrast_factor)
         
+        if saturation_factor != 1.0:
+            enhancer = ImageEnhance.Color(result)
+            result = enhancer.enhance(saturation_factor)
+        
+        return result
+    
+    def _color_jitter_factors(self, params: Dict[str, Any]) -> Tuple[float, float, float, float]:
+        """(hue factor, brightness factor, contrast factor, saturation factor) of a color jitter step"""
         # Handle hue shift (new parameter name: hue_shift)
         hue_shift = params.get('hue_shift', params.get('hue', 0))  # Support both old and new parameter names
         
@@ -861,14 +1461,6 @@ class ImageTransformer:
             # Old factor format (-0.1 to 0.1) for backwards compatibility
             hue_factor = hue_shift
         
-        if hue_factor != 0:
-            # Convert to HSV, shift hue, convert back
-            img_array = np.array(result)
-            hsv = cv2.cvtColor(img_array, cv2.COLOR_RGB2HSV)
-            hsv[:, :, 0] = (hsv[:, :, 0] + hue_factor * 180) % 180
-            rgb = cv2.cvtColor(hsv, cv2.COLOR_HSV2RGB)
-            result = Image.fromarray(rgb)
-        
         # Handle brightness variation (new parameter name: brightness_variation)
         brightness_variation = params.get('brightness_variation', params.get('brightness', 1.0))  # Support both old and new parameter names
         
@@ -880,10 +1472,6 @@ class ImageTransformer:
             # Old factor format (0.8-1.2) for backwards compatibility
             brightness_factor = brightness_variation
         
-        if brightness_factor != 1.0:
-            enhancer = ImageEnhance.Brightness(result)
-            result = enhancer.enhance(brightness_factor)
-        
         # Handle contrast variation (new parameter name: contrast_variation)
         contrast_variation = params.get('contrast_variation', params.get('contrast', 1.0))  # Support both old and new parameter names
         
@@ -895,10 +1483,6 @@ class ImageTransformer:
             # Old factor format (0.8-1.2) for backwards compatibility
             contrast_factor = contrast_variation
         
-        if contrast_factor != 1.0:
-            enhancer = ImageEnhance.Contrast(result)
-            result = enhancer.enhance(contrast_factor)
-        
         # Handle saturation variation (new parameter name: saturation_variation)
         saturation_variation = params.get('saturation_variation', params.get('saturation', 1.0))  # Support both old and new parameter names
         
@@ -910,23 +1494,17 @@ class ImageTransformer:
             # Old factor format (0.8-1.2) for backwards compatibility
             saturation_factor = saturation_variation
         
-        if saturation_factor != 1.0:
-            enhancer = ImageEnhance.Color(result)
-            result = enhancer.enhance(saturation_factor)
-        
-        return result
+        return hue_factor, brightness_factor, contrast_factor, saturation_factor
     
     def _apply_cutout(self, image: Image.Image, params: Dict[str, Any]) -> Image.Image:
         """Apply cutout augmentation"""
-        num_holes = params.get('num_holes', 1)
         hole_size = params.get('hole_size', 32)
+        # Hole positions drawn up front by freeze_random_parameters
+        params = self.freeze_random_parameters('cutout', params, image.size)
         
         img_array = np.array(image)
-        height, width = img_array.shape[:2]
         
-        for _ in range(num_holes):
-            y = random.randint(0, height - hole_size)
-            x = random.randint(0, width - hole_size)
+        for x, y in params['_holes']:
             img_array[y:y+hole_size, x:x+hole_size] = 0
         
         return Image.fromarray(img_array)
@@ -965,14 +1543,13 @@ class ImageTransformer:
         # This is a simplified implementation
         # For full affine transforms, you might want to use cv2.warpAffine
         result = image
+        rotation_angle, scale_factor, shift_x_factor, shift_y_factor = self._affine_parameters(params)
         
         # Handle rotation (new parameter name: rotation_angle)
-        rotation_angle = params.get('rotation_angle', params.get('rotate', 0))  # Support both old and new parameter names
         if rotation_angle != 0:
             result = result.rotate(rotation_angle, expand=False, fillcolor=(255, 255, 255))
         
         # Handle scaling (new parameter name: scale_factor)
-        scale_factor = params.get('scale_factor', params.get('scale', 1.0))  # Support both old and new parameter names
         if scale_factor != 1.0:
             width, height = result.size
             new_width = int(width * scale_factor)
@@ -991,28 +1568,6 @@ class ImageTransformer:
                 new_image.paste(result, (left, top))
                 result = new_image
         
-        # Handle horizontal shift (new parameter name: horizontal_shift)
-        horizontal_shift = params.get('horizontal_shift', params.get('shift_x', 0))  # Support both old and new parameter names
-        
-        # Convert horizontal shift to pixels if needed
-        if isinstance(horizontal_shift, int) and -20 <= horizontal_shift <= 20:
-            # New percentage format (-20 to +20) - convert to factor
-            shift_x_factor = horizontal_shift / 100.0
-        else:
-            # Old factor format (-0.1 to 0.1) for backwards compatibility
-            shift_x_factor = horizontal_shift
-        
-        # Handle vertical shift (new parameter name: vertical_shift)
-        vertical_shift = params.get('vertical_shift', params.get('shift_y', 0))  # Support both old and new parameter names
-        
-        # Convert vertical shift to pixels if needed
-        if isinstance(vertical_shift, int) and -20 <= vertical_shift <= 20:
-            # New percentage format (-20 to +20) - convert to factor
-            shift_y_factor = vertical_shift / 100.0
-        else:
-            # Old factor format (-0.1 to 0.1) for backwards compatibility
-            shift_y_factor = vertical_shift
-        
         # Apply shifts if needed
         if shift_x_factor != 0 or shift_y_factor != 0:
             width, height = result.size
@@ -1042,34 +1597,19 @@ class ImageTransformer:
     
     def _apply_perspective_warp(self, image: Image.Image, params: Dict[str, Any]) -> Image.Image:
         """Apply perspective warp transformation with improved parameter name"""
-        distortion_strength = params.get('distortion_strength', params.get('distortion', 0.1))  # Support both old and new parameter names
-        
-        # Convert distortion strength to factor if needed
-        if isinstance(distortion_strength, int) and 0 <= distortion_strength <= 30:
-            # New percentage format (0-30) - convert to factor
-            distortion = distortion_strength / 100.0
-        else:
-            # Old factor format (0.0-0.3) for backwards compatibility
-            distortion = distortion_strength
-        
-        if distortion == 0:
+        if self._perspective_distortion(params) == 0:
             return image
         
+        # Define destination points with random distortion (unless already drawn)
+        params = self.freeze_random_parameters('perspective_warp', params, image.size)
+        
         # Convert to OpenCV format
         img_array = np.array(image)
         height, width = img_array.shape[:2]
         
         # Define source points (corners of the image)
         src_points = np.float32([[0, 0], [width, 0], [width, height], [0, height]])
-        
-        # Define destination points with random distortion
-        max_distortion = int(min(width, height) * distortion)
-        dst_points = np.float32([
-            [random.randint(0, max_distortion), random.randint(0, max_distortion)],
-            [width - random.randint(0, max_distortion), random.randint(0, max_distortion)],
-            [width - random.randint(0, max_distortion), height - random.randint(0, max_distortion)],
-            [random.randint(0, max_distortion), height - random.randint(0, max_distortion)]
-        ])
+        dst_points = np.float32(params['_dst_points'])
         
         # Apply perspective transformation
         matrix = cv2.getPerspectiveTransform(src_points, dst_points)
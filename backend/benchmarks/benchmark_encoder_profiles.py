@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Encoder profile benchmark
+Times the fast, balanced and archival release encoder profiles and reports MB/s and bytes per image
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+# Add the backend directory to Python path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from core.image_generator import ImageAugmentationEngine, ENCODER_PROFILES
+
+FORMATS = ["jpg", "png", "webp"]
+
+
+def load_source(image_path: str, width: int, height: int) -> Image.Image:
+    """Decoded source image (a synthetic gradient with texture if no path is given)"""
+    if image_path:
+        image = Image.open(image_path)
+        return image.convert("RGB") if image.mode != "RGB" else image
+
+    rng = np.random.default_rng(0)
+    gradient = np.linspace(0, 200, width, dtype=np.float32)[None, :, None]
+    texture = rng.integers(0, 55, (height, width, 3)).astype(np.float32)
+    return Image.fromarray((gradient + texture).astype(np.uint8))
+
+
+def time_encode(engine: ImageAugmentationEngine, image: Image.Image, output_format: str,
+                iterations: int) -> tuple:
+    """Median seconds per encode and the encoded size in bytes"""
+    output_path = engine.output_base_dir / f"benchmark.{output_format}"
+    timings = []
+    size = 0
+    for _ in range(iterations):
+        start = time.perf_counter()
+        size = len(engine.encode_image(image, output_path, output_format))
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings)), size
+
+
+def main():
+    """Run the benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark release encoder profiles")
+    parser.add_argument("--image", default="", help="Source image (default: synthetic image)")
+    parser.add_argument("--width", type=int, default=1920, help="Synthetic image width")
+    parser.add_argument("--height", type=int, default=1080, help="Synthetic image height")
+    parser.add_argument("--iterations", type=int, default=10, help="Encodes per profile and format")
+    parser.add_argument("--formats", nargs="+", default=FORMATS, help="Output formats to encode")
+    parser.add_argument("--json", default="", help="Also write results to this JSON file")
+    args = parser.parse_args()
+
+    source = load_source(args.image, args.width, args.height)
+    source.load()
+    pixel_bytes = source.size[0] * source.size[1] * len(source.getbands())
+
+    print(f"Source image: {source.size[0]}x{source.size[1]}, {args.iterations} iterations per profile")
+    print(f"{'format':<7} {'profile':<9} {'ms/image':>10} {'MB/s':>8} {'bytes/image':>12} {'size':>7}")
+
+    results = []
+    with tempfile.TemporaryDirectory() as output_dir:
+        for output_format in args.formats:
+            baseline_size = None
+            for profile in ENCODER_PROFILES:
+                engine = ImageAugmentationEngine(output_dir, encoder_profile=profile)
+                seconds, size = time_encode(engine, source, output_format, args.iterations)
+                baseline_size = baseline_size or size
+                # MB/s of raw pixels encoded, comparable across formats and image sizes
+                mb_per_second = pixel_bytes / seconds / 1e6
+                results.append({
+                    "format": output_format,
+                    "profile": profile,
+                    "ms_per_image": round(seconds * 1000, 2),
+                    "mb_per_second": round(mb_per_second, 1),
+                    "bytes_per_image": size,
+                    "relative_size": round(size / baseline_size, 3)
+                })
+                print(f"{output_format:<7} {profile:<9} {seconds * 1000:>10.1f} {mb_per_second:>8.1f} "
+                      f"{size:>12} {size / baseline_size:>6.2f}x")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"image_size": list(source.size), "iterations": args.iterations, "results": results}, f, indent=2)
+        print(f"Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
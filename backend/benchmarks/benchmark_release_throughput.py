@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Release throughput benchmark
+Builds a synthetic project in a throwaway SQLite database and runs generate_release end to end
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+# Add the backend directory to Python path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+# Typical release transformations (one combination pool for every run)
+TRANSFORMATIONS = {
+    "resize": {"width": 640, "height": 640, "resize_mode": "fit_black_edges"},
+    "rotate": {"angle": 12},
+    "flip": {"horizontal": True},
+    "brightness": {"percentage": 15},
+    "noise": {"noise_type": "gaussian", "intensity": 0.02}
+}
+
+BENCHMARK_VERSION = "benchmark"
+
+
+def synthetic_image(rng: np.random.Generator, width: int, height: int) -> Image.Image:
+    """Gradient with texture, so encoders see something photo-like rather than flat color"""
+    gradient = np.linspace(0, 200, width, dtype=np.float32)[None, :, None]
+    texture = rng.integers(0, 55, (height, width, 3)).astype(np.float32)
+    return Image.fromarray((gradient + texture).astype(np.uint8))
+
+
+def create_synthetic_project(db, root: Path, args) -> dict:
+    """Project with one dataset of args.images source images, annotations and transformations"""
+    from database.models import Project, Dataset, Image as ImageRecord, Annotation, ImageTransformation
+
+    project = Project(name=f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{os.getpid()}",
+                      description="Synthetic release benchmark project")
+    db.add(project)
+    db.flush()
+    dataset = Dataset(name="synthetic", project_id=project.id, total_images=args.images)
+    db.add(dataset)
+    db.flush()
+
+    rng = np.random.default_rng(args.seed)
+    image_dir = root / "projects" / project.name / "dataset" / dataset.name
+    extension = args.source_format
+    splits = ["train"] * 7 + ["val"] * 2 + ["test"]
+    source_bytes = 0
+
+    # One source image is encoded and the rest are copies, so setup time stays small
+    template = synthetic_image(rng, args.width, args.height)
+    for i in range(args.images):
+        split = splits[i % len(splits)]
+        path = image_dir / split / f"image_{i:06d}.{extension}"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if i == 0:
+            template.save(path, quality=90)
+            template_path = path
+        else:
+            shutil.copyfile(template_path, path)
+        source_bytes += path.stat().st_size
+
+        image = ImageRecord(
+            filename=path.name, original_filename=path.name, file_path=str(path),
+            file_size=path.stat().st_size, width=args.width, height=args.height, format=extension,
+            dataset_id=dataset.id, is_labeled=True, split_type="dataset", split_section=split
+        )
+        db.add(image)
+        db.flush()
+
+        for j in range(args.boxes + args.polygons):
+            x, y = rng.uniform(0, args.width * 0.8), rng.uniform(0, args.height * 0.8)
+            w, h = rng.uniform(10, args.width * 0.2), rng.uniform(10, args.height * 0.2)
+            segmentation = None
+            if j >= args.boxes:
+                segmentation = [[x, y], [x + w, y], [x + w, y + h], [x, y + h]]
+            db.add(Annotation(
+                image_id=image.id, class_name=f"class_{j % 3}", class_id=j % 3,
+                x_min=x, y_min=y, x_max=x + w, y_max=y + h, segmentation=segmentation
+            ))
+        if i % 500 == 0:
+            db.commit()
+
+    for order_index, (transformation_type, parameters) in enumerate(TRANSFORMATIONS.items()):
+        db.add(ImageTransformation(
+            transformation_type=transformation_type, parameters=parameters, is_enabled=True,
+            order_index=order_index, release_version=BENCHMARK_VERSION, status="COMPLETED"
+        ))
+    db.commit()
+
+    return {"project_id": project.id, "project_name": project.name, "dataset_id": dataset.id,
+            "source_bytes": source_bytes}
+
+
+def directory_bytes(path: Path) -> int:
+    """Total size of the regular files under path (hardlinks counted once)"""
+    seen = set()
+    total = 0
+    for file_path in path.rglob("*"):
+        if file_path.is_file():
+            stat = file_path.stat()
+            if (stat.st_dev, stat.st_ino) not in seen:
+                seen.add((stat.st_dev, stat.st_ino))
+                total += stat.st_size
+    return total
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=backend_dir,
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main():
+    """Run the benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark end-to-end release generation")
+    parser.add_argument("--images", type=int, default=200, help="Source images in the synthetic dataset")
+    parser.add_argument("--width", type=int, default=1920, help="Source image width")
+    parser.add_argument("--height", type=int, default=1080, help="Source image height")
+    parser.add_argument("--source-format", default="jpg", choices=["jpg", "png", "webp"], help="Source image format")
+    parser.add_argument("--boxes", type=int, default=5, help="Bounding boxes per image")
+    parser.add_argument("--polygons", type=int, default=0, help="Polygons per image")
+    parser.add_argument("--images-per-original", type=int, default=4, help="Augmented images per source")
+    parser.add_argument("--output-format", default="jpg", help="Release image format")
+    parser.add_argument("--encoder-profile", default=None, help="fast, balanced or archival (default: settings)")
+    parser.add_argument("--workers", type=int, default=None, help="Release workers (default: settings)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the synthetic data and the release")
+    parser.add_argument("--workdir", default="", help="Keep the database and outputs here (default: temp dir, removed)")
+    parser.add_argument("--json", default="", help="Also write results to this JSON file")
+    args = parser.parse_args()
+
+    json_path = os.path.abspath(args.json) if args.json else ""
+    root = Path(args.workdir or tempfile.mkdtemp(prefix="release_benchmark_")).resolve()
+    root.mkdir(parents=True, exist_ok=True)
+
+    # Everything the release touches lives under root (settings are read on import)
+    os.environ["DATABASE_URL"] = f"sqlite:///{root / 'benchmark.db'}"
+    os.environ["DERIVED_BLOB_DIR"] = str(root / "derived_blobs")
+    os.chdir(root)
+
+    from database.database import SessionLocal, init_db
+    from database.models import Release
+    from core.release_controller import ReleaseConfig, create_release_controller
+
+    asyncio.run(init_db())
+    db = SessionLocal()
+    releases_dir = None
+    try:
+        setup_start = time.perf_counter()
+        project = create_synthetic_project(db, root, args)
+        setup_seconds = time.perf_counter() - setup_start
+        print(f"Synthetic project: {args.images} images {args.width}x{args.height} {args.source_format}, "
+              f"{args.boxes} boxes + {args.polygons} polygons each ({setup_seconds:.1f}s setup)")
+
+        # Time spent in each step the controller reports
+        steps = []
+        final_progress = {}
+
+        def on_progress(progress) -> None:
+            now = time.perf_counter()
+            if not steps or steps[-1][0] != progress.current_step:
+                steps.append((progress.current_step, now))
+            final_progress["progress"] = progress
+
+        controller = create_release_controller(db, on_progress)
+        releases_dir = Path(controller._releases_dir(project["project_id"]))
+        config = ReleaseConfig(
+            release_name="benchmark",
+            description="Release throughput benchmark",
+            project_id=project["project_id"],
+            dataset_ids=[project["dataset_id"]],
+            images_per_original=args.images_per_original,
+            output_format=args.output_format,
+            max_workers=args.workers,
+            random_seed=args.seed,
+            encoder_profile=args.encoder_profile
+        )
+
+        start = time.perf_counter()
+        release_id = controller.generate_release(config, BENCHMARK_VERSION)
+        elapsed = time.perf_counter() - start
+        steps.append(("end", time.perf_counter()))
+
+        progress = final_progress.get("progress")
+        if progress is None or progress.status != "completed":
+            raise SystemExit(f"Release failed: {getattr(progress, 'error_message', 'unknown error')}")
+
+        release_dir = root / "projects" / project["project_name"] / "releases" / release_id
+        output_bytes = directory_bytes(release_dir) if release_dir.exists() else 0
+        release = db.query(Release).filter(Release.id == release_id).first()
+        zip_path = release.model_path if release and release.model_path else ""
+        zip_bytes = os.path.getsize(zip_path) if zip_path.endswith(".zip") and os.path.exists(zip_path) else 0
+
+        self_usage = resource.getrusage(resource.RUSAGE_SELF)
+        child_usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+        # ru_maxrss is KiB on Linux and bytes on macOS
+        rss_unit = 1 if platform.system() == "Darwin" else 1024
+
+        result = {
+            "revision": git_revision(),
+            "timestamp": datetime.utcnow().isoformat(),
+            "parameters": {key: value for key, value in vars(args).items() if key not in ("json", "workdir")},
+            "source_images": args.images,
+            "generated_images": progress.generated_images,
+            "elapsed_seconds": round(elapsed, 3),
+            "source_images_per_second": round(args.images / elapsed, 2),
+            "generated_images_per_second": round(progress.generated_images / elapsed, 2),
+            "steps": {
+                name: round(steps[i + 1][1] - at, 3)
+                for i, (name, at) in enumerate(steps[:-1])
+            },
+            "pipeline": progress.pipeline_stats,
+            "peak_rss_mb": round(self_usage.ru_maxrss * rss_unit / 1e6, 1),
+            "peak_child_rss_mb": round(child_usage.ru_maxrss * rss_unit / 1e6, 1),
+            "source_bytes": project["source_bytes"],
+            "output_bytes": output_bytes,
+            "zip_bytes": zip_bytes
+        }
+
+        print(f"Release {release_id}: {result['generated_images']} images in {elapsed:.2f}s "
+              f"({result['source_images_per_second']} sources/s, {result['generated_images_per_second']} outputs/s)")
+        for name, seconds in result["steps"].items():
+            print(f"  {name:<28} {seconds:>8.2f}s")
+        if progress.pipeline_stats:
+            for name, stage in progress.pipeline_stats["stages"].items():
+                print(f"  pipeline {name:<19} {stage['items_per_second']:>8.1f}/s  "
+                      f"{stage['mb_per_second']:>7.1f} MB/s  {stage['utilization']:.0%} busy")
+        print(f"  peak RSS {result['peak_rss_mb']} MB (workers {result['peak_child_rss_mb']} MB), "
+              f"output {output_bytes / 1e6:.1f} MB, ZIP {zip_bytes / 1e6:.1f} MB")
+
+        if json_path:
+            with open(json_path, "w") as f:
+                json.dump(result, f, indent=2)
+            print(f"Results written to {json_path}")
+    finally:
+        db.close()
+        # The ZIP package is written next to the real projects directory; never leave it behind
+        if releases_dir is not None and releases_dir.exists() and not args.workdir:
+            shutil.rmtree(releases_dir.parent, ignore_errors=True)
+        if not args.workdir:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
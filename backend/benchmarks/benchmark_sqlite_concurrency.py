@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+SQLite concurrency load test
+Runs reader and writer threads against a throwaway database with and without the tuned SQLite profile
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from pathlib import Path
+
+import numpy as np
+
+# Add the backend directory to Python path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from sqlalchemy import func
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker, selectinload
+
+from database.base import Base
+from database.database import create_database_engine, sqlite_pragmas
+from database.models import Project, Dataset, Image, Annotation
+from database.operations import IMAGE_PAGE_ORDER
+
+PROFILES = ["default", "tuned"]
+
+
+def seed(Session, images: int) -> str:
+    """One dataset with images and a few annotations each; returns the dataset id"""
+    with Session() as db:
+        project = Project(name=f"load_test_{uuid.uuid4().hex[:8]}")
+        db.add(project)
+        db.flush()
+        dataset = Dataset(name="load_test", project_id=project.id)
+        db.add(dataset)
+        db.flush()
+        for i in range(images):
+            add_image(db, dataset.id, i)
+        db.commit()
+        return dataset.id
+
+
+def add_image(db, dataset_id: str, i: int) -> None:
+    """An uploaded, labeled image with three annotations (the shape uploads and auto-labeling write)"""
+    image = Image(filename=f"image_{i}.jpg", original_filename=f"image_{i}.jpg", file_path=f"/tmp/image_{i}.jpg",
+                  width=640, height=480, dataset_id=dataset_id, is_labeled=True, split_type="dataset")
+    db.add(image)
+    db.flush()
+    for j in range(3):
+        db.add(Annotation(image_id=image.id, class_name=f"class_{j}", class_id=j,
+                          x_min=0.1, y_min=0.1, x_max=0.5, y_max=0.5))
+
+
+def read_once(db, dataset_id: str) -> None:
+    """A listing page with its annotations and the labeled count (the hot read path)"""
+    db.query(Image).options(selectinload(Image.annotations)).filter(
+        Image.dataset_id == dataset_id
+    ).order_by(*IMAGE_PAGE_ORDER).limit(50).all()
+    db.query(func.count(Image.id)).filter(Image.dataset_id == dataset_id, Image.is_labeled == True).scalar()
+
+
+def write_once(db, dataset_id: str, i: int) -> None:
+    """Insert one image with annotations and relabel an existing one, in one transaction"""
+    add_image(db, dataset_id, i)
+    image = db.query(Image).filter(Image.dataset_id == dataset_id).order_by(*IMAGE_PAGE_ORDER).first()
+    image.is_verified = not image.is_verified
+    db.commit()
+
+
+def run_profile(profile: str, args) -> dict:
+    """Load test one profile on a fresh database file"""
+    with tempfile.TemporaryDirectory(prefix="sqlite_load_") as root:
+        engine = create_database_engine(f"sqlite:///{os.path.join(root, 'load.db')}",
+                                        sqlite_tuned=(profile == "tuned"))
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine, autoflush=False)
+        dataset_id = seed(Session, args.images)
+
+        stop = threading.Event()
+        lock = threading.Lock()
+        stats = {kind: {"ops": 0, "locked": 0, "latencies": []} for kind in ("read", "write")}
+        counter = iter(range(args.images, 10 ** 9))
+
+        def worker(kind: str) -> None:
+            local = {"ops": 0, "locked": 0, "latencies": []}
+            while not stop.is_set():
+                start = time.perf_counter()
+                with Session() as db:
+                    try:
+                        if kind == "read":
+                            read_once(db, dataset_id)
+                        else:
+                            with lock:
+                                i = next(counter)
+                            write_once(db, dataset_id, i)
+                    except OperationalError as e:
+                        if "locked" not in str(e):
+                            raise
+                        db.rollback()
+                        local["locked"] += 1
+                        continue
+                local["ops"] += 1
+                local["latencies"].append(time.perf_counter() - start)
+            with lock:
+                for key in ("ops", "locked"):
+                    stats[kind][key] += local[key]
+                stats[kind]["latencies"].extend(local["latencies"])
+
+        threads = [threading.Thread(target=worker, args=("read",)) for _ in range(args.readers)]
+        threads += [threading.Thread(target=worker, args=("write",)) for _ in range(args.writers)]
+        for thread in threads:
+            thread.start()
+        time.sleep(args.seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        engine.dispose()
+
+    result = {"profile": profile}
+    for kind, kind_stats in stats.items():
+        latencies = np.array(kind_stats["latencies"] or [0.0]) * 1000
+        result[kind] = {
+            "ops_per_second": round(kind_stats["ops"] / args.seconds, 1),
+            "locked_errors": kind_stats["locked"],
+            "p50_ms": round(float(np.percentile(latencies, 50)), 2),
+            "p95_ms": round(float(np.percentile(latencies, 95)), 2)
+        }
+    return result
+
+
+def main():
+    """Run the load test"""
+    parser = argparse.ArgumentParser(description="Load test concurrent SQLite reads and writes")
+    parser.add_argument("--readers", type=int, default=8, help="Reader threads")
+    parser.add_argument("--writers", type=int, default=4, help="Writer threads")
+    parser.add_argument("--seconds", type=float, default=10.0, help="Duration per profile")
+    parser.add_argument("--images", type=int, default=2000, help="Images seeded before the run")
+    parser.add_argument("--profiles", nargs="+", default=PROFILES, choices=PROFILES, help="Profiles to run")
+    parser.add_argument("--json", default="", help="Also write results to this JSON file")
+    args = parser.parse_args()
+
+    print(f"{args.readers} readers, {args.writers} writers, {args.seconds:.0f}s per profile, "
+          f"{args.images} seeded images")
+    print("tuned = " + ", ".join(f"{name}={value}" for name, value in sqlite_pragmas()))
+    print(f"{'profile':<8} {'reads/s':>9} {'p95 ms':>8} {'writes/s':>9} {'p95 ms':>8} {'locked':>7}")
+
+    results = []
+    for profile in args.profiles:
+        result = run_profile(profile, args)
+        results.append(result)
+        print(f"{profile:<8} {result['read']['ops_per_second']:>9} {result['read']['p95_ms']:>8} "
+              f"{result['write']['ops_per_second']:>9} {result['write']['p95_ms']:>8} "
+              f"{result['read']['locked_errors'] + result['write']['locked_errors']:>7}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"parameters": vars(args), "results": results}, f, indent=2)
+        print(f"Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Transformation backend benchmark
+Times the PIL and NumPy transformer backends (sequential and fused) on typical release chains
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+# Add the backend directory to Python path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from api.services.image_transformer import ImageTransformer
+from api.services.array_transformer import ArrayImageTransformer
+
+# Chains that resemble release configs
+CHAINS = {
+    "geometric": {
+        "resize": {"width": 1280, "height": 720, "resize_mode": "stretch_to"},
+        "rotate": {"angle": 12},
+        "flip": {"horizontal": True},
+        "shear": {"shear_angle": 8}
+    },
+    "photometric": {
+        "brightness": {"percentage": 15},
+        "contrast": {"percentage": -10},
+        "gamma_correction": {"gamma": 1.2},
+        "blur": {"radius": 1.5}
+    },
+    "mixed": {
+        "resize": {"width": 1024, "height": 1024, "resize_mode": "fit_black_edges"},
+        "rotate": {"angle": -7},
+        "brightness": {"percentage": 20},
+        "color_jitter": {"hue": 0.05, "saturation": 1.2},
+        "noise": {"noise_type": "gaussian", "intensity": 0.02},
+        "cutout": {"num_holes": 2, "hole_size": 64}
+    }
+}
+
+
+def load_source(image_path: str, width: int, height: int) -> Image.Image:
+    """Decoded source image (a synthetic gradient with texture if no path is given)"""
+    if image_path:
+        image = Image.open(image_path)
+        return image.convert("RGB") if image.mode != "RGB" else image
+
+    rng = np.random.default_rng(0)
+    gradient = np.linspace(0, 200, width, dtype=np.float32)[None, :, None]
+    texture = rng.integers(0, 55, (height, width, 3)).astype(np.float32)
+    return Image.fromarray((gradient + texture).astype(np.uint8))
+
+
+def time_chain(transformer, image, chain, iterations: int, to_pil) -> float:
+    """Median seconds per chain, including the conversion back to a PIL image for encoding"""
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        result, _ = transformer.apply_transformations_with_geometry(image, chain)
+        to_pil(result)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings))
+
+
+def main():
+    """Run the benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark PIL vs NumPy transformation backends")
+    parser.add_argument("--image", default="", help="Source image (default: synthetic image)")
+    parser.add_argument("--width", type=int, default=1920, help="Synthetic image width")
+    parser.add_argument("--height", type=int, default=1080, help="Synthetic image height")
+    parser.add_argument("--iterations", type=int, default=10, help="Runs per chain and backend")
+    parser.add_argument("--json", default="", help="Also write results to this JSON file")
+    args = parser.parse_args()
+
+    source = load_source(args.image, args.width, args.height)
+    source.load()
+    source_array = ArrayImageTransformer.to_array(source)
+
+    backends = {
+        "pil": (ImageTransformer, source, lambda image: image),
+        "numpy": (ArrayImageTransformer, source_array, ArrayImageTransformer.to_image)
+    }
+
+    print(f"Source image: {source.size[0]}x{source.size[1]}, {args.iterations} iterations per chain")
+    print(f"{'chain':<12} {'backend':<8} {'mode':<11} {'ms/image':>10} {'speedup':>8}")
+
+    results = []
+    for chain_name, chain in CHAINS.items():
+        baseline = None
+        for backend_name, (transformer_class, image, to_pil) in backends.items():
+            for mode in ("sequential", "fused"):
+                seconds = time_chain(transformer_class(mode), image, chain, args.iterations, to_pil)
+                baseline = baseline or seconds
+                results.append({
+                    "chain": chain_name,
+                    "backend": backend_name,
+                    "mode": mode,
+                    "ms_per_image": round(seconds * 1000, 2),
+                    "speedup": round(baseline / seconds, 2)
+                })
+                print(f"{chain_name:<12} {backend_name:<8} {mode:<11} {seconds * 1000:>10.1f} {baseline / seconds:>7.2f}x")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"image_size": list(source.size), "iterations": args.iterations, "results": results}, f, indent=2)
+        print(f"Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
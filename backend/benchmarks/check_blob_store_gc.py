@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Blob store garbage collection check
+Asserts that once a release is removed and its references dropped, its blobs are collected while shared ones are kept
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+# Add the backend directory to Python path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from database.base import Base
+from database.models import DerivedBlob
+from core.blob_store import BlobStore
+
+
+def write_release(root: str, release_id: str, contents: list) -> str:
+    """A release output folder with one image file per content; returns the folder"""
+    output_dir = os.path.join(root, "releases", release_id)
+    os.makedirs(output_dir)
+    for i, content in enumerate(contents):
+        with open(os.path.join(output_dir, f"image_{i}.jpg"), "wb") as f:
+            f.write(content)
+    return output_dir
+
+
+def ingest_release(blob_store: BlobStore, output_dir: str, release_id: str) -> set:
+    """Ingest a release's files the way generate_release does; returns their digests"""
+    digests = {
+        blob_store.ingest_file(os.path.join(output_dir, name), f"release:{release_id}")
+        for name in sorted(os.listdir(output_dir))
+    }
+    blob_store.flush()
+    return digests
+
+
+def main():
+    """Run the check"""
+    parser = argparse.ArgumentParser(description="Check that removed releases' blobs are garbage collected")
+    parser.add_argument("--images", type=int, default=20, help="Images per release")
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="blob_gc_")
+    failures = []
+    try:
+        engine = create_engine(f"sqlite:///{os.path.join(root, 'blobs.db')}")
+        Base.metadata.create_all(bind=engine)
+        db = sessionmaker(bind=engine)()
+        # Cap 0: every unreferenced blob is over the cap
+        blob_store = BlobStore(db, root=Path(root) / "store", max_bytes=0)
+
+        shared = [f"shared {i}".encode() * 100 for i in range(args.images // 2)]
+        old_dir = write_release(root, "old", shared + [f"old {i}".encode() * 100 for i in range(args.images // 2)])
+        new_dir = write_release(root, "new", shared + [f"new {i}".encode() * 100 for i in range(args.images // 2)])
+        old_digests = ingest_release(blob_store, old_dir, "old")
+        new_digests = ingest_release(blob_store, new_dir, "new")
+        old_only = old_digests - new_digests
+
+        def stored(digests: set) -> int:
+            return db.query(DerivedBlob).filter(DerivedBlob.digest.in_(digests)).count()
+
+        def on_disk(digests: set) -> int:
+            return sum(1 for digest in digests if blob_store.path_for(digest) is not None)
+
+        stats = blob_store.collect_garbage()
+        print(f"both releases referenced: evicted {stats['evicted']}")
+        if stats["evicted"]:
+            failures.append("referenced blobs were evicted")
+
+        # Remove the old release the way project deletion does
+        shutil.rmtree(old_dir)
+        dropped = blob_store.release_owner("release:old")
+        stats = blob_store.collect_garbage()
+        print(f"old release removed: dropped {dropped} references, evicted {stats['evicted']} blobs "
+              f"({stats['freed_bytes']} bytes)")
+
+        if stored(old_only) or on_disk(old_only):
+            failures.append(f"{stored(old_only)} blobs only the removed release used are still stored")
+        if stored(new_digests) != len(new_digests) or on_disk(new_digests) != len(new_digests):
+            failures.append("blobs the remaining release references were evicted")
+        if not all(os.path.exists(os.path.join(new_dir, name)) for name in os.listdir(new_dir)):
+            failures.append("the remaining release lost files")
+        db.close()
+        engine.dispose()
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    if not failures:
+        print("ok   removed release's blobs collected, shared and live blobs kept")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
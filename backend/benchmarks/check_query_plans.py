@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Query plan check
+Asserts with EXPLAIN QUERY PLAN that SQLite serves the hot image, annotation and transformation queries from their indexes
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add the backend directory to Python path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import sessionmaker
+
+from database.base import Base
+from database.models import Image, Annotation, Dataset, ImageTransformation
+from database.operations import IMAGE_PAGE_ORDER
+from database.index_migrations import create_missing_indexes
+
+# (name, query builder, indexes any of which the plan may use)
+HOT_QUERIES = [
+    (
+        "dataset image page",
+        lambda db: db.query(Image).filter(Image.dataset_id == "dataset").order_by(*IMAGE_PAGE_ORDER).limit(51),
+        {"ix_images_dataset_created"}
+    ),
+    (
+        "project image page",
+        lambda db: db.query(Image, Dataset.name).join(Dataset, Image.dataset_id == Dataset.id).filter(
+            Dataset.project_id == "project"
+        ).order_by(*IMAGE_PAGE_ORDER).limit(51),
+        {"ix_images_dataset_created", "ix_images_created"}
+    ),
+    (
+        "release image selection",
+        lambda db: db.query(Image.id, Image.file_path).filter(
+            Image.dataset_id.in_(["dataset_a", "dataset_b"]),
+            Image.split_type == "dataset",
+            Image.split_section.in_(["train", "val"])
+        ),
+        {"ix_images_dataset_split"}
+    ),
+    (
+        "labeled images of a dataset",
+        lambda db: db.query(Image).filter(Image.dataset_id == "dataset", Image.is_labeled == True),
+        {"ix_images_dataset_labeled"}
+    ),
+    (
+        "labeled split count",
+        lambda db: db.query(func.count(Image.id)).filter(
+            Image.dataset_id == "dataset", Image.split_type == "train", Image.is_labeled == True
+        ),
+        {"ix_images_dataset_split", "ix_images_dataset_labeled"}
+    ),
+    (
+        "annotations of an image",
+        lambda db: db.query(Annotation).filter(Annotation.image_id == "image"),
+        {"ix_annotations_image_id"}
+    ),
+    (
+        "annotations of an image page",
+        lambda db: db.query(Annotation).filter(Annotation.image_id.in_(["image_a", "image_b"])),
+        {"ix_annotations_image_id"}
+    ),
+    (
+        "annotations of a class",
+        lambda db: db.query(Annotation.image_id).filter(Annotation.class_name == "car"),
+        {"ix_annotations_class_name"}
+    ),
+    (
+        "release version transformations",
+        lambda db: db.query(ImageTransformation).filter(
+            ImageTransformation.release_version == "version",
+            ImageTransformation.status == "COMPLETED",
+            ImageTransformation.is_enabled == True
+        ).order_by(ImageTransformation.order_index),
+        {"ix_image_transformations_version"}
+    ),
+]
+
+
+def explain(db, query) -> list:
+    """EXPLAIN QUERY PLAN detail lines of an ORM query"""
+    # Values inlined (IN lists expanded); they do not change the plan
+    compiled = query.statement.compile(dialect=db.bind.dialect, compile_kwargs={"literal_binds": True})
+    rows = db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}").fetchall()
+    return [row[-1] for row in rows]
+
+
+def uses_index(plan: list, indexes: set) -> bool:
+    return any(f"INDEX {name}" in line for line in plan for name in indexes)
+
+
+def main():
+    """Run the check"""
+    parser = argparse.ArgumentParser(description="Check that hot queries use their indexes")
+    parser.add_argument("--database-url", default="sqlite://",
+                        help="Database to check, after creating its missing indexes (default: empty in-memory schema)")
+    parser.add_argument("--verbose", action="store_true", help="Print every plan")
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    Base.metadata.create_all(bind=engine)
+    create_missing_indexes(engine)
+    db = sessionmaker(bind=engine)()
+
+    failures = 0
+    try:
+        for name, build, indexes in HOT_QUERIES:
+            plan = explain(db, build(db))
+            ok = uses_index(plan, indexes)
+            failures += not ok
+            print(f"{'ok  ' if ok else 'FAIL'} {name}")
+            if args.verbose or not ok:
+                for line in plan:
+                    print(f"       {line}")
+                if not ok:
+                    print(f"       expected one of: {', '.join(sorted(indexes))}")
+    finally:
+        db.close()
+
+    print(f"{len(HOT_QUERIES) - failures}/{len(HOT_QUERIES)} hot queries use their indexes")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Annotation Geometry for Auto-Labeling Tool Release Pipeline
+3x3 homography helpers used to move boxes and polygons with the image pixels
+"""
+
+import math
+import logging
+from typing import List, Tuple, Union, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def identity_matrix() -> np.ndarray:
+    """Homography that leaves every point where it is"""
+    return np.eye(3, dtype=np.float64)
+
+
+def translation_matrix(tx: float, ty: float) -> np.ndarray:
+    """Homography that shifts points by (tx, ty)"""
+    return np.array([[1.0, 0.0, tx], [0.0, 1.0, ty], [0.0, 0.0, 1.0]], dtype=np.float64)
+
+
+def scale_matrix(sx: float, sy: float) -> np.ndarray:
+    """Homography that scales points about the origin"""
+    return np.array([[sx, 0.0, 0.0], [0.0, sy, 0.0], [0.0, 0.0, 1.0]], dtype=np.float64)
+
+
+def rotation_matrix(angle: float, center: Tuple[float, float],
+                    new_center: Optional[Tuple[float, float]] = None) -> np.ndarray:
+    """
+    Homography for a counter-clockwise rotation in image coordinates (y pointing down)
+
+    Matches PIL Image.rotate: `center` is the pivot in the source image and
+    `new_center` is where it lands in the output (differs when the canvas expands).
+    """
+    theta = math.radians(angle)
+    # Rounded like PIL so right angles give exact canvas sizes
+    cos_a, sin_a = round(math.cos(theta), 15), round(math.sin(theta), 15)
+    rotation = np.array([[cos_a, sin_a, 0.0], [-sin_a, cos_a, 0.0], [0.0, 0.0, 1.0]], dtype=np.float64)
+    cx, cy = center
+    ncx, ncy = new_center if new_center is not None else center
+    return translation_matrix(ncx, ncy) @ rotation @ translation_matrix(-cx, -cy)
+
+
+def expanded_rotation_size(size: Tuple[int, int], angle: float) -> Tuple[int, int]:
+    """Canvas size PIL uses for Image.rotate(angle, expand=True)"""
+    width, height = size
+    angle = angle % 360.0
+    # PIL uses exact transposes for right angles
+    if angle in (0, 180):
+        return width, height
+    if angle in (90, 270):
+        return height, width
+
+    # Same extent computation as PIL (corners through its inverse matrix about the center)
+    center = (width / 2.0, height / 2.0)
+    corners = np.array([[0, 0], [width, 0], [width, height], [0, height]], dtype=np.float64)
+    rotated = apply_homography(rotation_matrix(-angle, center, center), corners)
+    new_width = math.ceil(rotated[:, 0].max()) - math.floor(rotated[:, 0].min())
+    new_height = math.ceil(rotated[:, 1].max()) - math.floor(rotated[:, 1].min())
+    return int(new_width), int(new_height)
+
+
+def apply_homography(matrix: np.ndarray, points: np.ndarray) -> np.ndarray:
+    """
+    Map an (N, 2) array of points through a 3x3 homography in one batched call
+
+    Returns:
+        (N, 2) float64 array of mapped points
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    if points.size == 0:
+        return points
+    homogeneous = np.hstack([points, np.ones((len(points), 1), dtype=np.float64)])
+    mapped = homogeneous @ matrix.T
+    w = mapped[:, 2:3]
+    # Points on the horizon of a perspective warp have no finite image; pin them far away
+    w = np.where(np.abs(w) < 1e-12, 1e-12, w)
+    return mapped[:, :2] / w
+
+
+def transform_annotations(annotations: List[Union["BoundingBox", "Polygon"]],
+                          matrix: np.ndarray,
+                          new_dims: Tuple[int, int],
+                          min_size: float = 1.0) -> List[Union["BoundingBox", "Polygon"]]:
+    """
+    Move all boxes and polygons of one image through a homography
+
+    All box corners and polygon vertices are stacked into a single array and
+    mapped at once. Boxes are re-derived as the extent of their four warped
+    corners (so rotation/shear/perspective give the enclosing box), then
+    everything is clipped to the output image. Annotations that collapse to
+    less than `min_size` pixels in width or height are dropped.
+
+    Args:
+        annotations: BoundingBox / Polygon objects in source pixel coordinates
+        matrix: 3x3 homography from source to output pixel coordinates
+        new_dims: (width, height) of the output image
+        min_size: Minimum width/height (pixels) of a surviving annotation
+
+    Returns:
+        Transformed annotations, in input order
+    """
+    from core.image_generator import BoundingBox, Polygon
+
+    if not annotations:
+        return []
+
+    new_width, new_height = new_dims
+
+    # Stack every point: 4 corners per box, all vertices per polygon
+    chunks = []
+    for annotation in annotations:
+        if isinstance(annotation, BoundingBox):
+            chunks.append(np.array([
+                [annotation.x_min, annotation.y_min],
+                [annotation.x_max, annotation.y_min],
+                [annotation.x_max, annotation.y_max],
+                [annotation.x_min, annotation.y_max]
+            ], dtype=np.float64))
+        elif isinstance(annotation, Polygon):
+            chunks.append(np.asarray(annotation.points, dtype=np.float64).reshape(-1, 2))
+        else:
+            chunks.append(np.empty((0, 2), dtype=np.float64))
+
+    offsets = np.cumsum([0] + [len(chunk) for chunk in chunks])
+    mapped = apply_homography(matrix, np.vstack(chunks))
+
+    # Clip everything to the output canvas in one pass
+    clipped = np.empty_like(mapped)
+    clipped[:, 0] = np.clip(mapped[:, 0], 0, new_width)
+    clipped[:, 1] = np.clip(mapped[:, 1], 0, new_height)
+
+    updated = []
+    for index, annotation in enumerate(annotations):
+        start, end = offsets[index], offsets[index + 1]
+
+        if isinstance(annotation, BoundingBox):
+            corners = clipped[start:end]
+            x_min, y_min = corners.min(axis=0)
+            x_max, y_max = corners.max(axis=0)
+            if x_max - x_min < min_size or y_max - y_min < min_size:
+                logger.debug("Bounding box left the image after transformation, dropping it")
+                continue
+            updated.append(BoundingBox(
+                float(x_min), float(y_min), float(x_max), float(y_max),
+                annotation.class_name, annotation.class_id, annotation.confidence
+            ))
+
+        elif isinstance(annotation, Polygon):
+            points = clipped[start:end]
+            extent = points.max(axis=0) - points.min(axis=0) if len(points) else np.zeros(2)
+            if len(points) < 3 or extent[0] < min_size or extent[1] < min_size:
+                logger.debug("Polygon left the image after transformation, dropping it")
+                continue
+            updated.append(Polygon(
+                [(float(x), float(y)) for x, y in points],
+                annotation.class_name, annotation.class_id, annotation.confidence
+            ))
+
+        else:
+            updated.append(annotation)
+
+    return updated
@@ -0,0 +1,157 @@
+"""
+Augmentation Cache for Auto-Labeling Tool Release Pipeline
+Content-addressed index of augmented outputs so new releases only compute what changed
+"""
+
+import os
+import json
+import hashlib
+import logging
+from typing import Dict, Any, Optional
+from dataclasses import asdict
+from datetime import datetime
+
+from core.config import settings
+from core.image_generator import AugmentationResult
+from core.release_manifest import augmentation_result_from_dict
+from core.blob_store import file_sha256
+from utils.path_utils import path_manager
+
+logger = logging.getLogger(__name__)
+
+CACHE_FILENAME = "augmentation_cache.json"
+
+# Bump when a change to the transformers alters the pixels produced for the same key
+CACHE_FORMAT_VERSION = 4
+
+
+def transform_engine_fields() -> Dict[str, Any]:
+    """Engine settings that change the pixels derived from the same source and transformations"""
+    return {
+        "backend": settings.RELEASE_TRANSFORM_BACKEND,
+        "mode": settings.RELEASE_TRANSFORM_MODE,
+        "draft_decode": settings.RELEASE_DRAFT_DECODE
+    }
+
+
+class AugmentationCache:
+    """
+    Per-project index of augmented images produced by earlier releases
+
+    An entry is keyed by everything that determines the output bytes: source
+    file hash, annotation hash, resolved transformation config, config seed,
+    output format, encoder profile and pixel backend. A release that finds a key reuses the
+    earlier output by hardlinking it into its own folder (falling back to a
+    reflink or copy) instead of decoding, transforming and encoding again.
+    Entries remember the output's blob in the derived blob store, which
+    outlives the release that first produced it.
+    """
+
+    def __init__(self, path: str, data: Dict[str, Any]):
+        self.path = path
+        self.data = data
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def open(cls, cache_dir: str) -> "AugmentationCache":
+        """Load the project's cache index, or start an empty one"""
+        path = os.path.join(cache_dir, CACHE_FILENAME)
+        data = None
+        if os.path.exists(path):
+            try:
+                with open(path, 'r') as f:
+                    data = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable augmentation cache {path}: {e}")
+        if not data or data.get("version") != CACHE_FORMAT_VERSION:
+            data = {"version": CACHE_FORMAT_VERSION, "sources": {}, "entries": {}}
+        return cls(path, data)
+
+    def save(self) -> None:
+        """Drop entries whose output is gone and atomically rewrite the index"""
+        entries = self.data["entries"]
+        for key in [key for key, entry in entries.items() if not self._stored_path(entry)]:
+            del entries[key]
+        self.data["updated_at"] = datetime.utcnow().isoformat()
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.data, f, default=str)
+        os.replace(tmp_path, self.path)
+        logger.info(f"Augmentation cache: {self.hits} reused, {self.misses} computed, {len(entries)} entries")
+
+    def source_hash(self, source_path: str) -> str:
+        """Content hash of a source image, re-read only when its size or mtime changed"""
+        stat = os.stat(source_path)
+        known = self.data["sources"].get(source_path)
+        if known and known[0] == stat.st_size and known[1] == stat.st_mtime_ns:
+            return known[2]
+        content_hash = file_sha256(source_path)
+        self.data["sources"][source_path] = [stat.st_size, stat.st_mtime_ns, content_hash]
+        return content_hash
+
+    @staticmethod
+    def key(source_hash: str, annotation_hash: str, config_data: Dict[str, Any], output_format: str,
+            encoder_profile: Optional[str] = None) -> str:
+        """Cache key of one (source image, transformation config) output"""
+        payload = {
+            "source": source_hash,
+            "annotations": annotation_hash,
+            "transformations": config_data.get("resolved_transformations", config_data.get("transformations")),
+            "seed": config_data.get("random_seed"),
+            "output_format": output_format.lower(),
+            "encoder_profile": encoder_profile or settings.RELEASE_ENCODER_PROFILE,
+            **transform_engine_fields()
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    def reuse(self, key: str, output_path: str, config_data: Dict[str, Any]) -> Optional[AugmentationResult]:
+        """
+        Materialize a cached output at output_path
+
+        Returns the result for the new config, or None on a miss (nothing cached,
+        or the cached file was deleted).
+        """
+        entry = self.data["entries"].get(key)
+        stored_path = self._stored_path(entry) if entry else None
+        if not stored_path:
+            self.misses += 1
+            return None
+
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        if os.path.abspath(output_path) != stored_path:
+            path_manager.link_or_copy(stored_path, output_path)
+        self.hits += 1
+
+        result = augmentation_result_from_dict({
+            **entry,
+            "augmented_image_path": output_path,
+            "transformation_applied": config_data.get("transformations", {}),
+            "config_id": config_data["config_id"]
+        })
+        self.record(key, result, entry.get("blob_digest"), entry.get("blob_path"))
+        return result
+
+    def record(self, key: str, result: AugmentationResult, blob_digest: Optional[str] = None,
+               blob_path: Optional[str] = None) -> None:
+        """Remember where the output of a key lives (the newest copy wins)"""
+        entry = asdict(result)
+        entry["augmented_image_path"] = os.path.abspath(result.augmented_image_path)
+        entry["blob_digest"] = blob_digest
+        entry["blob_path"] = blob_path
+        self.data["entries"][key] = entry
+
+    def blob_digest(self, key: str) -> Optional[str]:
+        """Blob store digest of a key's output, if known"""
+        entry = self.data["entries"].get(key)
+        return entry.get("blob_digest") if entry else None
+
+    @staticmethod
+    def _stored_path(entry: Dict[str, Any]) -> Optional[str]:
+        """The blob of an entry if it is still stored, else the release output it came from"""
+        for path in (entry.get("blob_path"), entry["augmented_image_path"]):
+            if path and os.path.exists(path):
+                return path
+        return None
@@ -0,0 +1,251 @@
+"""
+Derived Image Blob Store for Auto-Labeling Tool
+Content-addressed storage shared by release outputs, converted originals and previews
+"""
+
+import os
+import shutil
+import hashlib
+import logging
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Set, Tuple
+from datetime import datetime
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from database.models import DerivedBlob, DerivedBlobReference, DerivedBlobKey
+from utils.path_utils import path_manager
+
+logger = logging.getLogger(__name__)
+
+# Digests per IN (...) query (SQLite bound-parameter limit)
+QUERY_CHUNK_SIZE = 500
+
+
+def file_sha256(path: str) -> str:
+    """Hex SHA-256 of a file's content"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _chunks(items: List[str]) -> List[List[str]]:
+    return [items[i:i + QUERY_CHUNK_SIZE] for i in range(0, len(items), QUERY_CHUNK_SIZE)]
+
+
+class BlobStore:
+    """
+    Content-addressed store of derived images, sharded by hash
+
+    Blobs live at <root>/<d[:2]>/<d[2:4]>/<digest><ext>. Release outputs are
+    ingested by hardlinking them into the store and then hardlinking every
+    other file with the same bytes back onto the blob, so identical derived
+    bytes take disk space once no matter how many releases contain them.
+
+    Owners (e.g. "release:<id>") hold references; blobs nobody references are
+    kept as a cache and evicted least recently used first once the store grows
+    past DERIVED_BLOB_MAX_BYTES. Deleting a blob never breaks a release, whose
+    files are separate hardlinks to the same inode.
+
+    Reference and blob rows are buffered and written in bulk by flush().
+    """
+
+    def __init__(self, db: Session, root: Optional[Path] = None, max_bytes: Optional[int] = None):
+        self.db = db
+        self.root = Path(root or settings.DERIVED_BLOB_DIR)
+        self.max_bytes = max_bytes if max_bytes is not None else settings.DERIVED_BLOB_MAX_BYTES
+        self._pending_blobs: Dict[str, Tuple[str, int]] = {}  # digest -> (extension, size)
+        self._pending_refs: Set[Tuple[str, str]] = set()  # (owner, digest)
+
+    def blob_path(self, digest: str, extension: str) -> Path:
+        return self.root / digest[:2] / digest[2:4] / f"{digest}{extension}"
+
+    # Writing
+
+    def ingest_file(self, path: str, owner: Optional[str] = None) -> str:
+        """
+        Deduplicate a file that was just written against the store
+
+        The file's bytes become a blob (hardlinked, copied if linking is not
+        possible) and the file itself becomes a link to that blob.
+
+        Returns:
+            The blob digest
+        """
+        digest = file_sha256(path)
+        extension = Path(path).suffix.lower()
+        blob = self.blob_path(digest, extension)
+
+        if not blob.exists():
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                os.link(path, blob)
+            except FileExistsError:
+                pass
+            except OSError:
+                tmp_path = f"{blob}.{os.getpid()}.tmp"
+                shutil.copy2(path, tmp_path)
+                os.replace(tmp_path, blob)
+
+        if not os.path.samefile(path, blob):
+            path_manager.link_or_copy(blob, path)
+
+        self._pending_blobs[digest] = (extension, blob.stat().st_size)
+        if owner:
+            self._pending_refs.add((owner, digest))
+        return digest
+
+    def put_bytes(self, data: bytes, extension: str, key: Optional[str] = None,
+                  meta: Optional[Dict[str, Any]] = None, owner: Optional[str] = None) -> str:
+        """Store derived bytes (optionally under a derivation key) and return their digest"""
+        digest = hashlib.sha256(data).hexdigest()
+        blob = self.blob_path(digest, extension)
+        if not blob.exists():
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = f"{blob}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, blob)
+
+        self._pending_blobs[digest] = (extension, len(data))
+        if owner:
+            self._pending_refs.add((owner, digest))
+        self.flush()
+
+        if key:
+            self.db.merge(DerivedBlobKey(key=key, digest=digest, meta=meta))
+            self.db.commit()
+        return digest
+
+    def add_reference(self, owner: str, digest: str) -> None:
+        """Reference an already stored blob (buffered until flush)"""
+        self._pending_refs.add((owner, digest))
+
+    def flush(self) -> None:
+        """Write buffered blob rows and references, and refresh reference counts"""
+        if not self._pending_blobs and not self._pending_refs:
+            return
+        now = datetime.utcnow()
+
+        pending_blobs, self._pending_blobs = self._pending_blobs, {}
+        for chunk in _chunks(list(pending_blobs)):
+            existing = {
+                blob.digest: blob for blob in
+                self.db.query(DerivedBlob).filter(DerivedBlob.digest.in_(chunk)).all()
+            }
+            for digest in chunk:
+                blob = existing.get(digest)
+                if blob is None:
+                    extension, size = pending_blobs[digest]
+                    self.db.add(DerivedBlob(digest=digest, extension=extension, size_bytes=size,
+                                            ref_count=0, created_at=now, last_accessed_at=now))
+                else:
+                    blob.last_accessed_at = now
+        self.db.flush()
+
+        pending_refs, self._pending_refs = self._pending_refs, set()
+        touched = set()
+        by_owner: Dict[str, List[str]] = {}
+        for owner, digest in pending_refs:
+            by_owner.setdefault(owner, []).append(digest)
+        for owner, digests in by_owner.items():
+            for chunk in _chunks(digests):
+                held = {
+                    row[0] for row in self.db.query(DerivedBlobReference.digest).filter(
+                        DerivedBlobReference.owner == owner,
+                        DerivedBlobReference.digest.in_(chunk)
+                    ).all()
+                }
+                for digest in set(chunk) - held:
+                    self.db.add(DerivedBlobReference(owner=owner, digest=digest))
+                    touched.add(digest)
+        self.db.flush()
+
+        self._refresh_ref_counts(list(touched))
+        self.db.commit()
+
+    def _refresh_ref_counts(self, digests: List[str]) -> None:
+        for chunk in _chunks(digests):
+            counts = dict(
+                self.db.query(DerivedBlobReference.digest, func.count()).filter(
+                    DerivedBlobReference.digest.in_(chunk)
+                ).group_by(DerivedBlobReference.digest).all()
+            )
+            for blob in self.db.query(DerivedBlob).filter(DerivedBlob.digest.in_(chunk)).all():
+                blob.ref_count = counts.get(blob.digest, 0)
+
+    # Reading
+
+    def path_for(self, digest: str) -> Optional[Path]:
+        """Path of a stored blob, or None if it is not (or no longer) in the store"""
+        blob = self.db.query(DerivedBlob).filter(DerivedBlob.digest == digest).first()
+        if blob is None:
+            return None
+        path = self.blob_path(blob.digest, blob.extension)
+        return path if path.exists() else None
+
+    def lookup(self, key: str) -> Optional[Tuple[Path, Dict[str, Any]]]:
+        """(blob path, meta) previously stored under a derivation key, or None"""
+        entry = self.db.query(DerivedBlobKey).filter(DerivedBlobKey.key == key).first()
+        if entry is None:
+            return None
+        blob = self.db.query(DerivedBlob).filter(DerivedBlob.digest == entry.digest).first()
+        path = self.blob_path(blob.digest, blob.extension) if blob else None
+        if path is None or not path.exists():
+            self.db.delete(entry)
+            self.db.commit()
+            return None
+        blob.last_accessed_at = datetime.utcnow()
+        self.db.commit()
+        return path, entry.meta or {}
+
+    # Lifetime
+
+    def release_owner(self, owner: str) -> int:
+        """Drop every reference of an owner (e.g. a deleted release); returns how many were dropped"""
+        digests = [
+            row[0] for row in
+            self.db.query(DerivedBlobReference.digest).filter(DerivedBlobReference.owner == owner).all()
+        ]
+        self.db.query(DerivedBlobReference).filter(DerivedBlobReference.owner == owner).delete(synchronize_session=False)
+        self._refresh_ref_counts(digests)
+        self.db.commit()
+        return len(digests)
+
+    def collect_garbage(self, max_bytes: Optional[int] = None) -> Dict[str, int]:
+        """Evict unreferenced blobs, least recently used first, until the store fits max_bytes"""
+        self.flush()
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        total_bytes = self.db.query(func.coalesce(func.sum(DerivedBlob.size_bytes), 0)).scalar() or 0
+
+        evicted = 0
+        freed = 0
+        if total_bytes > max_bytes:
+            candidates = self.db.query(DerivedBlob).filter(
+                DerivedBlob.ref_count <= 0
+            ).order_by(DerivedBlob.last_accessed_at).yield_per(QUERY_CHUNK_SIZE)
+            doomed = []
+            for blob in candidates:
+                if total_bytes - freed <= max_bytes:
+                    break
+                doomed.append((blob.digest, blob.extension, blob.size_bytes))
+                freed += blob.size_bytes
+
+            for digest, extension, _ in doomed:
+                try:
+                    self.blob_path(digest, extension).unlink()
+                except FileNotFoundError:
+                    pass
+            for chunk in _chunks([digest for digest, _, _ in doomed]):
+                self.db.query(DerivedBlobKey).filter(DerivedBlobKey.digest.in_(chunk)).delete(synchronize_session=False)
+                self.db.query(DerivedBlob).filter(DerivedBlob.digest.in_(chunk)).delete(synchronize_session=False)
+            self.db.commit()
+            evicted = len(doomed)
+
+        if evicted:
+            logger.info(f"Blob store GC: evicted {evicted} blobs ({freed} bytes), {total_bytes - freed} bytes kept")
+        return {"evicted": evicted, "freed_bytes": freed, "total_bytes": total_bytes - freed}
@@ -27,6 +27,17 @@ class Settings(BaseSettings):
     # Database
     DATABASE_PATH: Path = BASE_DIR / "database.db"
     DATABASE_URL: str = f"sqlite:///{DATABASE_PATH}"
+    DATABASE_ASYNC_URL: str = ""  # Async driver URL for async routes ("" = DATABASE_URL with aiosqlite)
+    DATABASE_POOL_SIZE: int = 20  # Connections kept open for request, job and worker threads
+    DATABASE_MAX_OVERFLOW: int = 20  # Extra connections under bursts (closed when returned)
+    DATABASE_POOL_TIMEOUT: float = 30.0  # Seconds to wait for a free connection
+    DATABASE_SQLITE_TUNED: bool = True  # Apply the pragmas below on every SQLite connection (False = SQLite defaults)
+    DATABASE_SQLITE_JOURNAL_MODE: str = "WAL"  # WAL lets readers run alongside the single writer
+    DATABASE_SQLITE_SYNCHRONOUS: str = "NORMAL"  # Durable in WAL mode; FULL also syncs every commit
+    DATABASE_SQLITE_BUSY_TIMEOUT_MS: int = 5000  # Wait this long for a lock instead of failing with "database is locked"
+    DATABASE_SQLITE_MMAP_SIZE: int = 256 * 1024 ** 2  # Bytes of the database file read through mmap
+    DATABASE_SQLITE_CACHE_SIZE_KB: int = 64 * 1024  # Page cache per connection
+    DATABASE_SQLITE_TEMP_STORE: str = "MEMORY"  # Temporary tables and sort indexes in memory
     
     # Model settings
     DEFAULT_CONFIDENCE_THRESHOLD: float = 0.5
@@ -49,6 +60,30 @@ class Settings(BaseSettings):
     MAX_FILE_SIZE: int = 100 * 1024 * 1024  # 100MB per image
     MAX_BATCH_SIZE: int = 10000  # 10,000 images
     
+    # Release generation
+    RELEASE_MAX_WORKERS: int = 0  # 0 = one worker per CPU core, 1 = run in-process
+    RELEASE_MAX_PENDING_PER_WORKER: int = 2  # In-flight source images per worker (bounds memory)
+    RELEASE_CHECKPOINT_INTERVAL: int = 25  # Source images per manifest checkpoint (resumable releases)
+    RELEASE_TRANSFORM_MODE: str = "sequential"  # sequential = one pass per step (the original output), fused = one warp per run of geometric steps
+    RELEASE_TRANSFORM_BACKEND: str = "pil"  # pil = PIL image per step (the original output), numpy = decode once to an array and transform in place
+    RELEASE_DRAFT_DECODE: bool = True  # Decode JPEGs at 1/2-1/8 scale when every config starts with a downscaling resize
+    RELEASE_ENCODER_PROFILE: str = "balanced"  # fast, balanced or archival output encoding (see image_generator.ENCODER_PROFILES)
+    RELEASE_PIPELINE: bool = True  # Staged load/transform/encode/write threads (False = one work unit per worker process)
+    RELEASE_PIPELINE_TRANSFORM_PROCESSES: bool = True  # Run the pipeline's transform stage in RELEASE_MAX_WORKERS worker processes (False = threads under the GIL)
+    RELEASE_PIPELINE_LOAD_WORKERS: int = 4  # Reader threads (file I/O and decode)
+    RELEASE_PIPELINE_ENCODE_WORKERS: int = 0  # Encoder threads (0 = one per CPU core)
+    RELEASE_PIPELINE_WRITE_WORKERS: int = 2  # Writer threads
+    RELEASE_PIPELINE_QUEUE_SIZE: int = 16  # Items buffered between two pipeline stages (backpressure)
+    RELEASE_JOB_CONCURRENCY: int = 1  # Release jobs run at once by one release worker
+    RELEASE_JOB_POLL_INTERVAL: float = 2.0  # Seconds between queue polls when idle
+    RELEASE_JOB_STALE_SECONDS: int = 300  # Running jobs without a heartbeat for this long are requeued
+    RELEASE_JOB_MAX_ATTEMPTS: int = 3  # Give up on a job after this many claims
+    RELEASE_EMBEDDED_WORKER: bool = False  # Run a release worker thread inside the API process (for setups that do not run release_worker.py)
+    
+    # Derived image blob store (content-addressed, shared by releases and previews)
+    DERIVED_BLOB_DIR: Path = BASE_DIR / "derived_blobs"
+    DERIVED_BLOB_MAX_BYTES: int = 20 * 1024 ** 3  # Unreferenced blobs are evicted (LRU) above this size
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
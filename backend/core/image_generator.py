@@ -4,22 +4,35 @@ Integrates with existing ImageTransformer service and handles annotation updates
 """
 
 import os
+import io
 import json
+import math
 import logging
-from typing import List, Dict, Any, Tuple, Optional, Union
+import multiprocessing
+from typing import List, Dict, Any, Tuple, Optional, Union, Iterator, Iterable, Callable, BinaryIO
 from dataclasses import dataclass
+from collections import deque, Counter
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from PIL import Image
+import numpy as np
 import uuid
 
+from core.config import settings
+from core.annotation_geometry import transform_annotations
+
 # Import existing transformation service
 from api.services.image_transformer import ImageTransformer
+from api.services.array_transformer import ArrayImageTransformer
 
 # Import dual-value transformation functions
 from core.transformation_config import is_dual_value_transformation, generate_auto_value
 
 logger = logging.getLogger(__name__)
 
+# Transformations that draw random values on every call and so cannot be shared between configs
+NON_DETERMINISTIC_TRANSFORMATIONS = {'noise', 'cutout', 'perspective_warp'}
+
 @dataclass
 class BoundingBox:
     """Bounding box representation"""
@@ -49,15 +62,108 @@ class AugmentationResult:
     augmented_dimensions: Tuple[int, int]
     config_id: str
 
+# Pixel backends: PIL images, or uint8 HWC arrays decoded once and encoded once
+TRANSFORM_BACKENDS = {
+    "pil": ImageTransformer,
+    "numpy": ArrayImageTransformer
+}
+
+# Pillow save() options per encoder profile and format (benchmarks/benchmark_encoder_profiles.py
+# reports MB/s and bytes/image of each on your hardware)
+# - fast: quality 90 4:2:0 JPEG with a single Huffman pass, zlib level 1 PNG, WebP method 0.
+#   Several times faster to encode than archival; files are larger and JPEG/WebP slightly lossier.
+# - balanced: same quality as archival, but JPEG skips the optimized-Huffman second pass
+#   (identical pixels, a few percent larger), PNG uses zlib level 6 and WebP method 4.
+# - archival: the smallest files at quality 95 (optimize=True, WebP method 6), slowest to encode.
+ENCODER_PROFILES = {
+    "fast": {
+        "JPEG": {"quality": 90, "optimize": False, "subsampling": "4:2:0"},
+        "PNG": {"compress_level": 1},
+        "WEBP": {"quality": 85, "method": 0}
+    },
+    "balanced": {
+        "JPEG": {"quality": 95, "optimize": False},
+        "PNG": {"compress_level": 6},
+        "WEBP": {"quality": 95, "method": 4}
+    },
+    "archival": {
+        "JPEG": {"quality": 95, "optimize": True},
+        "PNG": {"optimize": True},
+        "WEBP": {"quality": 95, "method": 6}
+    }
+}
+
+
+def _format_for_path(output_path: Union[Path, str, BinaryIO]) -> Optional[str]:
+    """Pillow format name implied by a path's (or named file object's) extension"""
+    name = getattr(output_path, "name", output_path)
+    return Image.registered_extensions().get(Path(str(name)).suffix.lower())
+
+
+def resolve_dual_value_parameters(transformation_config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Resolve dual-value parameters to single values for image processing
+    
+    Handles both formats:
+    1. Already resolved: {"brightness": {"adjustment": 20}}
+    2. Dual-value format: {"brightness": {"adjustment": {"user_value": 20, "auto_value": -15}}}
+    
+    Priority Order: User Value → Auto Value → Original Value
+    """
+    resolved_config = {}
+    
+    for tool_type, tool_params in transformation_config.items():
+        if not isinstance(tool_params, dict):
+            # Handle non-dict parameters (shouldn't happen, but be safe)
+            resolved_config[tool_type] = tool_params
+            continue
+        
+        resolved_params = {}
+        
+        for param_name, param_value in tool_params.items():
+            if isinstance(param_value, dict) and ('user_value' in param_value or 'auto_value' in param_value):
+                # This is a dual-value parameter - resolve it
+                if 'user_value' in param_value and param_value['user_value'] is not None:
+                    # Priority 1: Use user value
+                    resolved_params[param_name] = param_value['user_value']
+                    logger.debug(f"Resolved {tool_type}.{param_name}: user_value = {param_value['user_value']}")
+                elif 'auto_value' in param_value and param_value['auto_value'] is not None:
+                    # Priority 2: Use auto value
+                    resolved_params[param_name] = param_value['auto_value']
+                    logger.debug(f"Resolved {tool_type}.{param_name}: auto_value = {param_value['auto_value']}")
+                else:
+                    # Fallback: Use the dict as-is (shouldn't happen)
+                    resolved_params[param_name] = param_value
+                    logger.warning(f"Could not resolve dual-value for {tool_type}.{param_name}: {param_value}")
+            else:
+                # This is already a resolved single value
+                resolved_params[param_name] = param_value
+        
+        resolved_config[tool_type] = resolved_params
+    
+    logger.debug(f"Resolved transformation config: {resolved_config}")
+    return resolved_config
+
+
 class ImageAugmentationEngine:
     """
     Handles image transformations and annotation updates for release pipeline
     Phase 1: Integrates with existing ImageTransformer service
     """
     
-    def __init__(self, output_base_dir: str = "augmented"):
+    def __init__(self, output_base_dir: str = "augmented", execution_mode: Optional[str] = None,
+                 backend: Optional[str] = None, encoder_profile: Optional[str] = None):
         self.output_base_dir = Path(output_base_dir)
-        self.transformer = ImageTransformer()
+        # fast, balanced or archival output encoding (None = settings.RELEASE_ENCODER_PROFILE)
+        self.encoder_profile = encoder_profile or settings.RELEASE_ENCODER_PROFILE
+        if self.encoder_profile not in ENCODER_PROFILES:
+            raise ValueError(f"Unknown encoder profile: {self.encoder_profile}")
+        # pil or numpy pixel backend (None = settings.RELEASE_TRANSFORM_BACKEND)
+        self.backend = backend or settings.RELEASE_TRANSFORM_BACKEND
+        if self.backend not in TRANSFORM_BACKENDS:
+            raise ValueError(f"Unknown transform backend: {self.backend}")
+        # sequential or fused transformation execution (None = settings.RELEASE_TRANSFORM_MODE)
+        self.transformer = TRANSFORM_BACKENDS[self.backend](execution_mode or settings.RELEASE_TRANSFORM_MODE)
         self.supported_formats = ['.jpg', '.jpeg', '.png', '.bmp']
         
         # Create output directories
@@ -66,37 +172,107 @@ class ImageAugmentationEngine:
         
         logger.info(f"Initialized ImageAugmentationEngine with output dir: {self.output_base_dir}")
     
-    def load_image_from_path(self, image_path: str) -> Tuple[Image.Image, Tuple[int, int]]:
-        """Load image and return PIL Image with original dimensions"""
+    def load_image_from_path(self, image_path: str,
+                             transformation_configs: Optional[List[Dict[str, Any]]] = None) -> Tuple[Image.Image, Tuple[int, int]]:
+        """
+        Load image and return PIL Image with original dimensions
+        
+        When transformation_configs are given and every one of them starts by
+        shrinking the image (see _draft_size), JPEGs are decoded at a reduced
+        DCT scale; the returned image is then smaller than original_dims.
+        """
         if not os.path.exists(image_path):
             raise FileNotFoundError(f"Image not found: {image_path}")
         
         try:
             image = Image.open(image_path)
+            original_dims = image.size  # (width, height)
+            
+            if transformation_configs and settings.RELEASE_DRAFT_DECODE:
+                draft_size = self._draft_size(transformation_configs, original_dims)
+                if draft_size and image.draft('RGB', draft_size):
+                    logger.debug(f"Draft decode of {image_path}: {original_dims} -> {image.size}")
+            
             # Convert to RGB if necessary
             if image.mode != 'RGB':
                 image = image.convert('RGB')
             
-            original_dims = image.size  # (width, height)
             logger.debug(f"Loaded image: {image_path}, dimensions: {original_dims}")
             return image, original_dims
             
         except Exception as e:
             raise ValueError(f"Failed to load image {image_path}: {str(e)}")
     
-    def _save_image_with_format(self, image: Image.Image, output_path: Path, output_format: str) -> None:
+    def _draft_size(self, transformation_configs: List[Dict[str, Any]],
+                    original_dims: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+        """
+        Smallest decoded size that still serves every config, or None to decode fully
+        
+        Only applies when every config starts with a resize that shrinks the
+        image: the source is then decoded at the largest DCT scale reduction
+        (1/2, 1/4, 1/8) that stays at or above what each resize needs.
+        """
+        original_width, original_height = original_dims
+        needed_width = needed_height = 0
+        for config_data in transformation_configs:
+            resolved_config = config_data.get('resolved_transformations')
+            if resolved_config is None:
+                resolved_config = self._resolve_dual_value_parameters(config_data.get('transformations', {}) or {})
+            first_step = next(iter(resolved_config.items()), None)
+            if first_step is None or first_step[0] != 'resize' or not isinstance(first_step[1], dict):
+                return None
+            
+            params = first_step[1]
+            target_width, target_height = self.transformer._resize_target(params)
+            resize_mode = params.get('resize_mode', 'stretch_to')
+            if resize_mode == 'stretch_to':
+                width, height = target_width, target_height
+            elif resize_mode in ('fill_center_crop', 'fit_within', 'fit_reflect_edges',
+                                 'fit_black_edges', 'fit_white_edges'):
+                # Aspect-preserving modes scale both axes by the same factor
+                pick = max if resize_mode == 'fill_center_crop' else min
+                scale = pick(target_width / original_width, target_height / original_height)
+                width, height = math.ceil(original_width * scale), math.ceil(original_height * scale)
+            else:
+                return None
+            needed_width, needed_height = max(needed_width, width), max(needed_height, height)
+        
+        # A draft only helps if the smallest DCT scale (1/2) still covers every resize
+        if needed_width * 2 > original_width or needed_height * 2 > original_height:
+            return None
+        return needed_width, needed_height
+    
+    @staticmethod
+    def decode_geometry(image: Union[Image.Image, np.ndarray], original_dims: Tuple[int, int]) -> np.ndarray:
+        """Homography from source pixel coordinates to a (possibly draft decoded) working image"""
+        width, height = (image.shape[1], image.shape[0]) if isinstance(image, np.ndarray) else image.size
+        return np.diag([width / original_dims[0], height / original_dims[1], 1.0])
+    
+    def _load_working_image(self, image_path: str,
+                            transformation_configs: Optional[List[Dict[str, Any]]] = None
+                            ) -> Tuple[Union[Image.Image, np.ndarray], Tuple[int, int]]:
+        """Decode the source into whatever the selected backend transforms"""
+        image, original_dims = self.load_image_from_path(image_path, transformation_configs)
+        if self.backend == "numpy":
+            return ArrayImageTransformer.to_array(image), original_dims
+        image.load()
+        return image, original_dims
+    
+    def _save_image_with_format(self, image: Image.Image, output_path: Union[Path, BinaryIO], output_format: str) -> None:
         """
         Save image with proper format conversion
         
+        Encoder settings come from the engine's encoder profile (see ENCODER_PROFILES).
+        
         Args:
             image: PIL Image to save
-            output_path: Output file path
+            output_path: Output file path (or a binary file object with a matching name)
             output_format: Target format (original, jpg, png, webp, bmp, tiff)
         """
         try:
             if output_format.lower() == "original":
                 # Keep original format - save as-is
-                image.save(output_path, quality=95, optimize=True)
+                image.save(output_path, **self._encoder_options(_format_for_path(output_path)))
             elif output_format.lower() in ["jpg", "jpeg"]:
                 # Convert to RGB for JPEG (no transparency)
                 if image.mode in ("RGBA", "LA", "P"):
@@ -106,13 +282,13 @@ class ImageAugmentationEngine:
                         image = image.convert("RGBA")
                     background.paste(image, mask=image.split()[-1] if image.mode == "RGBA" else None)
                     image = background
-                image.save(output_path, format="JPEG", quality=95, optimize=True)
+                image.save(output_path, format="JPEG", **self._encoder_options("JPEG"))
             elif output_format.lower() == "png":
                 # PNG supports transparency
-                image.save(output_path, format="PNG", optimize=True)
+                image.save(output_path, format="PNG", **self._encoder_options("PNG"))
             elif output_format.lower() == "webp":
                 # WebP format
-                image.save(output_path, format="WEBP", quality=95, optimize=True)
+                image.save(output_path, format="WEBP", **self._encoder_options("WEBP"))
             elif output_format.lower() == "bmp":
                 # BMP format (convert to RGB)
                 if image.mode in ("RGBA", "LA", "P"):
@@ -120,11 +296,11 @@ class ImageAugmentationEngine:
                 image.save(output_path, format="BMP")
             elif output_format.lower() == "tiff":
                 # TIFF format
-                image.save(output_path, format="TIFF", quality=95)
+                image.save(output_path, format="TIFF", **self._encoder_options("TIFF"))
             else:
                 # Fallback to original format
                 logger.warning(f"Unsupported output format: {output_format}, using original")
-                image.save(output_path, quality=95, optimize=True)
+                image.save(output_path, **self._encoder_options(_format_for_path(output_path)))
                 
             logger.debug(f"Saved image as {output_format.upper()}: {output_path}")
             
@@ -133,6 +309,19 @@ class ImageAugmentationEngine:
             # Fallback to default save
             image.save(output_path, quality=95, optimize=True)
     
+    def _encoder_options(self, image_format: Optional[str]) -> Dict[str, Any]:
+        """Pillow save() options of the engine's encoder profile for one format"""
+        return dict(ENCODER_PROFILES[self.encoder_profile].get(image_format, {}))
+    
+    def encode_image(self, image: Union[Image.Image, np.ndarray], output_path: Path, output_format: str) -> bytes:
+        """Encode an image to the bytes _save_image_with_format would write to output_path"""
+        if isinstance(image, np.ndarray):
+            image = ArrayImageTransformer.to_image(image)
+        buffer = io.BytesIO()
+        buffer.name = str(output_path)  # PIL picks the format of "original" saves from the name
+        self._save_image_with_format(image, buffer, output_format)
+        return buffer.getvalue()
+    
     def generate_augmented_filename(self, original_filename: str, config_id: str, 
                                   output_format: str = "jpg") -> str:
         """Generate filename for augmented image"""
@@ -155,49 +344,16 @@ class ImageAugmentationEngine:
         augmented_filename = f"{base_name}_{config_id}.{extension}"
         return augmented_filename
     
+    def augmented_output_path(self, image_path: str, config_id: str, dataset_split: str,
+                              output_format: str, output_filename: Optional[str] = None) -> Path:
+        """Where the output of one (source image, config) pair is written"""
+        original_filename = output_filename or os.path.basename(image_path)
+        augmented_filename = self.generate_augmented_filename(original_filename, config_id, output_format)
+        return self.output_base_dir / dataset_split / augmented_filename
+    
     def _resolve_dual_value_parameters(self, transformation_config: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        Resolve dual-value parameters to single values for image processing
-        
-        Handles both formats:
-        1. Already resolved: {"brightness": {"adjustment": 20}}
-        2. Dual-value format: {"brightness": {"adjustment": {"user_value": 20, "auto_value": -15}}}
-        
-        Priority Order: User Value → Auto Value → Original Value
-        """
-        resolved_config = {}
-        
-        for tool_type, tool_params in transformation_config.items():
-            if not isinstance(tool_params, dict):
-                # Handle non-dict parameters (shouldn't happen, but be safe)
-                resolved_config[tool_type] = tool_params
-                continue
-            
-            resolved_params = {}
-            
-            for param_name, param_value in tool_params.items():
-                if isinstance(param_value, dict) and ('user_value' in param_value or 'auto_value' in param_value):
-                    # This is a dual-value parameter - resolve it
-                    if 'user_value' in param_value and param_value['user_value'] is not None:
-                        # Priority 1: Use user value
-                        resolved_params[param_name] = param_value['user_value']
-                        logger.debug(f"Resolved {tool_type}.{param_name}: user_value = {param_value['user_value']}")
-                    elif 'auto_value' in param_value and param_value['auto_value'] is not None:
-                        # Priority 2: Use auto value
-                        resolved_params[param_name] = param_value['auto_value']
-                        logger.debug(f"Resolved {tool_type}.{param_name}: auto_value = {param_value['auto_value']}")
-                    else:
-                        # Fallback: Use the dict as-is (shouldn't happen)
-                        resolved_params[param_name] = param_value
-                        logger.warning(f"Could not resolve dual-value for {tool_type}.{param_name}: {param_value}")
-                else:
-                    # This is already a resolved single value
-                    resolved_params[param_name] = param_value
-            
-            resolved_config[tool_type] = resolved_params
-        
-        logger.debug(f"Resolved transformation config: {resolved_config}")
-        return resolved_config
+        """Resolve dual-value parameters to single values for image processing"""
+        return resolve_dual_value_parameters(transformation_config)
     
     def apply_transformations_to_image(self, image: Image.Image, 
                                      transformation_config: Dict[str, Any]) -> Image.Image:
@@ -207,7 +363,12 @@ class ImageAugmentationEngine:
             resolved_config = self._resolve_dual_value_parameters(transformation_config)
             
             # Use the existing ImageTransformer service
-            transformed_image = self.transformer.apply_transformations(image, resolved_config)
+            if self.backend == "numpy":
+                transformed_image = ArrayImageTransformer.to_image(
+                    self.transformer.apply_transformations(ArrayImageTransformer.to_array(image), resolved_config)
+                )
+            else:
+                transformed_image = self.transformer.apply_transformations(image, resolved_config)
             logger.debug(f"Applied transformations: {list(resolved_config.keys())}")
             return transformed_image
             
@@ -220,147 +381,93 @@ class ImageAugmentationEngine:
     def update_annotations_for_transformations(self, annotations: List[Union[BoundingBox, Polygon]], 
                                              transformation_config: Dict[str, Any],
                                              original_dims: Tuple[int, int],
-                                             new_dims: Tuple[int, int]) -> List[Union[BoundingBox, Polygon]]:
+                                             new_dims: Tuple[int, int],
+                                             geometry: Optional[np.ndarray] = None) -> List[Union[BoundingBox, Polygon]]:
         """
         Update annotations based on applied transformations with dual-value support
-        Phase 1: Basic annotation updates for common transformations
+        
+        Every geometric step of the config is composed into one 3x3 homography,
+        which is applied to all boxes and polygon vertices of the image at once.
+        
+        Args:
+            annotations: Annotations in source image pixel coordinates
+            transformation_config: Transformations that were applied
+            original_dims: (width, height) of the source image
+            new_dims: (width, height) of the augmented image
+            geometry: Homography reported by the transformer for this image; when
+                      omitted it is recomputed from the config (random steps only
+                      match if their choices were frozen into the config)
         """
         if not annotations:
             return []
         
-        # Resolve dual-value parameters for annotation processing
-        resolved_config = self._resolve_dual_value_parameters(transformation_config)
-        
-        updated_annotations = []
+        if geometry is None:
+            # Resolve dual-value parameters for annotation processing
+            resolved_config = self._resolve_dual_value_parameters(transformation_config)
+            geometry, _ = self.transformer.compose_geometry(resolved_config, original_dims)
         
-        for annotation in annotations:
-            try:
-                updated_annotation = self._transform_single_annotation(
-                    annotation, resolved_config, original_dims, new_dims
-                )
-                if updated_annotation:
-                    updated_annotations.append(updated_annotation)
-            except Exception as e:
-                logger.warning(f"Failed to update annotation: {str(e)}")
-                # Keep original annotation if update fails
-                updated_annotations.append(annotation)
+        try:
+            updated_annotations = transform_annotations(annotations, geometry, new_dims)
+        except Exception as e:
+            logger.warning(f"Failed to update annotations: {str(e)}")
+            # Keep original annotations if update fails
+            return list(annotations)
         
-        logger.debug(f"Updated {len(updated_annotations)} annotations")
+        logger.debug(f"Updated {len(updated_annotations)} of {len(annotations)} annotations")
         return updated_annotations
     
-    def _transform_single_annotation(self, annotation: Union[BoundingBox, Polygon],
-                                   transformation_config: Dict[str, Any],
-                                   original_dims: Tuple[int, int],
-                                   new_dims: Tuple[int, int]) -> Optional[Union[BoundingBox, Polygon]]:
-        """Transform a single annotation based on transformations applied"""
+    def _save_augmentation_result(self, augmented_image: Union[Image.Image, np.ndarray], image_path: str,
+                                  transformation_config: Dict[str, Any], config_id: str,
+                                  dataset_split: str, output_format: str,
+                                  original_dims: Tuple[int, int],
+                                  annotations: Optional[List[Union[BoundingBox, Polygon]]] = None,
+                                  output_filename: Optional[str] = None,
+                                  geometry: Optional[np.ndarray] = None) -> AugmentationResult:
+        """Save an already transformed image and build its AugmentationResult"""
+        if isinstance(augmented_image, np.ndarray):
+            augmented_image = ArrayImageTransformer.to_image(augmented_image)
+        augmented_dims = augmented_image.size
         
-        # For Phase 1, we'll handle basic transformations that don't change coordinates
-        # More complex transformations will be added in later phases
+        # Generate output filename and path
+        output_path = self.augmented_output_path(image_path, config_id, dataset_split, output_format, output_filename)
         
-        if isinstance(annotation, BoundingBox):
-            return self._transform_bbox(annotation, transformation_config, original_dims, new_dims)
-        elif isinstance(annotation, Polygon):
-            return self._transform_polygon(annotation, transformation_config, original_dims, new_dims)
-        else:
-            return annotation
-    
-    def _transform_bbox(self, bbox: BoundingBox, transformation_config: Dict[str, Any],
-                       original_dims: Tuple[int, int], new_dims: Tuple[int, int]) -> Optional[BoundingBox]:
-        """Transform bounding box coordinates"""
+        # Save augmented image with proper format conversion
+        self._save_image_with_format(augmented_image, output_path, output_format)
         
-        # Start with original coordinates
-        x_min, y_min, x_max, y_max = bbox.x_min, bbox.y_min, bbox.x_max, bbox.y_max
-        orig_width, orig_height = original_dims
-        new_width, new_height = new_dims
-        
-        # Handle transformations that affect coordinates
-        for transform_name, params in transformation_config.items():
-            if not params.get('enabled', True):
-                continue
-                
-            if transform_name == 'flip':
-                if params.get('horizontal', False):
-                    # Flip horizontally
-                    x_min, x_max = orig_width - x_max, orig_width - x_min
-                if params.get('vertical', False):
-                    # Flip vertically
-                    y_min, y_max = orig_height - y_max, orig_height - y_min
-            
-            elif transform_name == 'resize':
-                # Scale coordinates based on resize
-                width_ratio = new_width / orig_width
-                height_ratio = new_height / orig_height
-                
-                x_min *= width_ratio
-                x_max *= width_ratio
-                y_min *= height_ratio
-                y_max *= height_ratio
-                
-                # Update original dimensions for subsequent transformations
-                orig_width, orig_height = new_width, new_height
-        
-        # Ensure coordinates are within bounds
-        x_min = max(0, min(x_min, new_width))
-        x_max = max(0, min(x_max, new_width))
-        y_min = max(0, min(y_min, new_height))
-        y_max = max(0, min(y_max, new_height))
-        
-        # Ensure min < max
-        if x_min >= x_max or y_min >= y_max:
-            logger.warning("Invalid bounding box after transformation, skipping")
-            return None
-        
-        return BoundingBox(x_min, y_min, x_max, y_max, bbox.class_name, bbox.class_id, bbox.confidence)
+        return self.build_augmentation_result(
+            output_path, transformation_config, config_id, original_dims, augmented_dims, annotations, geometry
+        )
     
-    def _transform_polygon(self, polygon: Polygon, transformation_config: Dict[str, Any],
-                          original_dims: Tuple[int, int], new_dims: Tuple[int, int]) -> Optional[Polygon]:
-        """Transform polygon coordinates"""
+    def build_augmentation_result(self, output_path: Path, transformation_config: Dict[str, Any], config_id: str,
+                                  original_dims: Tuple[int, int], augmented_dims: Tuple[int, int],
+                                  annotations: Optional[List[Union[BoundingBox, Polygon]]] = None,
+                                  geometry: Optional[np.ndarray] = None) -> AugmentationResult:
+        """AugmentationResult of an output that has been written to output_path"""
+        # Update annotations if provided
+        updated_annotations = []
+        if annotations:
+            updated_annotations = self.update_annotations_for_transformations(
+                annotations, transformation_config, original_dims, augmented_dims, geometry
+            )
         
-        # Start with original points
-        points = polygon.points.copy()
-        orig_width, orig_height = original_dims
-        new_width, new_height = new_dims
+        result = AugmentationResult(
+            augmented_image_path=str(output_path),
+            updated_annotations=updated_annotations,
+            transformation_applied=transformation_config,
+            original_dimensions=original_dims,
+            augmented_dimensions=augmented_dims,
+            config_id=config_id
+        )
         
-        # Handle transformations that affect coordinates
-        for transform_name, params in transformation_config.items():
-            if not params.get('enabled', True):
-                continue
-                
-            if transform_name == 'flip':
-                if params.get('horizontal', False):
-                    # Flip horizontally
-                    points = [(orig_width - x, y) for x, y in points]
-                if params.get('vertical', False):
-                    # Flip vertically
-                    points = [(x, orig_height - y) for x, y in points]
-            
-            elif transform_name == 'resize':
-                # Scale coordinates based on resize
-                width_ratio = new_width / orig_width
-                height_ratio = new_height / orig_height
-                
-                points = [(x * width_ratio, y * height_ratio) for x, y in points]
-                
-                # Update original dimensions for subsequent transformations
-                orig_width, orig_height = new_width, new_height
-        
-        # Ensure all points are within bounds
-        valid_points = []
-        for x, y in points:
-            x = max(0, min(x, new_width))
-            y = max(0, min(y, new_height))
-            valid_points.append((x, y))
-        
-        if len(valid_points) < 3:
-            logger.warning("Polygon has less than 3 valid points after transformation, skipping")
-            return None
-        
-        return Polygon(valid_points, polygon.class_name, polygon.class_id, polygon.confidence)
+        logger.info(f"Generated augmented image: {Path(output_path).name}")
+        return result
     
     def generate_augmented_image(self, image_path: str, transformation_config: Dict[str, Any],
                                config_id: str, dataset_split: str = "train",
                                output_format: str = "jpg",
-                               annotations: Optional[List[Union[BoundingBox, Polygon]]] = None) -> AugmentationResult:
+                               annotations: Optional[List[Union[BoundingBox, Polygon]]] = None,
+                               output_filename: Optional[str] = None,
+                               random_seed: Optional[int] = None) -> AugmentationResult:
         """
         Generate augmented image with updated annotations and dual-value support
         
@@ -371,6 +478,8 @@ class ImageAugmentationEngine:
             dataset_split: Dataset split (train/val/test)
             output_format: Output image format
             annotations: List of annotations to update
+            output_filename: Name the augmented output is derived from (defaults to the source basename)
+            random_seed: Seed for the random transforms of this config (None = fresh entropy)
             
         Returns:
             AugmentationResult with paths and updated annotations
@@ -381,49 +490,166 @@ class ImageAugmentationEngine:
                 logger.warning(f"Empty transformation config for image: {image_path}")
                 transformation_config = {}
             
-            # Load original image
-            original_image, original_dims = self.load_image_from_path(image_path)
-            
             # Apply transformations with dual-value support
-            augmented_image = self.apply_transformations_to_image(original_image, transformation_config)
-            augmented_dims = augmented_image.size
-            
-            # Generate output filename and path
-            original_filename = os.path.basename(image_path)
-            augmented_filename = self.generate_augmented_filename(original_filename, config_id, output_format)
-            output_path = self.output_base_dir / dataset_split / augmented_filename
-            
-            # Save augmented image with proper format conversion
-            self._save_image_with_format(augmented_image, output_path, output_format)
+            resolved_config = self._resolve_dual_value_parameters(transformation_config)
             
-            # Update annotations if provided
-            updated_annotations = []
-            if annotations:
-                updated_annotations = self.update_annotations_for_transformations(
-                    annotations, transformation_config, original_dims, augmented_dims
-                )
+            # Load original image
+            original_image, original_dims = self._load_working_image(
+                image_path, [{'resolved_transformations': resolved_config}]
+            )
             
-            result = AugmentationResult(
-                augmented_image_path=str(output_path),
-                updated_annotations=updated_annotations,
-                transformation_applied=transformation_config,
-                original_dimensions=original_dims,
-                augmented_dimensions=augmented_dims,
-                config_id=config_id
+            augmented_image, geometry = self.transformer.apply_transformations_with_geometry(
+                original_image, resolved_config, np.random.default_rng(random_seed)
             )
+            geometry = geometry @ self.decode_geometry(original_image, original_dims)
             
-            logger.info(f"Generated augmented image: {augmented_filename}")
-            return result
+            return self._save_augmentation_result(
+                augmented_image, image_path, transformation_config, config_id,
+                dataset_split, output_format, original_dims, annotations,
+                output_filename, geometry
+            )
             
         except Exception as e:
             logger.error(f"Failed to generate augmented image: {str(e)}")
             raise
     
+    @staticmethod
+    def _is_shareable_step(transform_name: str, params: Any) -> bool:
+        """
+        Whether a transformation step gives the same output every time it runs
+        
+        Only deterministic steps may be computed once and shared between configs;
+        random steps (noise, cutout, perspective warp, random crop) must run per config.
+        """
+        if not isinstance(params, dict):
+            return False
+        if transform_name in NON_DETERMINISTIC_TRANSFORMATIONS:
+            return False
+        if transform_name == 'crop' and params.get('crop_mode') == 'random':
+            return False
+        return True
+    
+    @staticmethod
+    def _step_key(transform_name: str, params: Dict[str, Any]) -> str:
+        """Stable key for one resolved transformation step"""
+        return json.dumps([transform_name, params], sort_keys=True, default=str)
+    
+    def _shareable_prefix_keys(self, steps: List[Tuple[str, Any]]) -> List[Tuple[str, ...]]:
+        """Keys of every deterministic prefix of a transformation chain, shortest first"""
+        keys = []
+        key: Tuple[str, ...] = ()
+        for transform_name, params in steps:
+            if not self._is_shareable_step(transform_name, params):
+                break
+            key = key + (self._step_key(transform_name, params),)
+            keys.append(key)
+        return keys
+    
+    def _process_image_fan_out(self, image_path: str,
+                               transformation_configs: List[Dict[str, Any]],
+                               dataset_split: str, output_format: str,
+                               annotations: Optional[List[Union[BoundingBox, Polygon]]],
+                               output_filename: Optional[str] = None) -> List[AugmentationResult]:
+        """
+        Decode the source once and branch every config from the shared pixels
+        
+        Deterministic chain prefixes used by two or more configs (e.g. the same
+        resize at the front of every config) are computed once and reused
+        (sequential execution only, see transform_fan_out).
+        """
+        original_image, original_dims = self._load_working_image(image_path, transformation_configs)
+        
+        results = []
+        for config_data, augmented_image, geometry in self.transform_fan_out(
+                original_image, transformation_configs, self.decode_geometry(original_image, original_dims)):
+            try:
+                result = self._save_augmentation_result(
+                    augmented_image, image_path, config_data.get('transformations', {}) or {},
+                    config_data['config_id'], dataset_split, output_format, original_dims, annotations,
+                    output_filename, geometry
+                )
+                results.append(result)
+                
+            except Exception as e:
+                logger.error(f"Failed to process config {config_data.get('config_id', 'unknown')}: {str(e)}")
+                continue
+        
+        return results
+    
+    def transform_fan_out(self, original_image: Union[Image.Image, np.ndarray],
+                          transformation_configs: List[Dict[str, Any]],
+                          base_geometry: Optional[np.ndarray] = None
+                          ) -> Iterator[Tuple[Dict[str, Any], Union[Image.Image, np.ndarray], np.ndarray]]:
+        """
+        Yield (config_data, augmented image, geometry) for every config of one decoded source
+        
+        Configs that fail to transform are logged and skipped. config_data always
+        carries a "config_id" (generated if missing). base_geometry maps source
+        coordinates onto original_image (see decode_geometry) and is folded into
+        every yielded geometry.
+        """
+        # Shared prefixes run step by step, which in fused mode would split a config's fused runs
+        # (and its pixels would depend on which sibling configs the image sampled), so only
+        # sequential execution shares them
+        share_prefixes = self.transformer.execution_mode != 'fused'
+        
+        # Resolve dual-value parameters once per config (release plans ship them pre-resolved)
+        plans = []
+        for config_data in transformation_configs:
+            transformations = config_data.get('transformations', {}) or {}
+            resolved_config = config_data.get('resolved_transformations')
+            if resolved_config is None:
+                resolved_config = self._resolve_dual_value_parameters(transformations)
+            steps = list(resolved_config.items())
+            plans.append((config_data, steps, self._shareable_prefix_keys(steps) if share_prefixes else []))
+        
+        # Only prefixes shared by at least two configs are worth caching
+        prefix_usage = Counter(key for _, _, prefix_keys in plans for key in prefix_keys)
+        prefix_cache: Dict[Tuple[str, ...], Tuple[Union[Image.Image, np.ndarray], np.ndarray]] = {}
+        
+        for config_data, steps, prefix_keys in plans:
+            try:
+                if 'config_id' not in config_data:
+                    config_data = {**config_data, 'config_id': str(uuid.uuid4())}
+                
+                # Walk the longest shared prefix, computing missing links once
+                branch_image = original_image
+                branch_geometry = np.eye(3) if base_geometry is None else base_geometry
+                consumed = 0
+                for key in prefix_keys:
+                    if prefix_usage[key] < 2:
+                        break
+                    if key not in prefix_cache:
+                        transform_name, params = steps[consumed]
+                        step_image, step_geometry = self.transformer.apply_transformations_with_geometry(
+                            branch_image, {transform_name: params}
+                        )
+                        prefix_cache[key] = (step_image, step_geometry @ branch_geometry)
+                    branch_image, branch_geometry = prefix_cache[key]
+                    consumed += 1
+                
+                remaining = dict(steps[consumed:])
+                augmented_image, geometry = branch_image, branch_geometry
+                if remaining:
+                    # Shared prefixes are deterministic, so only the remaining steps draw from the config's seed
+                    augmented_image, remaining_geometry = self.transformer.apply_transformations_with_geometry(
+                        branch_image, remaining, np.random.default_rng(config_data.get('random_seed'))
+                    )
+                    geometry = remaining_geometry @ branch_geometry
+                
+            except Exception as e:
+                logger.error(f"Failed to process config {config_data.get('config_id', 'unknown')}: {str(e)}")
+                continue
+            
+            yield config_data, augmented_image, geometry
+    
     def process_image_with_multiple_configs(self, image_path: str, 
                                           transformation_configs: List[Dict[str, Any]],
                                           dataset_split: str = "train",
                                           output_format: str = "jpg",
-                                          annotations: Optional[List[Union[BoundingBox, Polygon]]] = None) -> List[AugmentationResult]:
+                                          annotations: Optional[List[Union[BoundingBox, Polygon]]] = None,
+                                          decode_once: bool = True,
+                                          output_filename: Optional[str] = None) -> List[AugmentationResult]:
         """
         Process a single image with multiple transformation configurations
         
@@ -433,10 +659,21 @@ class ImageAugmentationEngine:
             dataset_split: Dataset split (train/val/test)
             output_format: Output image format
             annotations: List of annotations to update
+            decode_once: Decode the source once and fan out to every config
+                         (False re-loads the source per config)
+            output_filename: Name augmented outputs are derived from (defaults to the source basename)
             
         Returns:
             List of AugmentationResult objects
         """
+        if decode_once:
+            results = self._process_image_fan_out(
+                image_path, transformation_configs, dataset_split, output_format, annotations,
+                output_filename
+            )
+            logger.info(f"Processed {len(results)} configurations for image: {os.path.basename(image_path)}")
+            return results
+        
         results = []
         
         for config_data in transformation_configs:
@@ -450,7 +687,9 @@ class ImageAugmentationEngine:
                     config_id=config_id,
                     dataset_split=dataset_split,
                     output_format=output_format,
-                    annotations=annotations
+                    annotations=annotations,
+                    output_filename=output_filename,
+                    random_seed=config_data.get('random_seed')
                 )
                 
                 results.append(result)
@@ -483,9 +722,145 @@ class ImageAugmentationEngine:
 
 
 # Utility functions for easy usage
-def create_augmentation_engine(output_dir: str = "augmented") -> ImageAugmentationEngine:
+def create_augmentation_engine(output_dir: str = "augmented",
+                               encoder_profile: Optional[str] = None) -> ImageAugmentationEngine:
     """Create and configure augmentation engine"""
-    return ImageAugmentationEngine(output_dir)
+    return ImageAugmentationEngine(output_dir, encoder_profile=encoder_profile)
+
+
+def _resolve_release_worker_count(max_workers: Optional[int], unit_count: Optional[int] = None) -> int:
+    """Resolve the number of worker processes for a release run (unit_count None = not known up front)"""
+    if max_workers is None:
+        max_workers = settings.RELEASE_MAX_WORKERS
+    if not max_workers or max_workers < 1:
+        max_workers = os.cpu_count() or 1
+    if unit_count is not None:
+        max_workers = min(max_workers, unit_count)
+    return max(1, max_workers)
+
+
+def _build_release_work_units(image_paths: List[str],
+                              transformation_configs: Dict[str, List[Dict[str, Any]]],
+                              dataset_splits: Dict[str, str],
+                              dataset_sources: Dict[str, Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """
+    Yield one work unit per source image in input order
+
+    A work unit carries everything a worker needs to process one source image
+    with all of its transformation configs, so it can be pickled to a child process.
+    Its "annotations" (source pixel coordinates, from dataset_sources) are moved
+    with the pixels into each result's updated_annotations.
+    """
+    for image_path in image_paths:
+        # Get image ID from path - handle multi-dataset naming
+        image_filename = Path(image_path).stem
+        
+        # Extract original image ID (remove dataset prefix if present)
+        if dataset_sources and image_path in dataset_sources:
+            source_info = dataset_sources[image_path]
+            original_filename = source_info.get("original_filename", image_filename)
+            # Configs are keyed by the database image id when the caller provides it
+            image_id = source_info.get("image_id") or Path(original_filename).stem
+            dataset_name = source_info.get("dataset_name", "unknown")
+            logger.debug(f"   Processing {dataset_name}/{original_filename}")
+        else:
+            image_id = image_filename
+            dataset_name = "unknown"
+        
+        # Get transformation configs for this image
+        configs = transformation_configs.get(image_id, [])
+        if not configs:
+            logger.warning(f"No transformation configs found for image: {image_id} (from {dataset_name})")
+            continue
+        
+        yield {
+            "image_path": image_path,
+            "transformation_configs": configs,
+            "dataset_split": dataset_splits.get(image_path, "train"),
+            "output_filename": dataset_sources.get(image_path, {}).get("output_filename"),
+            "annotations": dataset_sources.get(image_path, {}).get("annotations")
+        }
+
+
+# Per-process engine used by release workers (created once in the pool initializer)
+_worker_engine: Optional[ImageAugmentationEngine] = None
+_worker_output_format: str = "jpg"
+
+
+def _init_release_worker(output_dir: str, output_format: str, encoder_profile: Optional[str] = None) -> None:
+    """Process pool initializer - build one augmentation engine per worker process"""
+    global _worker_engine, _worker_output_format
+    _worker_engine = create_augmentation_engine(output_dir, encoder_profile)
+    _worker_output_format = output_format
+
+
+def _process_release_work_unit(unit: Dict[str, Any],
+                               engine: Optional[ImageAugmentationEngine] = None,
+                               output_format: Optional[str] = None) -> Tuple[str, Optional[List[AugmentationResult]]]:
+    """Process one source image with all of its configs; returns (image_path, results)"""
+    engine = engine or _worker_engine
+    output_format = output_format or _worker_output_format
+    image_path = unit["image_path"]
+    
+    try:
+        results = engine.process_image_with_multiple_configs(
+            image_path=image_path,
+            transformation_configs=unit["transformation_configs"],
+            dataset_split=unit["dataset_split"],
+            output_format=output_format,
+            annotations=unit.get("annotations"),
+            output_filename=unit.get("output_filename")
+        )
+        return image_path, results
+    except Exception as e:
+        logger.error(f"Failed to process image {image_path}: {str(e)}")
+        return image_path, None
+
+
+def transform_in_release_worker(image_path: str,
+                                transformation_configs: List[Dict[str, Any]],
+                                dataset_split: str,
+                                output_filename: Optional[str] = None
+                                ) -> Tuple[Tuple[int, int], List[Tuple[Dict[str, Any], Path, bytes, Tuple[int, int], np.ndarray]]]:
+    """
+    Transform stage task of a release pipeline worker process
+    
+    Decodes, transforms and encodes one source image in the worker, so only
+    its path is pickled in and the encoded file bytes come back, never the
+    decoded frames. Configs that fail to transform or encode are logged and
+    left out.
+    
+    Returns:
+        (original_dims, [(config_data, output_path, data, augmented_dims, geometry), ...])
+    """
+    engine = _worker_engine
+    image, original_dims = engine._load_working_image(image_path, transformation_configs)
+    outputs = []
+    for config_data, augmented_image, geometry in engine.transform_fan_out(
+            image, transformation_configs, engine.decode_geometry(image, original_dims)):
+        try:
+            output_path = engine.augmented_output_path(
+                image_path, config_data["config_id"], dataset_split, _worker_output_format, output_filename
+            )
+            data = engine.encode_image(augmented_image, output_path, _worker_output_format)
+        except Exception as e:
+            logger.error(f"Failed to encode config {config_data.get('config_id', 'unknown')}: {str(e)}")
+            continue
+        augmented_dims = (augmented_image.shape[1], augmented_image.shape[0]) \
+            if hasattr(augmented_image, "shape") else augmented_image.size
+        outputs.append((config_data, output_path, data, augmented_dims, geometry))
+    return original_dims, outputs
+
+
+def _release_mp_context() -> multiprocessing.context.BaseContext:
+    """
+    Start method of release worker processes
+    
+    Releases run in a threaded process (job worker, pipeline stage and database
+    driver threads). A forked child inherits any lock another thread held at
+    fork time and can deadlock on it, so workers are spawned instead.
+    """
+    return multiprocessing.get_context("spawn")
 
 
 def process_release_images(image_paths: List[str], 
@@ -493,10 +868,17 @@ def process_release_images(image_paths: List[str],
                          dataset_splits: Dict[str, str],
                          output_dir: str = "augmented",
                          output_format: str = "jpg",
-                         dataset_sources: Dict[str, Dict[str, Any]] = None) -> Dict[str, List[AugmentationResult]]:
+                         dataset_sources: Dict[str, Dict[str, Any]] = None,
+                         max_workers: Optional[int] = None,
+                         on_image_processed: Optional[Callable[[str, List[AugmentationResult]], None]] = None,
+                         on_pipeline_stats: Optional[Callable[[Dict[str, Any]], None]] = None,
+                         encoder_profile: Optional[str] = None) -> Dict[str, List[AugmentationResult]]:
     """
     Process multiple images for release generation with multi-dataset support
     
+    Builds one work unit per source image and runs them through
+    process_release_work_units.
+    
     Args:
         image_paths: List of image file paths
         transformation_configs: Dict mapping image_id to list of transformation configs
@@ -504,56 +886,122 @@ def process_release_images(image_paths: List[str],
         output_dir: Output directory for augmented images
         output_format: Output image format
         dataset_sources: Dict mapping image_path to dataset source information
+                         ("image_id" selects the configs, "output_filename" overrides the
+                         name outputs are derived from, "annotations" are transformed into
+                         each result)
+        max_workers: Worker processes (None = settings.RELEASE_MAX_WORKERS, 1 = in-process)
+        on_image_processed: Called in the parent process with (image_path, results) as each
+                            source image completes, in input order
+        on_pipeline_stats: Called with the pipeline's per-stage throughput counters as
+                           each source image completes (pipeline mode only)
+        encoder_profile: Output encoder profile (None = settings.RELEASE_ENCODER_PROFILE)
         
     Returns:
         Dictionary mapping image_path to list of AugmentationResult objects
+        (empty when on_image_processed is given)
+    """
+    work_units = _build_release_work_units(image_paths, transformation_configs, dataset_splits, dataset_sources or {})
+    return process_release_work_units(
+        work_units, output_dir, output_format, max_workers, on_image_processed, on_pipeline_stats,
+        encoder_profile, unit_count=len(image_paths)
+    )
+
+
+def process_release_work_units(work_units: Iterable[Dict[str, Any]],
+                               output_dir: str = "augmented",
+                               output_format: str = "jpg",
+                               max_workers: Optional[int] = None,
+                               on_image_processed: Optional[Callable[[str, List[AugmentationResult]], None]] = None,
+                               on_pipeline_stats: Optional[Callable[[Dict[str, Any]], None]] = None,
+                               encoder_profile: Optional[str] = None,
+                               unit_count: Optional[int] = None) -> Dict[str, List[AugmentationResult]]:
+    """
+    Process release work units (one per source image, see _build_release_work_units)
+    
+    With settings.RELEASE_PIPELINE the units flow through the staged
+    ReleasePipeline (load, transform, encode and write overlap, one transform
+    thread per worker). With more than one worker its transform stage runs on
+    a process pool (settings.RELEASE_PIPELINE_TRANSFORM_PROCESSES), so CPU-bound
+    transforms are not serialized by the GIL. Without the pipeline, whole units
+    are fanned out to a process pool. Either way at most
+    RELEASE_MAX_PENDING_PER_WORKER units per worker are in flight at any time,
+    results are collected in input order, and work_units is consumed lazily on
+    the calling thread: a generator streaming units from the database is read
+    only as far as processing has got.
+    
+    Args:
+        work_units: Units to process, in input order (any iterable)
+        output_dir: Output directory for augmented images
+        output_format: Output image format
+        max_workers: Worker processes (None = settings.RELEASE_MAX_WORKERS, 1 = in-process)
+        on_image_processed: Called on the calling thread with (image_path, results) as each
+                            source image completes, in input order
+        on_pipeline_stats: Called with the pipeline's per-stage throughput counters as
+                           each source image completes (pipeline mode only)
+        encoder_profile: Output encoder profile (None = settings.RELEASE_ENCODER_PROFILE)
+        unit_count: Number of units if known up front (caps the worker count)
+        
+    Returns:
+        Dictionary mapping image_path to list of AugmentationResult objects
+        (empty when on_image_processed is given: results are handed to it, not kept)
     """
-    engine = create_augmentation_engine(output_dir)
     all_results = {}
-    dataset_sources = dataset_sources or {}
+    processed = 0
+    worker_count = _resolve_release_worker_count(max_workers, unit_count)
     
-    logger.info(f"🎨 PROCESSING {len(image_paths)} IMAGES FROM MULTIPLE DATASETS")
+    logger.info(f"🎨 PROCESSING {unit_count if unit_count is not None else 'STREAMED'} IMAGES "
+                f"FROM MULTIPLE DATASETS ({worker_count} worker(s))")
     
-    for image_path in image_paths:
-        try:
-            # Get image ID from path - handle multi-dataset naming
-            image_filename = Path(image_path).stem
-            
-            # Extract original image ID (remove dataset prefix if present)
-            if dataset_sources and image_path in dataset_sources:
-                source_info = dataset_sources[image_path]
-                original_filename = source_info.get("original_filename", image_filename)
-                image_id = Path(original_filename).stem
-                dataset_name = source_info.get("dataset_name", "unknown")
-                logger.debug(f"   Processing {dataset_name}/{original_filename}")
-            else:
-                image_id = image_filename
-                dataset_name = "unknown"
-            
-            # Get transformation configs for this image
-            configs = transformation_configs.get(image_id, [])
-            if not configs:
-                logger.warning(f"No transformation configs found for image: {image_id} (from {dataset_name})")
-                continue
-            
-            # Get dataset split for this image
-            split = dataset_splits.get(image_path, "train")
-            
-            # Process image with all configurations
-            results = engine.process_image_with_multiple_configs(
-                image_path=image_path,
-                transformation_configs=configs,
-                dataset_split=split,
-                output_format=output_format
-            )
-            
+    def collect(image_path: str, results: Optional[List[AugmentationResult]]) -> None:
+        nonlocal processed
+        if results is None:
+            return
+        processed += 1
+        # A caller that takes results as they complete keeps them itself
+        if on_image_processed:
+            on_image_processed(image_path, results)
+        else:
             all_results[image_path] = results
+    
+    if settings.RELEASE_PIPELINE:
+        from core.release_pipeline import ReleasePipeline
+        
+        transform_pool = None
+        if worker_count > 1 and settings.RELEASE_PIPELINE_TRANSFORM_PROCESSES:
+            transform_pool = ProcessPoolExecutor(max_workers=worker_count,
+                                                 mp_context=_release_mp_context(),
+                                                 initializer=_init_release_worker,
+                                                 initargs=(output_dir, output_format, encoder_profile))
+        try:
+            pipeline = ReleasePipeline(create_augmentation_engine(output_dir, encoder_profile), output_format,
+                                       transform_workers=worker_count, transform_pool=transform_pool)
+            pipeline.run(work_units, collect, on_pipeline_stats)
+        finally:
+            if transform_pool is not None:
+                transform_pool.shutdown()
+    elif worker_count == 1:
+        engine = create_augmentation_engine(output_dir, encoder_profile)
+        for unit in work_units:
+            collect(*_process_release_work_unit(unit, engine, output_format))
+    else:
+        max_pending = worker_count * max(1, settings.RELEASE_MAX_PENDING_PER_WORKER)
+        pending = deque()
+        
+        with ProcessPoolExecutor(max_workers=worker_count,
+                                 mp_context=_release_mp_context(),
+                                 initializer=_init_release_worker,
+                                 initargs=(output_dir, output_format, encoder_profile)) as executor:
+            for unit in work_units:
+                pending.append(executor.submit(_process_release_work_unit, unit))
+                
+                # Backpressure: drain the oldest unit before submitting more
+                if len(pending) >= max_pending:
+                    collect(*pending.popleft().result())
             
-        except Exception as e:
-            logger.error(f"Failed to process image {image_path}: {str(e)}")
-            continue
+            while pending:
+                collect(*pending.popleft().result())
     
-    logger.info(f"Processed {len(all_results)} images for release generation")
+    logger.info(f"Processed {processed} images for release generation")
     return all_results
 
 
@@ -0,0 +1,35 @@
+"""
+Random State for Auto-Labeling Tool Release Pipeline
+Explicit, derivable random number generators instead of the global random state
+"""
+
+import hashlib
+from typing import Any, Optional
+
+import numpy as np
+
+
+def seed_key(value: Any) -> int:
+    """Stable 64-bit integer for a seed component (same value in every process and run)"""
+    if isinstance(value, (int, np.integer)) and not isinstance(value, bool) and value >= 0:
+        return int(value)
+    digest = hashlib.sha256(str(value).encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "little")
+
+
+def derive_seed(release_seed: Optional[int], *keys: Any) -> Optional[int]:
+    """
+    Seed for one (release seed, image id, config slot, ...) position
+
+    Returns None when the release has no seed, which makes derive_rng fall back
+    to fresh OS entropy.
+    """
+    if release_seed is None:
+        return None
+    sequence = np.random.SeedSequence([seed_key(release_seed)] + [seed_key(key) for key in keys])
+    return int(sequence.generate_state(1, np.uint64)[0])
+
+
+def derive_rng(release_seed: Optional[int], *keys: Any) -> np.random.Generator:
+    """Generator for one (release seed, image id, config slot, ...) position"""
+    return np.random.default_rng(derive_seed(release_seed, *keys))
@@ -7,27 +7,41 @@ import os
 import json
 import logging
 import uuid
+import hashlib
 import shutil
-import zipfile
 import tempfile
-from typing import List, Dict, Any, Optional, Tuple
-from dataclasses import dataclass
+from itertools import islice
+from typing import List, Dict, Any, Optional, Tuple, Callable, Iterator, Iterable, Union
+from dataclasses import dataclass, asdict
 from datetime import datetime
 from pathlib import Path
-from PIL import Image
+from PIL import Image as PILImage
 
 # Import our components
 from core.transformation_schema import TransformationSchema, create_schema_from_database, generate_release_configurations
-from core.image_generator import ImageAugmentationEngine, create_augmentation_engine, process_release_images
+from core.config import settings
+from core.release_plan import get_release_plan, load_plan_records
+from core.random_state import seed_key
+from core.image_generator import (ImageAugmentationEngine, AugmentationResult, BoundingBox, Polygon,
+                                  create_augmentation_engine, process_release_work_units)
+from core.release_package import ReleasePackageWriter
+from core.release_manifest import ReleaseManifest
+from core.augmentation_cache import AugmentationCache
+from core.blob_store import BlobStore
 from database.database import get_db
-from database.models import ImageTransformation, Release, Image, Dataset, Project
+from database.models import ImageTransformation, Release, Image, Dataset, Project, Annotation
+from sqlalchemy import func, or_, and_
 from sqlalchemy.orm import Session
+from utils.path_utils import path_manager
 
 # Import export system
 from api.routes.enhanced_export import ExportFormats, ExportRequest
 
 logger = logging.getLogger(__name__)
 
+# Image rows fetched per round trip when streaming a release's images
+IMAGE_QUERY_BATCH_SIZE = 1000
+
 @dataclass
 class ReleaseConfig:
     """Configuration for release generation"""
@@ -43,6 +57,10 @@ class ReleaseConfig:
     include_original: bool = True
     split_sections: List[str] = None  # train, val, test - if None, includes all
     preserve_original_splits: bool = True  # Always preserve original train/val/test assignments
+    reuse_previous_outputs: bool = True  # Hardlink unchanged augmented outputs from earlier releases of the project
+    max_workers: Optional[int] = None  # Image generation workers: transform threads (pipeline) or processes (None = settings default)
+    random_seed: Optional[int] = None  # Release seed; every sample and random transform derives from it (None = derived from the project id)
+    encoder_profile: Optional[str] = None  # fast, balanced or archival output encoding (None = settings default)
 
 @dataclass
 class ReleaseProgress:
@@ -57,6 +75,7 @@ class ReleaseProgress:
     error_message: Optional[str] = None
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
+    pipeline_stats: Optional[Dict[str, Any]] = None  # Per-stage throughput of the release pipeline
 
 class ReleaseController:
     """
@@ -64,10 +83,13 @@ class ReleaseController:
     Orchestrates schema generation, image processing, and export
     """
     
-    def __init__(self, db_session: Optional[Session] = None):
+    def __init__(self, db_session: Optional[Session] = None,
+                 progress_listener: Optional[Callable[[ReleaseProgress], None]] = None):
         self.db = db_session or next(get_db())
         self.augmentation_engine = None
         self.release_progress: Dict[str, ReleaseProgress] = {}
+        # Called after every progress update (e.g. to publish it to the release job table)
+        self.progress_listener = progress_listener
         
     def create_release_record(self, config: ReleaseConfig) -> str:
         """Create a new release record in database"""
@@ -106,24 +128,11 @@ class ReleaseController:
     def load_pending_transformations(self, release_version: str) -> List[Dict[str, Any]]:
         """Load completed transformations from database for release generation"""
         try:
-            transformations = self.db.query(ImageTransformation).filter(
-                ImageTransformation.release_version == release_version,
-                ImageTransformation.status == "COMPLETED",
-                ImageTransformation.is_enabled == True
-            ).order_by(ImageTransformation.order_index).all()
-            
-            # Convert to dictionary format
-            transformation_records = []
-            for transform in transformations:
-                record = {
-                    "id": transform.id,
-                    "transformation_type": transform.transformation_type,
-                    "parameters": transform.parameters if isinstance(transform.parameters, dict) else json.loads(transform.parameters),
-                    "is_enabled": transform.is_enabled,
-                    "order_index": transform.order_index,
-                    "release_version": transform.release_version
-                }
-                transformation_records.append(record)
+            # Same query as the preview endpoints, so both compile the same plan
+            transformation_records = [
+                record for record in load_plan_records(self.db, release_version)
+                if record["status"] == "COMPLETED"
+            ]
             
             logger.info(f"Loaded {len(transformation_records)} completed transformations for version {release_version}")
             return transformation_records
@@ -132,88 +141,192 @@ class ReleaseController:
             logger.error(f"Failed to load pending transformations: {str(e)}")
             return []
     
-    def get_dataset_images(self, dataset_ids: List[str], split_sections: List[str] = None) -> List[Dict[str, Any]]:
+    def _dataset_images_query(self, query, dataset_ids: List[str], split_sections: List[str] = None):
+        """Restrict an Image query to the dataset section of the given datasets (and splits)"""
+        query = query.filter(
+            Image.dataset_id.in_(dataset_ids),
+            Image.split_type == "dataset"  # Only get images in dataset section
+        )
+        
+        # Filter by split sections if specified
+        if split_sections:
+            query = query.filter(Image.split_section.in_(split_sections))
+        return query
+    
+    def count_dataset_images(self, dataset_ids: List[str], split_sections: List[str] = None) -> int:
+        """Number of images get_dataset_images would return, counted in SQL"""
+        return self._dataset_images_query(
+            self.db.query(func.count(Image.id)), dataset_ids, split_sections
+        ).scalar() or 0
+    
+    def iter_dataset_images(self, dataset_ids: List[str], split_sections: List[str] = None,
+                            batch_size: int = IMAGE_QUERY_BATCH_SIZE) -> Iterator[Dict[str, Any]]:
         """
-        Get all images from specified datasets with enhanced multi-dataset support
+        Stream image records from specified datasets with enhanced multi-dataset support
         
-        Handles multiple dataset paths like:
-        - projects/gevis/dataset/animal/train/
-        - projects/gevis/dataset/car_dataset/val/
-        - projects/gevis/dataset/RAKESH/test/
+        Only the columns a release uses are selected, and rows are fetched
+        batch_size at a time, so memory stays flat however large the datasets
+        are and the first images can be processed while the rest are read.
+        Each batch is its own keyset query, so no cursor stays open and the
+        caller may commit on the session between records.
+        Yields the same records as get_dataset_images.
         
         Args:
             dataset_ids: List of dataset IDs to include
             split_sections: List of split sections to include (train, val, test). If None, includes all.
+            batch_size: Rows fetched per round trip
         """
+        # Also get dataset names for path handling
+        dataset_names = dict(self.db.query(Dataset.id, Dataset.name).filter(Dataset.id.in_(dataset_ids)).all())
+        
+        query = self._dataset_images_query(
+            self.db.query(
+                Image.id, Image.filename, Image.file_path, Image.dataset_id,
+                Image.split_section, Image.width, Image.height
+            ),
+            dataset_ids, split_sections
+        ).order_by(Image.dataset_id, Image.id)
+        
+        def batches() -> Iterator[List[Any]]:
+            last_dataset_id = last_image_id = None
+            while True:
+                batch_query = query
+                if last_image_id is not None:
+                    batch_query = batch_query.filter(or_(
+                        Image.dataset_id > last_dataset_id,
+                        and_(Image.dataset_id == last_dataset_id, Image.id > last_image_id)
+                    ))
+                rows = batch_query.limit(batch_size).all()
+                yield rows
+                if len(rows) < batch_size:
+                    return
+                last_image_id, last_dataset_id = rows[-1][0], rows[-1][3]
+        
+        source_paths = {}  # Source dataset path per folder (images of a folder share it)
+        dataset_stats = {}
+        split_stats = {}
+        total = 0
+        
         try:
-            # Build query for images from specified datasets
-            query = self.db.query(Image).filter(
-                Image.dataset_id.in_(dataset_ids),
-                Image.split_type == "dataset"  # Only get images in dataset section
-            )
-            
-            # Filter by split sections if specified
-            if split_sections:
-                query = query.filter(Image.split_section.in_(split_sections))
-            
-            images = query.all()
-            
-            # Also get dataset information for path handling
-            datasets = self.db.query(Dataset).filter(Dataset.id.in_(dataset_ids)).all()
-            dataset_info = {ds.id: ds for ds in datasets}
-            
-            image_records = []
-            dataset_stats = {}
-            split_stats = {}
-            
-            for image in images:
-                # Get dataset info
-                dataset = dataset_info.get(image.dataset_id)
-                dataset_name = dataset.name if dataset else f"dataset_{image.dataset_id}"
-                split_section = image.split_section or "train"
+            for image_id, filename, file_path, dataset_id, split_section, width, height in (
+                    row for rows in batches() for row in rows):
+                dataset_name = dataset_names.get(dataset_id) or f"dataset_{dataset_id}"
+                split_section = split_section or "train"
                 
-                # Track dataset statistics
-                if dataset_name not in dataset_stats:
-                    dataset_stats[dataset_name] = 0
-                dataset_stats[dataset_name] += 1
+                # Track dataset and split section statistics
+                dataset_stats[dataset_name] = dataset_stats.get(dataset_name, 0) + 1
+                split_stats[split_section] = split_stats.get(split_section, 0) + 1
+                total += 1
                 
-                # Track split section statistics
-                if split_section not in split_stats:
-                    split_stats[split_section] = 0
-                split_stats[split_section] += 1
+                folder = os.path.dirname(file_path or "")
+                source_path = source_paths.get((folder, dataset_name))
+                if source_path is None:
+                    source_path = self._get_source_dataset_path(file_path, dataset_name)
+                    if folder.startswith(source_path):  # Not specific to this file
+                        source_paths[(folder, dataset_name)] = source_path
                 
-                record = {
-                    "id": image.id,
-                    "filename": image.filename,
-                    "file_path": image.file_path,
-                    "dataset_id": image.dataset_id,
+                yield {
+                    "id": image_id,
+                    "filename": filename,
+                    "file_path": file_path,
+                    "dataset_id": dataset_id,
                     "dataset_name": dataset_name,
                     "split_section": split_section,
-                    "width": image.width,
-                    "height": image.height,
-                    "source_path": self._get_source_dataset_path(image.file_path, dataset_name)
+                    "width": width,
+                    "height": height,
+                    "source_path": source_path
                 }
-                image_records.append(record)
-            
-            logger.info(f"📊 MULTI-DATASET LOADING COMPLETE:")
-            logger.info(f"   Total images: {len(image_records)}")
-            logger.info(f"   📁 Dataset breakdown:")
-            for dataset_name, count in dataset_stats.items():
-                logger.info(f"      {dataset_name}: {count} images")
-            logger.info(f"   🎯 Split breakdown:")
-            for split_name, count in split_stats.items():
-                logger.info(f"      {split_name}: {count} images")
-            if split_sections:
-                logger.info(f"   🔍 Filtered by splits: {split_sections}")
-            else:
-                logger.info(f"   🔍 Including all splits: train, val, test")
-            
-            return image_records
-            
+        except Exception as e:
+            logger.error(f"Failed to read dataset images: {str(e)}")
+            raise
+        
+        logger.info(f"📊 MULTI-DATASET LOADING COMPLETE:")
+        logger.info(f"   Total images: {total}")
+        logger.info(f"   📁 Dataset breakdown:")
+        for dataset_name, count in dataset_stats.items():
+            logger.info(f"      {dataset_name}: {count} images")
+        logger.info(f"   🎯 Split breakdown:")
+        for split_name, count in split_stats.items():
+            logger.info(f"      {split_name}: {count} images")
+        if split_sections:
+            logger.info(f"   🔍 Filtered by splits: {split_sections}")
+        else:
+            logger.info(f"   🔍 Including all splits: train, val, test")
+    
+    def get_dataset_images(self, dataset_ids: List[str], split_sections: List[str] = None) -> List[Dict[str, Any]]:
+        """
+        Get all images from specified datasets with enhanced multi-dataset support
+        
+        Handles multiple dataset paths like:
+        - projects/gevis/dataset/animal/train/
+        - projects/gevis/dataset/car_dataset/val/
+        - projects/gevis/dataset/RAKESH/test/
+        
+        Prefer iter_dataset_images for large datasets; this materializes every record.
+        
+        Args:
+            dataset_ids: List of dataset IDs to include
+            split_sections: List of split sections to include (train, val, test). If None, includes all.
+        """
+        try:
+            return list(self.iter_dataset_images(dataset_ids, split_sections))
         except Exception as e:
             logger.error(f"Failed to get dataset images: {str(e)}")
             return []
     
+    def _load_annotations(self, image_ids: List[str]
+                          ) -> Tuple[Dict[str, List[Union[BoundingBox, Polygon]]], Dict[str, str]]:
+        """
+        Annotations of every image (source pixel coordinates) and a hash of each image's annotations
+        
+        Annotations with a segmentation of at least three points become
+        polygons, the others boxes. Images without annotations are left out
+        of both dictionaries.
+        """
+        annotations = {}
+        digests = {}
+        chunk_size = 500  # Stay below SQLite's bound-parameter limit
+        for start in range(0, len(image_ids), chunk_size):
+            rows = self.db.query(
+                Annotation.image_id, Annotation.class_name, Annotation.class_id,
+                Annotation.x_min, Annotation.y_min, Annotation.x_max, Annotation.y_max,
+                Annotation.segmentation, Annotation.confidence
+            ).filter(
+                Annotation.image_id.in_(image_ids[start:start + chunk_size])
+            ).order_by(Annotation.image_id, Annotation.id).all()
+            
+            for row in rows:
+                image_id, class_name, class_id, x_min, y_min, x_max, y_max, segmentation, confidence = row
+                digest = digests.setdefault(image_id, hashlib.sha256())
+                digest.update(json.dumps(list(row[1:]), default=str).encode("utf-8"))
+                
+                confidence = confidence if confidence is not None else 1.0
+                points = self._segmentation_points(segmentation)
+                if len(points) >= 3:
+                    annotation = Polygon(points, class_name, class_id, confidence)
+                else:
+                    annotation = BoundingBox(x_min, y_min, x_max, y_max, class_name, class_id, confidence)
+                annotations.setdefault(image_id, []).append(annotation)
+        return annotations, {image_id: digest.hexdigest() for image_id, digest in digests.items()}
+    
+    @staticmethod
+    def _segmentation_points(segmentation: Any) -> List[Tuple[float, float]]:
+        """Vertices of a stored segmentation ([{x, y}, ...], [[x, y], ...] or flat [x1, y1, ...], COCO-nested or not)"""
+        if not segmentation or not isinstance(segmentation, list):
+            return []
+        # COCO nests each polygon's flat coordinate list
+        if len(segmentation) == 1 and isinstance(segmentation[0], list) and len(segmentation[0]) > 2:
+            segmentation = segmentation[0]
+        try:
+            if isinstance(segmentation[0], dict):
+                return [(float(p["x"]), float(p["y"])) for p in segmentation]
+            if isinstance(segmentation[0], (list, tuple)):
+                return [(float(p[0]), float(p[1])) for p in segmentation]
+            return [(float(x), float(y)) for x, y in zip(segmentation[0::2], segmentation[1::2])]
+        except (KeyError, IndexError, TypeError, ValueError):
+            logger.warning(f"Ignoring unreadable segmentation: {str(segmentation)[:100]}")
+            return []
+    
     def _get_source_dataset_path(self, file_path: str, dataset_name: str) -> str:
         """
         Extract source dataset path from file path
@@ -266,6 +379,12 @@ class ReleaseController:
             progress.progress_percentage = (progress.processed_images / progress.total_images) * 100
         
         logger.debug(f"Updated progress for release {release_id}: {progress.progress_percentage:.1f}%")
+        
+        if self.progress_listener:
+            try:
+                self.progress_listener(progress)
+            except Exception as e:
+                logger.warning(f"Failed to publish progress for release {release_id}: {e}")
     
     def mark_transformations_completed(self, transformation_ids: List[str], release_id: str) -> None:
         """Mark transformations as completed and link to release"""
@@ -285,22 +404,31 @@ class ReleaseController:
             self.db.rollback()
             logger.error(f"Failed to mark transformations as completed: {str(e)}")
     
-    def generate_release(self, config: ReleaseConfig, release_version: str) -> str:
+    def generate_release(self, config: ReleaseConfig, release_version: str,
+                         release_id: Optional[str] = None) -> str:
         """
         Generate a complete release with transformations and export
         
+        Progress is checkpointed to a release manifest in the output directory.
+        When release_id is given, the existing release is resumed instead: source
+        image/config pairs recorded as done in its manifest are skipped.
+        
         Args:
             config: Release configuration
             release_version: Version identifier for transformations
+            release_id: Existing release to resume (None = create a new release)
             
         Returns:
             Release ID
         """
-        release_id = None
+        resuming = release_id is not None
+        package_writer = None
+        manifest = None
         
         try:
             # Create release record
-            release_id = self.create_release_record(config)
+            if not resuming:
+                release_id = self.create_release_record(config)
             
             # Initialize progress tracking
             self.update_release_progress(
@@ -315,25 +443,25 @@ class ReleaseController:
             if not transformation_records:
                 raise ValueError(f"No completed transformations found for version {release_version}")
             
-            # Get dataset images with split section filtering
-            image_records = self.get_dataset_images(config.dataset_ids, config.split_sections)
-            if not image_records:
+            # Count dataset images with split section filtering (records are streamed below)
+            total_images = self.count_dataset_images(config.dataset_ids, config.split_sections)
+            if not total_images:
                 raise ValueError(f"No images found in datasets: {config.dataset_ids}")
             
             # Update progress
             self.update_release_progress(
                 release_id,
-                total_images=len(image_records),
+                total_images=total_images,
                 current_step="generating_configurations"
             )
             
-            # Generate transformation configurations
-            image_ids = [img["id"] for img in image_records]
-            transformation_configs = generate_release_configurations(
-                transformation_records,
-                image_ids,
-                config.images_per_original
-            )
+            # The plan (schema, combination pool, resolved parameters) is compiled once per version;
+            # configurations are generated per image as the records stream in
+            # Seeded per (release seed, image id, config slot): regenerating, resuming or
+            # re-releasing an unchanged image gives identical output (and augmentation cache hits)
+            release_seed = config.random_seed if config.random_seed is not None else seed_key(f"project:{config.project_id}")
+            release_plan = get_release_plan(release_version, transformation_records)
+            release_plan.validate()
             
             # Update progress
             self.update_release_progress(
@@ -345,108 +473,205 @@ class ReleaseController:
             project = self.db.query(Project).filter(Project.id == config.project_id).first()
             project_name = project.name if project else f"project_{config.project_id}"
             output_dir = os.path.join("projects", project_name, "releases", release_id)
-            self.augmentation_engine = create_augmentation_engine(output_dir)
-            
-            # Prepare image paths and dataset splits with multi-dataset support
-            image_paths = []
-            dataset_splits = {}
-            dataset_sources = {}  # Track source dataset for each image
-            
-            # Create staging directory for copied images
-            staging_dir = f"{output_dir}/staging"
-            os.makedirs(staging_dir, exist_ok=True)
-            
-            logger.info(f"🔄 COPYING IMAGES FROM MULTIPLE DATASETS:")
+            self.augmentation_engine = create_augmentation_engine(output_dir, config.encoder_profile)
+            
+            # Checkpoint manifest: completed units survive a crash or retry
+            if resuming:
+                manifest = ReleaseManifest.load(output_dir)
+                if manifest is None:
+                    raise ValueError(f"No release manifest found for release {release_id}")
+                manifest.set_status("processing")
+                logger.info(f"♻️ Resuming release {release_id}: {manifest.completed_count()} augmented images already done")
+            else:
+                manifest = ReleaseManifest.create(output_dir, release_id, release_version, asdict(config))
+            
+            # Derived outputs are deduplicated into the shared blob store, referenced by this release
+            blob_store = BlobStore(self.db)
+            blob_owner = f"release:{release_id}"
+            
+            # Stream images into the ZIP package while they are being generated
+            package_writer = self.open_release_package(release_id, config)
+            
+            # Outputs of earlier releases, keyed by source, annotations, config, seed and format
+            augmentation_cache = None
+            cache_keys = {}
+            if config.reuse_previous_outputs:
+                augmentation_cache = AugmentationCache.open(self._releases_dir(config.project_id))
+            
+            # Sources are read in place; originals go straight to their split folders
+            materialize_stats = {}
+            resolved_counts = {"images": 0, "originals": 0, "skipped_results": 0}
+            dataset_counts = {}  # Images per source dataset
+            unit_sources = {}  # (dataset name, split) of the images in flight, for packaging their results
+            
+            def package_results(image_path: str, results: List[AugmentationResult],
+                                source_dataset: str, split_section: str) -> None:
+                if package_writer.closed:
+                    return
+                try:
+                    for result in results:
+                        self._add_result_to_package(
+                            package_writer, image_path, result, config, source_dataset, split_section
+                        )
+                except Exception as e:
+                    logger.error(f"Failed to stream results into ZIP package: {str(e)}")
+                    package_writer.abort()
             
-            for img_record in image_records:
-                # Get source image path
-                source_path = self._resolve_image_path(img_record["file_path"])
-                
-                if not os.path.exists(source_path):
-                    logger.warning(f"Source image not found: {source_path}")
-                    continue
-                
-                # Create unique filename to avoid conflicts between datasets
-                dataset_name = img_record["dataset_name"]
-                original_filename = img_record["filename"]
-                unique_filename = f"{dataset_name}_{original_filename}"
+            def release_work_units() -> Iterator[Dict[str, Any]]:
+                """
+                Work units built lazily as image records stream in
                 
-                # Copy image to staging directory with format conversion if needed
-                try:
-                    # Check if we need to convert the format
-                    if config.output_format.lower() == "original":
-                        # Just copy the file as-is if using original format
-                        staging_path = os.path.join(staging_dir, unique_filename)
-                        shutil.copy2(source_path, staging_path)
-                        logger.debug(f"   Copied (original format): {source_path} → {staging_path}")
-                    else:
-                        # Ensure the filename has the correct extension for the target format
-                        base_name = Path(unique_filename).stem
-                        extension = config.output_format.lower()
-                        # Handle jpeg -> jpg
-                        if extension == "jpeg":
-                            extension = "jpg"
+                Each image is resolved, its original written, and its configs
+                generated and checked against the manifest and the augmentation
+                cache only when processing asks for it, so nothing per image is
+                held for the whole release before processing starts.
+                """
+                records = self.iter_dataset_images(config.dataset_ids, config.split_sections)
+                while True:
+                    batch = list(islice(records, IMAGE_QUERY_BATCH_SIZE))
+                    if not batch:
+                        return
+                    # Annotations travel with each work unit and are moved with its pixels
+                    batch_annotations, annotation_hashes = self._load_annotations([r["id"] for r in batch])
+                    
+                    for img_record in batch:
+                        dataset_name = img_record["dataset_name"]
+                        dataset_counts[dataset_name] = dataset_counts.get(dataset_name, 0) + 1
                         
-                        # Create filename with correct extension
-                        converted_filename = f"{base_name}.{extension}"
-                        staging_path = os.path.join(staging_dir, converted_filename)
+                        # Get source image path
+                        source_path = self._resolve_image_path(img_record["file_path"])
                         
-                        # Load and convert the image to the selected format
-                        try:
-                            # Open the image with PIL
-                            original_image = Image.open(source_path)
-                            
-                            # Use the augmentation engine to save with proper format
-                            self.augmentation_engine._save_image_with_format(
-                                original_image, 
-                                staging_path, 
-                                config.output_format
-                            )
-                            logger.debug(f"   Copied and converted to {config.output_format}: {source_path} → {staging_path}")
-                        except Exception as format_error:
-                            # Fallback to regular copy if conversion fails
-                            logger.warning(f"   Format conversion failed for {source_path}: {format_error}")
-                            logger.warning(f"   Falling back to original format copy")
-                            staging_path = os.path.join(staging_dir, unique_filename)
-                            shutil.copy2(source_path, staging_path)
-                    
-                    # Add to processing lists
-                    image_paths.append(staging_path)
-                    dataset_splits[staging_path] = img_record["split_section"]
-                    dataset_sources[staging_path] = {
-                        "dataset_name": dataset_name,
-                        "dataset_id": img_record["dataset_id"],
-                        "source_path": img_record["source_path"],
-                        "original_filename": original_filename
-                    }
-                    
-                except Exception as e:
-                    logger.error(f"Failed to copy {source_path}: {e}")
-                    continue
-            
-            # Log format conversion information
-            if config.output_format.lower() == "original":
-                logger.info(f"✅ Successfully copied {len(image_paths)} images from {len(set(img['dataset_name'] for img in image_records))} datasets (preserving original formats)")
-            else:
-                logger.info(f"✅ Successfully copied and converted {len(image_paths)} images to {config.output_format.upper()} format from {len(set(img['dataset_name'] for img in image_records))} datasets")
+                        if not os.path.exists(source_path):
+                            logger.warning(f"Source image not found: {source_path}")
+                            continue
+                        
+                        # Create unique filename to avoid conflicts between datasets
+                        image_id = img_record["id"]
+                        unique_filename = f"{dataset_name}_{img_record['filename']}"
+                        split_section = img_record["split_section"]
+                        
+                        # Write the original into its final split folder
+                        if config.include_original:
+                            try:
+                                original_path = manifest.original_output(source_path)
+                                if original_path:
+                                    method = "resumed"
+                                else:
+                                    original_path, method = self._materialize_original(
+                                        source_path, output_dir, split_section, unique_filename, config.output_format
+                                    )
+                                    if method == "converted":
+                                        blob_store.ingest_file(original_path, blob_owner)
+                                    manifest.record_original(source_path, original_path)
+                                materialize_stats[method] = materialize_stats.get(method, 0) + 1
+                                package_writer.add_image(
+                                    output_path=original_path,
+                                    output_filename=os.path.basename(original_path),
+                                    split_section=split_section,
+                                    source_dataset=dataset_name,
+                                    source_image=source_path,
+                                    is_original=True
+                                )
+                                resolved_counts["originals"] += 1
+                            except Exception as e:
+                                logger.error(f"Failed to write original {source_path}: {e}")
+                                continue
+                        resolved_counts["images"] += 1
+                        
+                        # Skip (source, config) pairs a previous run already completed
+                        remaining = [
+                            c for c in release_plan.configs_for_image(image_id, config.images_per_original, release_seed)
+                            if not manifest.is_done(source_path, c["config_id"])
+                        ]
+                        
+                        # Reuse unchanged outputs of earlier releases; only the delta is computed
+                        if augmentation_cache and remaining:
+                            reused = []
+                            source_hash = augmentation_cache.source_hash(source_path)
+                            for c in list(remaining):
+                                key = augmentation_cache.key(
+                                    source_hash, annotation_hashes.get(image_id, ""), c, config.output_format, config.encoder_profile
+                                )
+                                cache_keys[(source_path, c["config_id"])] = key
+                                output_path = self.augmentation_engine.augmented_output_path(
+                                    source_path, c["config_id"], split_section, config.output_format, unique_filename
+                                )
+                                result = augmentation_cache.reuse(key, str(output_path), c)
+                                if result:
+                                    reused.append(result)
+                                    remaining.remove(c)
+                                    digest = augmentation_cache.blob_digest(key)
+                                    if digest:
+                                        blob_store.add_reference(blob_owner, digest)
+                            if reused:
+                                manifest.record_results(source_path, reused)
+                        
+                        done = manifest.completed_results(source_path)
+                        if done:
+                            resolved_counts["skipped_results"] += len(done)
+                            package_results(source_path, done, dataset_name, split_section)
+                        if not remaining:
+                            progress = self.release_progress[release_id]
+                            self.update_release_progress(release_id, processed_images=progress.processed_images + 1)
+                            continue
+                        
+                        unit_sources[source_path] = (dataset_name, split_section)
+                        yield {
+                            "image_path": source_path,
+                            "transformation_configs": remaining,
+                            "dataset_split": split_section,
+                            "output_filename": unique_filename,
+                            "annotations": batch_annotations.get(image_id, [])
+                        }
             
-            # Process all images with multi-dataset support
-            all_results = process_release_images(
-                image_paths=image_paths,
-                transformation_configs=transformation_configs,
-                dataset_splits=dataset_splits,
+            def checkpoint_results(image_path: str, results: List[AugmentationResult]) -> None:
+                package_results(image_path, results, *unit_sources.pop(image_path, ("unknown", None)))
+                manifest.record_results(image_path, results)
+                for result in results:
+                    digest = blob_path = None
+                    try:
+                        digest = blob_store.ingest_file(result.augmented_image_path, blob_owner)
+                        blob_path = str(blob_store.blob_path(digest, Path(result.augmented_image_path).suffix.lower()))
+                    except OSError as e:
+                        logger.warning(f"Failed to add {result.augmented_image_path} to the blob store: {e}")
+                    key = cache_keys.pop((image_path, result.config_id), None)
+                    if augmentation_cache and key:
+                        augmentation_cache.record(key, result, digest, blob_path)
+                progress = self.release_progress[release_id]
+                if (progress.processed_images + 1) % max(1, settings.RELEASE_CHECKPOINT_INTERVAL) == 0:
+                    blob_store.flush()
+                self.update_release_progress(release_id, processed_images=progress.processed_images + 1)
+            
+            logger.info(f"🔄 RESOLVING IMAGES FROM MULTIPLE DATASETS:")
+            
+            # Work units are built from the image stream as processing takes them
+            process_release_work_units(
+                release_work_units(),
                 output_dir=output_dir,
                 output_format=config.output_format,
-                dataset_sources=dataset_sources  # Pass dataset source information
+                max_workers=config.max_workers,
+                on_image_processed=checkpoint_results,
+                on_pipeline_stats=lambda stats: self.update_release_progress(release_id, pipeline_stats=stats),
+                encoder_profile=config.encoder_profile
             )
+            manifest.save()
+            blob_store.flush()
+            if augmentation_cache:
+                augmentation_cache.save()
+            
+            logger.info(f"✅ Resolved {resolved_counts['images']} images from {len(dataset_counts)} datasets")
+            if materialize_stats:
+                logger.info(f"   🖼️ Originals written: {materialize_stats}")
+            if resolved_counts["skipped_results"]:
+                logger.info(f"   ⏭️ Skipped {resolved_counts['skipped_results']} completed augmentations")
             
-            # Count generated images
-            total_generated = sum(len(results) for results in all_results.values())
+            # The manifest is the one record of the release's results; export data streams from it
+            total_generated = manifest.completed_count()
             
             # Update progress
             self.update_release_progress(
                 release_id,
-                processed_images=len(image_paths),
+                processed_images=resolved_counts["images"],
                 generated_images=total_generated,
                 current_step="finalizing"
             )
@@ -454,9 +679,9 @@ class ReleaseController:
             # Update release record with results
             release = self.db.query(Release).filter(Release.id == release_id).first()
             if release:
-                release.total_original_images = len(image_paths)
+                release.total_original_images = resolved_counts["images"]
                 release.total_augmented_images = total_generated
-                release.final_image_count = total_generated + (len(image_paths) if config.include_original else 0)
+                release.final_image_count = total_generated + resolved_counts["originals"]
                 release.model_path = output_dir
                 self.db.commit()
             
@@ -466,7 +691,7 @@ class ReleaseController:
             
             # Intelligently select export format based on task type and annotations
             optimal_export_format = self._select_optimal_export_format(
-                all_results, 
+                manifest.iter_completed_results(), 
                 config.export_format, 
                 config.task_type if hasattr(config, 'task_type') else 'object_detection'
             )
@@ -474,7 +699,7 @@ class ReleaseController:
             # Generate export files with transformed annotations
             export_path = self._generate_export_files(
                 release_id, 
-                all_results, 
+                manifest.iter_completed_results(), 
                 optimal_export_format,
                 config.task_type if hasattr(config, 'task_type') else 'object_detection'
             )
@@ -486,15 +711,14 @@ class ReleaseController:
                 progress_percentage=90.0
             )
             
-            # Create comprehensive ZIP package with organized structure
+            # Finalize the streamed ZIP package with metadata
             try:
                 # Update config with optimal export format
                 config.export_format = optimal_export_format
                 
-                # Create ZIP package
-                zip_path = self.create_zip_package(
+                zip_path = self.finalize_release_package(
+                    package_writer,
                     release_id,
-                    all_results,
                     config,
                     transformation_records
                 )
@@ -507,6 +731,7 @@ class ReleaseController:
                     self.db.commit()
                     logger.info(f"✅ ZIP package created successfully: {zip_path}")
             except Exception as e:
+                package_writer.abort()
                 logger.error(f"Failed to create ZIP package: {str(e)}")
                 # Fall back to regular export path if ZIP creation fails
                 if release and export_path:
@@ -515,8 +740,13 @@ class ReleaseController:
                     release.task_type = config.task_type if hasattr(config, 'task_type') else 'object_detection'
                     self.db.commit()
             
-            # Cleanup staging directory (images were copied, not moved)
-            self._cleanup_staging_directory(staging_dir)
+            manifest.set_status("completed")
+            
+            # Keep the shared blob store under its size cap (only unreferenced blobs are evicted)
+            try:
+                blob_store.collect_garbage()
+            except Exception as e:
+                logger.warning(f"Blob store garbage collection failed: {e}")
             
             # Update final progress
             self.update_release_progress(
@@ -528,16 +758,11 @@ class ReleaseController:
             )
             
             # Log multi-dataset statistics
-            dataset_counts = {}
-            for img_record in image_records:
-                dataset_name = img_record["dataset_name"]
-                dataset_counts[dataset_name] = dataset_counts.get(dataset_name, 0) + 1
-            
             logger.info(f"✅ MULTI-DATASET RELEASE GENERATION COMPLETED: {release_id}")
             logger.info(f"   📊 Dataset breakdown:")
             for dataset_name, count in dataset_counts.items():
                 logger.info(f"      {dataset_name}: {count} images")
-            logger.info(f"   📈 Total original images: {len(image_paths)}")
+            logger.info(f"   📈 Total original images: {resolved_counts['images']}")
             logger.info(f"   🎨 Total generated images: {total_generated}")
             logger.info(f"   🖼️ Image format: {config.output_format.upper() if config.output_format.lower() != 'original' else 'Original (preserved)'}")
             logger.info(f"   📁 Export path: {export_path}")
@@ -548,6 +773,15 @@ class ReleaseController:
             error_msg = f"Failed to generate release: {str(e)}"
             logger.error(error_msg)
             
+            if package_writer:
+                package_writer.abort()
+            
+            if manifest:
+                try:
+                    manifest.set_status("failed")
+                except Exception as manifest_error:
+                    logger.warning(f"Failed to checkpoint release manifest: {manifest_error}")
+            
             if release_id:
                 self.update_release_progress(
                     release_id,
@@ -558,18 +792,70 @@ class ReleaseController:
             
             raise
     
-    def _cleanup_staging_directory(self, staging_dir: str) -> None:
+    def get_release_manifest(self, release_id: str) -> Optional[ReleaseManifest]:
+        """Load the checkpoint manifest of a release, or None if it has none"""
+        release = self.db.query(Release).filter(Release.id == release_id).first()
+        if not release:
+            return None
+        
+        project = self.db.query(Project).filter(Project.id == release.project_id).first()
+        project_name = project.name if project else f"project_{release.project_id}"
+        return ReleaseManifest.load(os.path.join("projects", project_name, "releases", release_id))
+    
+    def resume_release(self, release_id: str) -> str:
         """
-        Clean up staging directory after processing
+        Resume an interrupted or failed release from its manifest
         
-        This removes the temporary copied images since we copied (not moved) them
+        Only the source image/config pairs not recorded as done are generated;
+        the ZIP package and release record are then rebuilt as usual.
+        
+        Args:
+            release_id: ID of the release to resume
+            
+        Returns:
+            Release ID
         """
-        try:
-            if os.path.exists(staging_dir):
-                shutil.rmtree(staging_dir)
-                logger.info(f"🧹 Cleaned up staging directory: {staging_dir}")
-        except Exception as e:
-            logger.warning(f"Failed to cleanup staging directory {staging_dir}: {e}")
+        manifest = self.get_release_manifest(release_id)
+        if manifest is None:
+            raise ValueError(f"Release {release_id} has no manifest and cannot be resumed")
+        if manifest.status == "completed":
+            raise ValueError(f"Release {release_id} is already completed")
+        
+        config = ReleaseConfig(**manifest.config)
+        return self.generate_release(config, manifest.release_version, release_id=release_id)
+    
+    def _materialize_original(self, source_path: str, output_dir: str, split_section: str,
+                              output_filename: str, output_format: str) -> Tuple[str, str]:
+        """
+        Write an original image into its final split folder
+        
+        When the format is unchanged the file is hardlinked (or reflinked) from
+        dataset storage instead of copied; otherwise it is re-encoded once.
+        
+        Returns:
+            (output path, method) where method is hardlink, reflink, copy or converted
+        """
+        split_dir = os.path.join(output_dir, split_section)
+        os.makedirs(split_dir, exist_ok=True)
+        
+        source_ext = Path(source_path).suffix.lstrip('.').lower()
+        target_ext = output_format.lower()
+        if target_ext == "jpeg":
+            target_ext = "jpg"
+        if source_ext == "jpeg":
+            source_ext = "jpg"
+        
+        if target_ext == "original":
+            output_path = os.path.join(split_dir, output_filename)
+        else:
+            output_path = os.path.join(split_dir, f"{Path(output_filename).stem}.{target_ext}")
+        
+        if target_ext in ("original", source_ext):
+            return output_path, path_manager.link_or_copy(source_path, output_path)
+        
+        with PILImage.open(source_path) as original_image:
+            self.augmentation_engine._save_image_with_format(original_image, output_path, output_format)
+        return output_path, "converted"
     
     def _resolve_image_path(self, relative_path: str) -> str:
         """Resolve relative image path to absolute path"""
@@ -592,7 +878,7 @@ class ReleaseController:
         # Return original path if not found
         return relative_path
     
-    def _select_optimal_export_format(self, generation_results: Dict[str, List[Dict]], 
+    def _select_optimal_export_format(self, generation_results: Iterable[Tuple[str, List[AugmentationResult]]], 
                                      user_format: str, task_type: str) -> str:
         """
         Intelligently select the optimal export format based on:
@@ -610,7 +896,7 @@ class ReleaseController:
         has_polygons = False
         has_bboxes = False
         
-        for original_image, results in generation_results.items():
+        for original_image, results in generation_results:
             for result in results:
                 if 'annotations' in result:
                     for ann in result['annotations']:
@@ -647,14 +933,14 @@ class ReleaseController:
         logger.info(f"Intelligently selected export format: {optimal_format} ({reason})")
         return optimal_format
     
-    def _generate_export_files(self, release_id: int, generation_results: Dict[str, List[Dict]], 
+    def _generate_export_files(self, release_id: int, generation_results: Iterable[Tuple[str, List[AugmentationResult]]], 
                               export_format: str, task_type: str) -> Optional[str]:
         """
         Generate export files with transformed annotations
         
         Args:
             release_id: Release ID
-            generation_results: Results from image generation with annotations
+            generation_results: (original image, results) pairs from image generation with annotations
             export_format: Export format (yolo_detection, yolo_segmentation, coco, etc.)
             task_type: Task type (object_detection, segmentation)
         
@@ -690,7 +976,7 @@ class ReleaseController:
             logger.error(f"Failed to generate export files for release {release_id}: {str(e)}")
             return None
     
-    def _prepare_export_data(self, generation_results: Dict[str, List[Dict]], task_type: str) -> Dict[str, Any]:
+    def _prepare_export_data(self, generation_results: Iterable[Tuple[str, List[AugmentationResult]]], task_type: str) -> Dict[str, Any]:
         """
         Prepare export data from generation results with transformed annotations
         """
@@ -699,7 +985,7 @@ class ReleaseController:
         classes_set = set()
         annotation_id = 1
         
-        for original_image, results in generation_results.items():
+        for original_image, results in generation_results:
             for result in results:
                 # Extract image info
                 image_info = {
@@ -838,161 +1124,83 @@ class ReleaseController:
                 shutil.rmtree(temp_dir)
             raise e
             
-    def create_zip_package(self, release_id: str, generation_results: Dict[str, List[Dict]], 
-                          config: ReleaseConfig, transformation_records: List[Dict]) -> str:
-        """
-        Create a comprehensive ZIP package for release export with the following structure:
-        
-        release_v1.zip
-        ├── images/
-        │   ├── train/
-        │   ├── val/
-        │   └── test/
-        ├── labels/
-        │   ├── train/
-        │   ├── val/
-        │   └── test/
-        ├── metadata/
-        │   ├── release_config.json
-        │   ├── dataset_stats.json
-        │   ├── transformation_log.json
-        └── README.md
+    def _releases_dir(self, project_id: int) -> str:
+        """Project-specific directory that holds release ZIP packages"""
+        project = self.db.query(Project).filter(Project.id == project_id).first()
+        project_name = project.name if project else f"project_{project_id}"
         
-        Args:
-            release_id: Release ID
-            generation_results: Results from image generation with annotations
-            config: Release configuration
-            transformation_records: Transformation records used for this release
-            
-        Returns:
-            Path to the generated ZIP file
-        """
-        try:
-            logger.info(f"Creating ZIP package for release {release_id}")
-            
-            # Get release record from database
-            release = self.db.query(Release).filter(Release.id == release_id).first()
-            if not release:
-                raise ValueError(f"Release {release_id} not found in database")
-            
-            # Create temporary directory for ZIP package
-            temp_dir = tempfile.mkdtemp(prefix=f"release_{release_id}_zip_")
-            
-            # Create directory structure
-            images_dir = os.path.join(temp_dir, "images")
-            labels_dir = os.path.join(temp_dir, "labels")
-            metadata_dir = os.path.join(temp_dir, "metadata")
-            
-            # Create split directories
-            for split in ["train", "val", "test"]:
-                os.makedirs(os.path.join(images_dir, split), exist_ok=True)
-                os.makedirs(os.path.join(labels_dir, split), exist_ok=True)
-            
-            os.makedirs(metadata_dir, exist_ok=True)
-            
-            # Organize images and labels by split
-            dataset_stats = {
-                "total_images": 0,
-                "split_counts": {"train": 0, "val": 0, "test": 0},
-                "class_distribution": {},
-                "original_images": 0,
-                "augmented_images": 0,
-                "dataset_distribution": {}
+        # Use absolute path to projects directory (one level up from backend)
+        projects_root = os.path.join(os.path.dirname(os.path.dirname(__file__)), "projects")
+        return os.path.join(projects_root, project_name, "releases")
+    
+    def open_release_package(self, release_id: str, config: ReleaseConfig) -> ReleasePackageWriter:
+        """Start a streaming ZIP package that entries can be added to during generation"""
+        return ReleasePackageWriter(self._releases_dir(config.project_id), release_id)
+    
+    def _add_result_to_package(self, package_writer: ReleasePackageWriter, original_image: str,
+                               result: Any, config: ReleaseConfig,
+                               source_dataset: str = "unknown",
+                               split_section: Optional[str] = None) -> bool:
+        """Stream one generation result (AugmentationResult or result dict) into the package"""
+        if isinstance(result, AugmentationResult):
+            output_path = result.augmented_image_path
+            entry = {
+                "output_path": output_path,
+                "output_filename": os.path.basename(output_path),
+                "split_section": split_section or Path(output_path).parent.name,
+                "is_original": False,
+                "source_dataset": source_dataset,
+                "annotations": [asdict(ann) for ann in result.updated_annotations],
+                "transformations_applied": result.transformation_applied
             }
-            
-            transformation_log = {}
-            
-            # Process all images and organize by split
-            for original_image, results in generation_results.items():
-                for result in results:
-                    # Get image info
-                    output_filename = result.get('output_filename', '')
-                    output_path = result.get('output_path', '')
-                    split_section = result.get('split_section', 'train')  # Default to train if not specified
-                    is_original = result.get('is_original', False)
-                    source_dataset = result.get('source_dataset', 'unknown')
-                    
-                    # Skip if output path doesn't exist
-                    if not output_path or not os.path.exists(output_path):
-                        logger.warning(f"Output path not found: {output_path}")
-                        continue
-                    
-                    # Copy image to appropriate split directory
-                    dst_image_path = os.path.join(images_dir, split_section, output_filename)
-                    shutil.copy2(output_path, dst_image_path)
-                    
-                    # Update dataset stats
-                    dataset_stats["total_images"] += 1
-                    dataset_stats["split_counts"][split_section] += 1
-                    
-                    if is_original:
-                        dataset_stats["original_images"] += 1
-                    else:
-                        dataset_stats["augmented_images"] += 1
-                    
-                    # Update dataset distribution
-                    if source_dataset not in dataset_stats["dataset_distribution"]:
-                        dataset_stats["dataset_distribution"][source_dataset] = 0
-                    dataset_stats["dataset_distribution"][source_dataset] += 1
-                    
-                    # Process annotations if available
-                    if 'annotations' in result and result['annotations']:
-                        # Get annotation file path based on export format
-                        if config.export_format in ['yolo_detection', 'yolo_segmentation']:
-                            # YOLO format: one .txt file per image with same basename
-                            label_filename = os.path.splitext(output_filename)[0] + '.txt'
-                            src_label_path = os.path.join(os.path.dirname(output_path), '..', 'labels', label_filename)
-                            
-                            if os.path.exists(src_label_path):
-                                dst_label_path = os.path.join(labels_dir, split_section, label_filename)
-                                shutil.copy2(src_label_path, dst_label_path)
-                        
-                        # Update class distribution
-                        for ann in result['annotations']:
-                            class_name = ann.get('class_name', 'unknown')
-                            if class_name not in dataset_stats["class_distribution"]:
-                                dataset_stats["class_distribution"][class_name] = 0
-                            dataset_stats["class_distribution"][class_name] += 1
-                    
-                    # Record transformation log
-                    if not is_original:
-                        transformations_applied = result.get('transformations_applied', [])
-                        transformation_log[output_filename] = {
-                            "source_image": original_image,
-                            "transformations": transformations_applied
-                        }
-            
-            # Generate metadata files
-            
-            # 1. release_config.json
-            release_config = {
-                "release_version": release.name,
-                "release_id": release_id,
-                "release_date": datetime.utcnow().isoformat(),
-                "description": release.description,
-                "export_format": config.export_format,
-                "task_type": config.task_type,
-                "image_format": config.output_format,
-                "images_per_original": config.images_per_original,
-                "include_original": config.include_original,
-                "sampling_strategy": config.sampling_strategy,
-                "preserve_original_splits": config.preserve_original_splits,
-                "source_datasets": config.dataset_ids
+        else:
+            entry = {
+                "output_path": result.get('output_path', ''),
+                "output_filename": result.get('output_filename', ''),
+                "split_section": result.get('split_section', 'train'),
+                "is_original": result.get('is_original', False),
+                "source_dataset": result.get('source_dataset', source_dataset),
+                "annotations": result.get('annotations') or [],
+                "transformations_applied": result.get('transformations_applied', [])
             }
-            
-            with open(os.path.join(metadata_dir, "release_config.json"), 'w') as f:
-                json.dump(release_config, f, indent=4)
-            
-            # 2. dataset_stats.json
-            with open(os.path.join(metadata_dir, "dataset_stats.json"), 'w') as f:
-                json.dump(dataset_stats, f, indent=4)
-            
-            # 3. transformation_log.json
-            with open(os.path.join(metadata_dir, "transformation_log.json"), 'w') as f:
-                json.dump(transformation_log, f, indent=4)
-            
-            # 4. README.md
-            readme_content = f"""# Release: {release.name}
+        
+        # YOLO format: one .txt file per image with same basename
+        label_path = None
+        if entry["annotations"] and config.export_format in ['yolo_detection', 'yolo_segmentation']:
+            label_filename = os.path.splitext(entry["output_filename"])[0] + '.txt'
+            label_path = os.path.join(os.path.dirname(entry["output_path"]), '..', 'labels', label_filename)
+        
+        return package_writer.add_image(
+            source_image=original_image,
+            label_path=label_path,
+            **entry
+        )
+    
+    def finalize_release_package(self, package_writer: ReleasePackageWriter, release_id: str,
+                                 config: ReleaseConfig, transformation_records: List[Dict]) -> str:
+        """Write metadata and README into a streamed package and move it to its final name"""
+        release = self.db.query(Release).filter(Release.id == release_id).first()
+        if not release:
+            raise ValueError(f"Release {release_id} not found in database")
+        
+        stats = package_writer.dataset_stats
+        
+        release_config = {
+            "release_version": release.name,
+            "release_id": release_id,
+            "release_date": datetime.utcnow().isoformat(),
+            "description": release.description,
+            "export_format": config.export_format,
+            "task_type": config.task_type,
+            "image_format": config.output_format,
+            "images_per_original": config.images_per_original,
+            "include_original": config.include_original,
+            "sampling_strategy": config.sampling_strategy,
+            "preserve_original_splits": config.preserve_original_splits,
+            "source_datasets": config.dataset_ids
+        }
+        
+        readme_content = f"""# Release: {release.name}
 
 ## Overview
 - **Release ID:** {release_id}
@@ -1002,14 +1210,14 @@ class ReleaseController:
 - **Task Type:** {config.task_type}
 
 ## Dataset Statistics
-- **Total Images:** {dataset_stats["total_images"]}
-- **Original Images:** {dataset_stats["original_images"]}
-- **Augmented Images:** {dataset_stats["augmented_images"]}
+- **Total Images:** {stats["total_images"]}
+- **Original Images:** {stats["original_images"]}
+- **Augmented Images:** {stats["augmented_images"]}
 
 ### Split Distribution
-- **Train:** {dataset_stats["split_counts"]["train"]} images
-- **Validation:** {dataset_stats["split_counts"]["val"]} images
-- **Test:** {dataset_stats["split_counts"]["test"]} images
+- **Train:** {stats["split_counts"]["train"]} images
+- **Validation:** {stats["split_counts"]["val"]} images
+- **Test:** {stats["split_counts"]["test"]} images
 
 ### Source Datasets
 {chr(10).join([f"- {dataset_id}" for dataset_id in config.dataset_ids])}
@@ -1027,39 +1235,62 @@ class ReleaseController:
 - `dataset_stats.json` - Statistics about the dataset
 - `transformation_log.json` - Logs of transformations applied to each image
 """
+        
+        zip_filename = f"{release.name.replace(' ', '_')}_{config.export_format}.zip"
+        zip_path = os.path.join(package_writer.releases_dir, zip_filename)
+        
+        return package_writer.finalize(zip_path, release_config, readme_content)
+    
+    def create_zip_package(self, release_id: str, generation_results: Dict[str, List[Any]], 
+                          config: ReleaseConfig, transformation_records: List[Dict]) -> str:
+        """
+        Create a comprehensive ZIP package for release export with the following structure:
+        
+        release_v1.zip
+        ├── images/
+        │   ├── train/
+        │   ├── val/
+        │   └── test/
+        ├── labels/
+        │   ├── train/
+        │   ├── val/
+        │   └── test/
+        ├── metadata/
+        │   ├── release_config.json
+        │   ├── dataset_stats.json
+        │   ├── transformation_log.json
+        └── README.md
+        
+        Images are streamed from their generated location into the archive
+        (see ReleasePackageWriter); generate_release streams entries while
+        images are being generated and only calls finalize_release_package.
+        
+        Args:
+            release_id: Release ID
+            generation_results: Results from image generation with annotations
+            config: Release configuration
+            transformation_records: Transformation records used for this release
             
-            with open(os.path.join(temp_dir, "README.md"), 'w') as f:
-                f.write(readme_content)
-            
-            # Create ZIP file in project-specific folder
-            # Get project name for folder structure
-            project = self.db.query(Project).filter(Project.id == config.project_id).first()
-            project_name = project.name if project else f"project_{config.project_id}"
-            
-            # Create project-specific releases directory
-            # Use absolute path to projects directory (one level up from backend)
-            projects_root = os.path.join(os.path.dirname(os.path.dirname(__file__)), "projects")
-            releases_dir = os.path.join(projects_root, project_name, "releases")
-            os.makedirs(releases_dir, exist_ok=True)
-            
-            zip_filename = f"{release.name.replace(' ', '_')}_{config.export_format}.zip"
-            zip_path = os.path.join(releases_dir, zip_filename)
+        Returns:
+            Path to the generated ZIP file
+        """
+        package_writer = None
+        try:
+            logger.info(f"Creating ZIP package for release {release_id}")
             
-            with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                # Add all files from temp directory to ZIP
-                for root, _, files in os.walk(temp_dir):
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        arcname = os.path.relpath(file_path, temp_dir)
-                        zipf.write(file_path, arcname)
+            package_writer = self.open_release_package(release_id, config)
+            for original_image, results in generation_results.items():
+                for result in results:
+                    self._add_result_to_package(package_writer, original_image, result, config)
             
-            # Clean up temp directory
-            shutil.rmtree(temp_dir)
+            zip_path = self.finalize_release_package(package_writer, release_id, config, transformation_records)
             
             logger.info(f"Successfully created ZIP package at {zip_path}")
             return zip_path
             
         except Exception as e:
+            if package_writer:
+                package_writer.abort()
             logger.error(f"Failed to create ZIP package: {str(e)}")
             raise e
     
@@ -1113,6 +1344,9 @@ class ReleaseController:
                 shutil.rmtree(output_dir)
                 logger.info(f"Cleaned up output directory for failed release: {release_id}")
             
+            # Release the blobs it referenced (the store evicts them once unreferenced and over its cap)
+            BlobStore(self.db).release_owner(f"release:{release_id}")
+            
             # Remove from progress tracking
             if release_id in self.release_progress:
                 del self.release_progress[release_id]
@@ -1122,9 +1356,10 @@ class ReleaseController:
 
 
 # Utility functions for easy usage
-def create_release_controller(db_session: Optional[Session] = None) -> ReleaseController:
+def create_release_controller(db_session: Optional[Session] = None,
+                              progress_listener: Optional[Callable[[ReleaseProgress], None]] = None) -> ReleaseController:
     """Create and configure release controller"""
-    return ReleaseController(db_session)
+    return ReleaseController(db_session, progress_listener)
 
 
 def quick_release_generation(project_id: int, dataset_ids: List[str], 
@@ -0,0 +1,321 @@
+"""
+Persistent Release Job Queue for Auto-Labeling Tool Release Pipeline
+Release generation runs in a separate worker process that claims jobs from the database
+"""
+
+import os
+import time
+import socket
+import logging
+import threading
+from typing import Dict, Any, Optional
+from dataclasses import asdict
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import update, select
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from core.release_controller import ReleaseConfig, ReleaseProgress, create_release_controller
+from database.database import SessionLocal
+from database.models import ReleaseJob
+
+logger = logging.getLogger(__name__)
+
+# Minimum seconds between progress writes for one job (status changes are always written)
+PROGRESS_PUBLISH_INTERVAL = 1.0
+
+
+def enqueue_release_job(db: Session, config: ReleaseConfig, release_version: str,
+                        release_id: Optional[str] = None) -> ReleaseJob:
+    """
+    Queue a release generation job
+
+    Args:
+        db: Database session
+        config: Release configuration
+        release_version: Version identifier for transformations
+        release_id: Existing release to resume (None = generate a new release)
+
+    Returns:
+        The queued ReleaseJob
+    """
+    job = ReleaseJob(
+        project_id=config.project_id,
+        release_id=release_id,
+        release_version=release_version,
+        config=asdict(config),
+        status="queued",
+        current_step="queued"
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+
+    logger.info(f"Queued release job {job.id} (version {release_version})")
+    return job
+
+
+def get_release_job(db: Session, job_id: str) -> Optional[ReleaseJob]:
+    """Get a release job by ID"""
+    return db.query(ReleaseJob).filter(ReleaseJob.id == job_id).first()
+
+
+def get_latest_job_for_release(db: Session, release_id: str) -> Optional[ReleaseJob]:
+    """Get the most recent job that worked on a release"""
+    return db.query(ReleaseJob).filter(
+        ReleaseJob.release_id == release_id
+    ).order_by(ReleaseJob.created_at.desc()).first()
+
+
+async def get_release_job_async(db: AsyncSession, job_id: str) -> Optional[ReleaseJob]:
+    """get_release_job for async route handlers (progress polling)"""
+    return await db.get(ReleaseJob, job_id)
+
+
+async def get_latest_job_for_release_async(db: AsyncSession, release_id: str) -> Optional[ReleaseJob]:
+    """get_latest_job_for_release for async route handlers (progress polling)"""
+    return await db.scalar(
+        select(ReleaseJob).where(
+            ReleaseJob.release_id == release_id
+        ).order_by(ReleaseJob.created_at.desc()).limit(1)
+    )
+
+
+def release_job_to_dict(job: ReleaseJob) -> Dict[str, Any]:
+    """Serialize a release job for API responses"""
+    return {
+        "job_id": job.id,
+        "release_id": job.release_id,
+        "project_id": job.project_id,
+        "release_version": job.release_version,
+        "status": job.status,
+        "attempts": job.attempts,
+        "progress_percentage": job.progress_percentage,
+        "current_step": job.current_step,
+        "total_images": job.total_images,
+        "processed_images": job.processed_images,
+        "generated_images": job.generated_images,
+        "pipeline_stats": job.pipeline_stats,
+        "error_message": job.error_message,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "completed_at": job.completed_at.isoformat() if job.completed_at else None
+    }
+
+
+def claim_next_job(db: Session, worker_id: str) -> Optional[ReleaseJob]:
+    """
+    Atomically claim the oldest queued job
+
+    The conditional UPDATE only succeeds for one worker, so several worker
+    processes can poll the same queue safely.
+    """
+    while True:
+        job = db.query(ReleaseJob).filter(
+            ReleaseJob.status == "queued"
+        ).order_by(ReleaseJob.created_at).first()
+        if not job:
+            return None
+
+        now = datetime.utcnow()
+        result = db.execute(
+            update(ReleaseJob)
+            .where(ReleaseJob.id == job.id, ReleaseJob.status == "queued")
+            .values(
+                status="running",
+                worker_id=worker_id,
+                attempts=ReleaseJob.attempts + 1,
+                started_at=now,
+                heartbeat_at=now,
+                error_message=None
+            )
+        )
+        db.commit()
+
+        if result.rowcount == 1:
+            db.refresh(job)
+            return job
+        # Another worker won the race; try the next job
+
+
+def requeue_stale_jobs(db: Session) -> int:
+    """
+    Requeue running jobs whose worker stopped sending heartbeats
+
+    Jobs that already used RELEASE_JOB_MAX_ATTEMPTS claims are failed instead.
+
+    Returns:
+        Number of jobs requeued or failed
+    """
+    cutoff = datetime.utcnow() - timedelta(seconds=settings.RELEASE_JOB_STALE_SECONDS)
+    stale_jobs = db.query(ReleaseJob).filter(
+        ReleaseJob.status == "running",
+        ReleaseJob.heartbeat_at < cutoff
+    ).all()
+
+    for job in stale_jobs:
+        if (job.attempts or 0) >= settings.RELEASE_JOB_MAX_ATTEMPTS:
+            job.status = "failed"
+            job.error_message = f"Worker {job.worker_id} stopped responding (attempt {job.attempts})"
+            job.completed_at = datetime.utcnow()
+            logger.warning(f"Release job {job.id} failed after {job.attempts} attempts")
+        else:
+            job.status = "queued"
+            job.current_step = "queued"
+            job.worker_id = None
+            logger.warning(f"Requeued stale release job {job.id} (worker stopped responding)")
+
+    if stale_jobs:
+        db.commit()
+    return len(stale_jobs)
+
+
+class JobProgressPublisher:
+    """Release controller progress listener that writes progress to the job row"""
+
+    def __init__(self, job_id: str):
+        self.job_id = job_id
+        self._last_publish = 0.0
+        self._last_status = None
+        self._release_id = None
+
+    def __call__(self, progress: ReleaseProgress) -> None:
+        now = time.monotonic()
+        first_sight = progress.release_id != self._release_id
+        status_changed = progress.status != self._last_status
+        if not (first_sight or status_changed) and now - self._last_publish < PROGRESS_PUBLISH_INTERVAL:
+            return
+
+        self._last_publish = now
+        self._last_status = progress.status
+        self._release_id = progress.release_id
+
+        values = {
+            "release_id": progress.release_id,
+            "progress_percentage": progress.progress_percentage,
+            "current_step": progress.current_step,
+            "total_images": progress.total_images,
+            "processed_images": progress.processed_images,
+            "generated_images": progress.generated_images,
+            "pipeline_stats": progress.pipeline_stats,
+            "heartbeat_at": datetime.utcnow()
+        }
+
+        # Separate short-lived session so progress never interferes with the release session
+        with SessionLocal() as db:
+            db.execute(update(ReleaseJob).where(ReleaseJob.id == self.job_id).values(**values))
+            db.commit()
+
+
+def _finish_job(job_id: str, status: str, error_message: Optional[str] = None) -> None:
+    with SessionLocal() as db:
+        values = {"status": status, "completed_at": datetime.utcnow(), "error_message": error_message}
+        if status == "completed":
+            values.update(progress_percentage=100.0, current_step="completed")
+        db.execute(update(ReleaseJob).where(ReleaseJob.id == job_id).values(**values))
+        db.commit()
+
+
+def run_release_job(job_id: str) -> None:
+    """
+    Run one claimed release job to completion
+
+    A job that already has a release (e.g. requeued after a worker crash) is
+    resumed from the release manifest instead of starting over.
+    """
+    with SessionLocal() as db:
+        job = get_release_job(db, job_id)
+        if not job:
+            logger.error(f"Release job {job_id} not found")
+            return
+
+        controller = create_release_controller(db, JobProgressPublisher(job_id))
+        try:
+            manifest = controller.get_release_manifest(job.release_id) if job.release_id else None
+            if manifest is not None and manifest.status == "completed":
+                release_id = job.release_id
+            elif manifest is not None:
+                release_id = controller.resume_release(job.release_id)
+            else:
+                release_id = controller.generate_release(ReleaseConfig(**job.config), job.release_version)
+
+            _finish_job(job_id, "completed")
+            logger.info(f"✅ Release job {job_id} completed: release {release_id}")
+
+        except Exception as e:
+            logger.error(f"❌ Release job {job_id} failed: {str(e)}")
+            _finish_job(job_id, "failed", str(e))
+
+
+class ReleaseJobWorker:
+    """
+    Polls the release job table and runs up to `concurrency` jobs at a time
+
+    Heartbeats for running jobs are refreshed on every poll; jobs whose worker
+    died are requeued by whichever worker notices them first.
+    """
+
+    def __init__(self, concurrency: Optional[int] = None, poll_interval: Optional[float] = None,
+                 worker_id: Optional[str] = None):
+        self.concurrency = max(1, concurrency or settings.RELEASE_JOB_CONCURRENCY)
+        self.poll_interval = poll_interval or settings.RELEASE_JOB_POLL_INTERVAL
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self._stop_event = threading.Event()
+        self._active: Dict[str, Any] = {}
+
+    def stop(self) -> None:
+        """Stop claiming new jobs; running jobs are allowed to finish"""
+        self._stop_event.set()
+
+    def _heartbeat(self, db: Session) -> None:
+        if not self._active:
+            return
+        db.execute(
+            update(ReleaseJob)
+            .where(ReleaseJob.id.in_(list(self._active)), ReleaseJob.status == "running")
+            .values(heartbeat_at=datetime.utcnow())
+        )
+        db.commit()
+
+    def run_forever(self) -> None:
+        """Claim and run jobs until stop() is called"""
+        logger.info(f"🚀 Release worker {self.worker_id} started (concurrency {self.concurrency})")
+
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="release-job") as executor:
+            while not self._stop_event.is_set():
+                claimed = False
+                try:
+                    with SessionLocal() as db:
+                        # Forget finished jobs
+                        for job_id, future in list(self._active.items()):
+                            if future.done():
+                                del self._active[job_id]
+
+                        self._heartbeat(db)
+                        requeue_stale_jobs(db)
+
+                        if len(self._active) < self.concurrency:
+                            job = claim_next_job(db, self.worker_id)
+                            if job:
+                                claimed = True
+                                logger.info(f"Claimed release job {job.id} (attempt {job.attempts})")
+                                self._active[job.id] = executor.submit(run_release_job, job.id)
+
+                except Exception as e:
+                    logger.error(f"Release worker poll failed: {str(e)}")
+
+                # Poll again immediately after a claim to fill free slots
+                if not claimed:
+                    self._stop_event.wait(self.poll_interval)
+
+        logger.info(f"🛑 Release worker {self.worker_id} stopped")
+
+
+def start_embedded_worker() -> ReleaseJobWorker:
+    """Run a release worker on a daemon thread of the current process"""
+    worker = ReleaseJobWorker()
+    threading.Thread(target=worker.run_forever, name="release-worker", daemon=True).start()
+    return worker
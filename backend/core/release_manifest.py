@@ -0,0 +1,242 @@
+"""
+Release Manifest for Auto-Labeling Tool Release Pipeline
+On-disk checkpoint of completed work so interrupted releases can be resumed
+"""
+
+import os
+import json
+import logging
+from itertools import chain
+from typing import List, Dict, Any, Optional, Iterator, Tuple
+from dataclasses import asdict
+from datetime import datetime
+
+from core.config import settings
+from core.image_generator import AugmentationResult, BoundingBox, Polygon
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = "release_manifest.json"
+MANIFEST_CHUNK_DIR = "release_manifest_chunks"
+
+def augmentation_result_from_dict(data: Dict[str, Any]) -> AugmentationResult:
+    """Rebuild an AugmentationResult serialized with dataclasses.asdict"""
+    annotations = []
+    for ann in data.get("updated_annotations", []):
+        if 'points' in ann:
+            annotations.append(Polygon(**{**ann, "points": [tuple(p) for p in ann["points"]]}))
+        else:
+            annotations.append(BoundingBox(**ann))
+    return AugmentationResult(
+        augmented_image_path=data["augmented_image_path"],
+        updated_annotations=annotations,
+        transformation_applied=data["transformation_applied"],
+        original_dimensions=tuple(data["original_dimensions"]),
+        augmented_dimensions=tuple(data["augmented_dimensions"]),
+        config_id=data["config_id"]
+    )
+
+
+class ReleaseManifest:
+    """
+    Durable record of which (source image, config) pairs of a release are done
+
+    The manifest lives next to the release outputs. release_manifest.json
+    holds the release (id, version, config, status); completed work is
+    checkpointed every RELEASE_CHECKPOINT_INTERVAL source images as one file
+    in release_manifest_chunks/ holding only that chunk's results, so a
+    checkpoint costs the same however large the release is. Loading replays
+    the chunks in order. Every file is written to a temporary file and moved
+    into place, so at most one chunk of work is lost if the process dies.
+
+    In memory the manifest only indexes which chunk holds each completed
+    (source, config) and where its output is; full results are read back
+    from the chunks when asked for, so memory does not grow with the
+    results (annotations included) of the release.
+    """
+
+    def __init__(self, output_dir: str, data: Dict[str, Any]):
+        self.output_dir = output_dir
+        self.path = os.path.join(output_dir, MANIFEST_FILENAME)
+        self.chunk_dir = os.path.join(output_dir, MANIFEST_CHUNK_DIR)
+        self.data = data
+        self._originals = None  # Replayed from the chunks on first use
+        self._units = None  # image_path -> {config_id: (chunk number, augmented_image_path)}
+        self._read_chunk_cache = (None, None)  # Last chunk read back by completed_results
+        self._next_chunk = 0
+        self._pending = {"originals": {}, "units": {}}
+        self._pending_images = 0
+
+    @classmethod
+    def create(cls, output_dir: str, release_id: str, release_version: str,
+               config: Dict[str, Any]) -> "ReleaseManifest":
+        """Start a new manifest for a release run"""
+        os.makedirs(output_dir, exist_ok=True)
+        now = datetime.utcnow().isoformat()
+        manifest = cls(output_dir, {
+            "release_id": release_id,
+            "release_version": release_version,
+            "config": config,
+            "status": "processing",
+            "created_at": now,
+            "updated_at": now
+        })
+        manifest._originals, manifest._units = {}, {}
+        manifest.save()
+        return manifest
+
+    @classmethod
+    def load(cls, output_dir: str) -> Optional["ReleaseManifest"]:
+        """Load the manifest of a previous run, or None if there is none"""
+        path = os.path.join(output_dir, MANIFEST_FILENAME)
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r') as f:
+            return cls(output_dir, json.load(f))
+
+    @property
+    def status(self) -> str:
+        return self.data.get("status", "processing")
+
+    @property
+    def release_version(self) -> str:
+        return self.data["release_version"]
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        return self.data["config"]
+
+    def set_status(self, status: str) -> None:
+        self.data["status"] = status
+        self.save()
+
+    def save(self) -> None:
+        """Checkpoint the work recorded since the last checkpoint and the release status"""
+        if self._pending["originals"] or self._pending["units"]:
+            os.makedirs(self.chunk_dir, exist_ok=True)
+            self._write_json(os.path.join(self.chunk_dir, f"{self._next_chunk:08d}.json"), self._pending)
+            self._next_chunk += 1
+            self._pending = {"originals": {}, "units": {}}
+
+        self.data["updated_at"] = datetime.utcnow().isoformat()
+        self._write_json(self.path, self.data)
+        self._pending_images = 0
+
+    @staticmethod
+    def _write_json(path: str, data: Dict[str, Any]) -> None:
+        """Write a JSON file atomically (temporary file, then os.replace)"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, default=str)
+        os.replace(tmp_path, path)
+
+    def _saved_chunks(self) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """Yield (chunk number, chunk) for every checkpoint chunk, in order (unreadable ones empty)"""
+        chunk_names = sorted(
+            name for name in os.listdir(self.chunk_dir) if name.endswith(".json")
+        ) if os.path.isdir(self.chunk_dir) else []
+        for name in chunk_names:
+            try:
+                with open(os.path.join(self.chunk_dir, name), 'r') as f:
+                    chunk = json.load(f)
+            except (OSError, ValueError) as e:
+                # Its work is simply redone
+                logger.warning(f"Skipping unreadable release manifest chunk {name}: {e}")
+                chunk = {}
+            yield int(name.split(".")[0]), chunk
+
+    def _read_chunk(self, number: int) -> Dict[str, Any]:
+        """One chunk's contents (the pending one if it is not written yet)"""
+        if number == self._next_chunk:
+            return self._pending
+        if self._read_chunk_cache[0] != number:
+            with open(os.path.join(self.chunk_dir, f"{number:08d}.json"), 'r') as f:
+                self._read_chunk_cache = (number, json.load(f))
+        return self._read_chunk_cache[1]
+
+    def _replay(self) -> None:
+        """Rebuild the index of completed work from the checkpoint chunks, once"""
+        if self._units is not None:
+            return
+        self._originals, self._units = {}, {}
+        for number, chunk in self._saved_chunks():
+            self._originals.update(chunk.get("originals", {}))
+            for image_path, units in chunk.get("units", {}).items():
+                index = self._units.setdefault(image_path, {})
+                for config_id, unit in units.items():
+                    index[config_id] = (number, unit["augmented_image_path"])
+            self._next_chunk = number + 1
+
+    # Originals
+
+    def original_output(self, source_path: str) -> Optional[str]:
+        """Output path of an already materialized original, if it still exists"""
+        self._replay()
+        output_path = self._originals.get(source_path)
+        if output_path and os.path.exists(output_path):
+            return output_path
+        return None
+
+    def record_original(self, source_path: str, output_path: str) -> None:
+        self._replay()
+        self._originals[source_path] = output_path
+        self._pending["originals"][source_path] = output_path
+
+    # Augmented units
+
+    def is_done(self, image_path: str, config_id: str) -> bool:
+        """Whether a (source, config) pair completed and its output is still on disk"""
+        self._replay()
+        unit = self._units.get(image_path, {}).get(config_id)
+        return bool(unit) and os.path.exists(unit[1])
+
+    def record_results(self, image_path: str, results: List[AugmentationResult]) -> None:
+        """Mark the results of one source image done; checkpoints once per chunk"""
+        self._replay()
+        units = self._units.setdefault(image_path, {})
+        pending_units = self._pending["units"].setdefault(image_path, {})
+        for result in results:
+            pending_units[result.config_id] = asdict(result)
+            units[result.config_id] = (self._next_chunk, result.augmented_image_path)
+
+        self._pending_images += 1
+        if self._pending_images >= max(1, settings.RELEASE_CHECKPOINT_INTERVAL):
+            self.save()
+
+    def completed_results(self, image_path: str) -> List[AugmentationResult]:
+        """Rebuild AugmentationResults recorded for a source image by a previous run"""
+        self._replay()
+        results = []
+        for config_id, (number, _) in self._units.get(image_path, {}).items():
+            if not self.is_done(image_path, config_id):
+                continue
+            unit = self._read_chunk(number)["units"][image_path][config_id]
+            results.append(augmentation_result_from_dict({**unit, "config_id": config_id}))
+        return results
+
+    def iter_completed_results(self) -> Iterator[Tuple[str, List[AugmentationResult]]]:
+        """
+        Stream every completed result as (image_path, results), one chunk in memory at a time
+
+        An image whose results were recorded in several chunks (reused and
+        generated ones, or across resumed runs) is yielded once per chunk; a
+        config recorded more than once only from its latest record.
+        """
+        self._replay()
+        for number, chunk in chain(self._saved_chunks(), [(self._next_chunk, self._pending)]):
+            for image_path, units in chunk.get("units", {}).items():
+                index = self._units.get(image_path, {})
+                results = [
+                    augmentation_result_from_dict({**unit, "config_id": config_id})
+                    for config_id, unit in units.items()
+                    if index.get(config_id, (None,))[0] == number and self.is_done(image_path, config_id)
+                ]
+                if results:
+                    yield image_path, results
+
+    def completed_count(self) -> int:
+        self._replay()
+        return sum(
+            1 for image_path, units in self._units.items()
+            for config_id in units if self.is_done(image_path, config_id)
+        )
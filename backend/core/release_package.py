@@ -0,0 +1,138 @@
+"""
+Streaming ZIP Package Writer for Auto-Labeling Tool Release Pipeline
+Writes release entries straight from their generated location into the archive
+"""
+
+import os
+import json
+import logging
+import zipfile
+from typing import List, Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Only text payloads are deflated; images are already compressed (or not worth the CPU)
+DEFLATED_EXTENSIONS = {'.txt', '.json', '.md', '.xml', '.csv', '.yaml', '.yml'}
+
+
+class ReleasePackageWriter:
+    """
+    Incrementally builds a release ZIP package
+
+    release_v1.zip
+    ├── images/{train,val,test}/
+    ├── labels/{train,val,test}/
+    ├── metadata/
+    │   ├── release_config.json
+    │   ├── dataset_stats.json
+    │   └── transformation_log.json
+    └── README.md
+
+    Entries are added while images are still being generated. The archive is
+    written to a hidden ``.partial`` file and only moved to its final name by
+    finalize(), so a half-written package is never served for download.
+    """
+
+    def __init__(self, releases_dir: str, release_id: str):
+        os.makedirs(releases_dir, exist_ok=True)
+        self.releases_dir = releases_dir
+        self.partial_path = os.path.join(releases_dir, f".{release_id}.zip.partial")
+        self.zipf = zipfile.ZipFile(self.partial_path, 'w', zipfile.ZIP_STORED, allowZip64=True)
+        self.closed = False
+
+        self.dataset_stats = {
+            "total_images": 0,
+            "split_counts": {"train": 0, "val": 0, "test": 0},
+            "class_distribution": {},
+            "original_images": 0,
+            "augmented_images": 0,
+            "dataset_distribution": {}
+        }
+        self.transformation_log = {}
+
+    @staticmethod
+    def _compress_type(arcname: str) -> int:
+        """ZIP_DEFLATED for text and JSON, ZIP_STORED for everything else"""
+        if os.path.splitext(arcname)[1].lower() in DEFLATED_EXTENSIONS:
+            return zipfile.ZIP_DEFLATED
+        return zipfile.ZIP_STORED
+
+    def add_file(self, file_path: str, arcname: str) -> None:
+        """Stream a file from disk into the archive"""
+        self.zipf.write(file_path, arcname, compress_type=self._compress_type(arcname))
+
+    def add_text(self, arcname: str, content: str) -> None:
+        """Write an in-memory text entry"""
+        self.zipf.writestr(arcname, content, compress_type=self._compress_type(arcname))
+
+    def add_image(self, output_path: str, output_filename: str, split_section: str = "train",
+                  is_original: bool = False, source_dataset: str = "unknown",
+                  source_image: Optional[str] = None,
+                  annotations: Optional[List[Dict[str, Any]]] = None,
+                  transformations_applied: Any = None,
+                  label_path: Optional[str] = None) -> bool:
+        """
+        Add one generated (or original) image and update package statistics
+
+        Returns:
+            False if the image file does not exist, True otherwise
+        """
+        if not output_path or not os.path.exists(output_path):
+            logger.warning(f"Output path not found: {output_path}")
+            return False
+
+        self.add_file(output_path, f"images/{split_section}/{output_filename}")
+
+        if label_path and os.path.exists(label_path):
+            self.add_file(label_path, f"labels/{split_section}/{os.path.basename(label_path)}")
+
+        # Update dataset stats
+        stats = self.dataset_stats
+        stats["total_images"] += 1
+        stats["split_counts"][split_section] = stats["split_counts"].get(split_section, 0) + 1
+        if is_original:
+            stats["original_images"] += 1
+        else:
+            stats["augmented_images"] += 1
+        stats["dataset_distribution"][source_dataset] = stats["dataset_distribution"].get(source_dataset, 0) + 1
+
+        for ann in annotations or []:
+            class_name = ann.get('class_name', 'unknown')
+            stats["class_distribution"][class_name] = stats["class_distribution"].get(class_name, 0) + 1
+
+        # Record transformation log
+        if not is_original:
+            self.transformation_log[output_filename] = {
+                "source_image": source_image,
+                "transformations": transformations_applied or []
+            }
+
+        return True
+
+    def finalize(self, zip_path: str, release_config: Dict[str, Any], readme_content: str) -> str:
+        """Write metadata, close the archive and move it to zip_path"""
+        if self.closed:
+            raise ValueError(f"Release package {self.partial_path} was aborted")
+
+        self.add_text("metadata/release_config.json", json.dumps(release_config, indent=4))
+        self.add_text("metadata/dataset_stats.json", json.dumps(self.dataset_stats, indent=4))
+        self.add_text("metadata/transformation_log.json", json.dumps(self.transformation_log, indent=4, default=str))
+        self.add_text("README.md", readme_content)
+
+        self.zipf.close()
+        self.closed = True
+        os.replace(self.partial_path, zip_path)
+
+        logger.info(f"Finalized release package: {zip_path}")
+        return zip_path
+
+    def abort(self) -> None:
+        """Close and delete a partially written package"""
+        if not self.closed:
+            try:
+                self.zipf.close()
+            except Exception as e:
+                logger.warning(f"Failed to close partial package {self.partial_path}: {e}")
+            self.closed = True
+        if os.path.exists(self.partial_path):
+            os.remove(self.partial_path)
@@ -0,0 +1,402 @@
+"""
+Release Pipeline for Auto-Labeling Tool Release Pipeline
+Bounded load → transform → encode → write stages that keep disks and cores busy at once
+"""
+
+import os
+import time
+import queue
+import logging
+import threading
+from concurrent.futures import Executor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional, Tuple, Callable, Iterable
+
+from core.config import settings
+from core.image_generator import ImageAugmentationEngine, AugmentationResult, transform_in_release_worker
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of a stage's input
+_END = object()
+
+
+@dataclass
+class StageStats:
+    """Throughput counters of one pipeline stage"""
+    name: str
+    workers: int
+    items: int = 0
+    failures: int = 0
+    bytes: int = 0
+    busy_seconds: float = 0.0
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def add(self, seconds: float, nbytes: int = 0, failed: bool = False) -> None:
+        with self.lock:
+            self.items += 1
+            self.busy_seconds += seconds
+            self.bytes += nbytes
+            if failed:
+                self.failures += 1
+
+    def snapshot(self, elapsed: float, queue_depth: int) -> Dict[str, Any]:
+        with self.lock:
+            items, failures, nbytes, busy = self.items, self.failures, self.bytes, self.busy_seconds
+        elapsed = max(elapsed, 1e-9)
+        return {
+            "workers": self.workers,
+            "items": items,
+            "failures": failures,
+            "bytes": nbytes,
+            "items_per_second": round(items / elapsed, 2),
+            "mb_per_second": round(nbytes / elapsed / 1e6, 2),
+            "utilization": round(busy / (elapsed * self.workers), 3),  # 1.0 = every worker always busy
+            "queue_depth": queue_depth  # Items waiting for this stage
+        }
+
+
+class _UnitState:
+    """One source image travelling through the pipeline"""
+
+    def __init__(self, index: int, unit: Dict[str, Any]):
+        self.index = index
+        self.unit = unit
+        self.results: List[AugmentationResult] = []
+        self.failed = False
+        self._lock = threading.Lock()
+        self._expected: Optional[int] = None  # Configs handed to the encoder (known once transforming ends)
+        self._finished = 0
+
+    def finish_outputs(self, expected: int) -> bool:
+        """Every config has been transformed; returns True if the unit is complete"""
+        with self._lock:
+            self._expected = expected
+            return self._finished == expected
+
+    def finish_output(self, result: Optional[AugmentationResult]) -> bool:
+        """One config left the pipeline; returns True if the unit is complete"""
+        with self._lock:
+            if result is not None:
+                self.results.append(result)
+            self._finished += 1
+            return self._expected is not None and self._finished == self._expected
+
+
+class ReleasePipeline:
+    """
+    Staged release generation with bounded queues between the stages
+
+    - load: reader threads read and decode source images (I/O bound)
+    - transform: one thread per core runs every config of a source off the shared pixels
+    - encode: encoder threads turn augmented images into file bytes (CPU bound)
+    - write: writer threads write the bytes atomically next to the release
+
+    Pillow, NumPy and OpenCV release the GIL in their pixel loops, so the
+    threads of each stage run in parallel. Transform chains also run Python
+    between those loops (planning, parameter sampling, small steps), so with
+    a transform_pool each transform thread hands its source to a worker
+    process instead, which decodes, transforms and encodes it (see
+    transform_in_release_worker): only the path goes across and the encoded
+    bytes come back, and the load and encode stages pass items through.
+    Every queue is bounded, and at most
+    max_in_flight source images are between loading and delivery, so memory
+    stays capped however many images a release has; a slow stage makes the
+    stages before it wait instead of buffering.
+
+    Work units are pulled and results delivered in input order on the calling
+    thread, so both the unit iterable and the callback can use its database
+    session. Units are pulled only as slots free up, so a generator streaming
+    them is read no further ahead than the pipeline can take.
+    """
+
+    def __init__(self, engine: ImageAugmentationEngine, output_format: str,
+                 transform_workers: int = 1,
+                 load_workers: Optional[int] = None,
+                 encode_workers: Optional[int] = None,
+                 write_workers: Optional[int] = None,
+                 queue_size: Optional[int] = None,
+                 max_in_flight: Optional[int] = None,
+                 transform_pool: Optional[Executor] = None):
+        cpu_count = os.cpu_count() or 1
+        self.engine = engine
+        self.output_format = output_format
+        # Runs transform_in_release_worker; its processes hold their own engine (see _init_release_worker)
+        self.transform_pool = transform_pool
+        workers = {
+            "load": load_workers or settings.RELEASE_PIPELINE_LOAD_WORKERS or 1,
+            "transform": max(1, transform_workers),
+            "encode": encode_workers or settings.RELEASE_PIPELINE_ENCODE_WORKERS or cpu_count,
+            "write": write_workers or settings.RELEASE_PIPELINE_WRITE_WORKERS or 1
+        }
+        queue_size = queue_size or max(1, settings.RELEASE_PIPELINE_QUEUE_SIZE)
+        self.max_in_flight = max_in_flight or workers["transform"] * max(1, settings.RELEASE_MAX_PENDING_PER_WORKER)
+
+        self.stats = {name: StageStats(name, count) for name, count in workers.items()}
+        self._queues = {name: queue.Queue(maxsize=queue_size) for name in workers}
+        self._handlers = {
+            "load": self._load,
+            "transform": self._transform,
+            "encode": self._encode,
+            "write": self._write
+        }
+        self._done: "queue.Queue" = queue.Queue()
+        self._in_flight = threading.BoundedSemaphore(self.max_in_flight)
+        self._aborted = threading.Event()
+        self._started_at: Optional[float] = None
+        self._completed: Dict[int, _UnitState] = {}  # Finished images waiting for an earlier one
+        self._next_index = 0
+        self._results: Dict[str, List[AugmentationResult]] = {}  # Only kept without an on_image_processed
+        self._error: Optional[Exception] = None
+
+    # Stages
+
+    def _load(self, state: _UnitState) -> None:
+        if self.transform_pool is not None:
+            # Worker processes decode the source themselves
+            self._queues["transform"].put((state, None, None))
+            return
+        started = time.perf_counter()
+        try:
+            image_path = state.unit["image_path"]
+            image, original_dims = self.engine._load_working_image(image_path, state.unit["transformation_configs"])
+            nbytes = os.path.getsize(image_path)
+        except Exception as e:
+            logger.error(f"Failed to load image {state.unit['image_path']}: {str(e)}")
+            self.stats["load"].add(time.perf_counter() - started, failed=True)
+            state.failed = True
+            self._done.put(state)
+            return
+        self.stats["load"].add(time.perf_counter() - started, nbytes)
+        self._queues["transform"].put((state, image, original_dims))
+
+    def _transform(self, item: Tuple[_UnitState, Any, Tuple[int, int]]) -> None:
+        state, image, original_dims = item
+        if self.transform_pool is not None:
+            self._transform_in_pool(state)
+            return
+        outputs = 0
+        busy = 0.0
+        started = time.perf_counter()
+        base_geometry = self.engine.decode_geometry(image, original_dims)
+        transformed = self.engine.transform_fan_out(image, state.unit["transformation_configs"], base_geometry)
+        for config_data, augmented_image, geometry in transformed:
+            busy += time.perf_counter() - started
+            self._queues["encode"].put((state, original_dims, config_data, augmented_image, geometry))
+            outputs += 1
+            started = time.perf_counter()
+        busy += time.perf_counter() - started
+        self.stats["transform"].add(busy)
+        if state.finish_outputs(outputs):
+            self._done.put(state)
+
+    def _transform_in_pool(self, state: _UnitState) -> None:
+        """Decode, transform and encode a source in a worker process, then queue its outputs for writing"""
+        started = time.perf_counter()
+        unit = state.unit
+        try:
+            original_dims, outputs = self.transform_pool.submit(
+                transform_in_release_worker, unit["image_path"], unit["transformation_configs"],
+                unit["dataset_split"], unit.get("output_filename")
+            ).result()
+        except BrokenProcessPool as e:
+            # A worker died (killed, out of memory); every later submit fails the same way
+            logger.error(f"Release worker pool is broken, failing {unit['image_path']}: {str(e)}")
+            self.stats["transform"].add(time.perf_counter() - started, failed=True)
+            self._fail("transform", (state,))
+            return
+        except Exception as e:
+            logger.error(f"Failed to process image {unit['image_path']}: {str(e)}")
+            self.stats["transform"].add(time.perf_counter() - started, failed=True)
+            self._fail("transform", (state,))
+            return
+        self.stats["transform"].add(time.perf_counter() - started)
+        for config_data, output_path, data, augmented_dims, geometry in outputs:
+            self._queues["write"].put((state, original_dims, config_data, output_path, data, augmented_dims, geometry))
+        if state.finish_outputs(len(outputs)):
+            self._done.put(state)
+
+    def _encode(self, item: Tuple[_UnitState, Tuple[int, int], Dict[str, Any], Any, Any]) -> None:
+        state, original_dims, config_data, augmented_image, geometry = item
+        started = time.perf_counter()
+        try:
+            output_path = self.engine.augmented_output_path(
+                state.unit["image_path"], config_data["config_id"], state.unit["dataset_split"],
+                self.output_format, state.unit.get("output_filename")
+            )
+            data = self.engine.encode_image(augmented_image, output_path, self.output_format)
+            augmented_dims = (augmented_image.shape[1], augmented_image.shape[0]) \
+                if hasattr(augmented_image, "shape") else augmented_image.size
+        except Exception as e:
+            logger.error(f"Failed to encode config {config_data.get('config_id', 'unknown')}: {str(e)}")
+            self.stats["encode"].add(time.perf_counter() - started, failed=True)
+            if state.finish_output(None):
+                self._done.put(state)
+            return
+        self.stats["encode"].add(time.perf_counter() - started, len(data))
+        self._queues["write"].put((state, original_dims, config_data, output_path, data, augmented_dims, geometry))
+
+    def _write(self, item: Tuple[_UnitState, Tuple[int, int], Dict[str, Any], Any, bytes, Tuple[int, int], Any]) -> None:
+        state, original_dims, config_data, output_path, data, augmented_dims, geometry = item
+        started = time.perf_counter()
+        result = None
+        try:
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = output_path.with_name(f".{output_path.name}.tmp")
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, output_path)
+            result = self.engine.build_augmentation_result(
+                output_path, config_data.get("transformations", {}) or {}, config_data["config_id"],
+                original_dims, augmented_dims, state.unit.get("annotations"), geometry
+            )
+        except Exception as e:
+            logger.error(f"Failed to write {output_path}: {str(e)}")
+        self.stats["write"].add(time.perf_counter() - started, len(data) if result else 0, failed=result is None)
+        if state.finish_output(result):
+            self._done.put(state)
+
+    # Plumbing
+
+    def _fail(self, stage: str, item: Any) -> None:
+        """
+        Mark an item's source image failed and deliver it exactly once
+
+        Load and transform items carry a whole image. Encode and write items
+        carry one of its configs, so the image is only delivered with its last
+        output, like a normal finish.
+        """
+        state = item if isinstance(item, _UnitState) else item[0]
+        state.failed = True
+        if isinstance(item, _UnitState) or stage == "transform":
+            self._done.put(state)
+        elif state.finish_output(None):
+            self._done.put(state)
+
+    def _worker(self, stage: str) -> None:
+        source = self._queues[stage]
+        handler = self._handlers[stage]
+        while True:
+            item = source.get()
+            if item is _END:
+                return
+            if self._aborted.is_set():
+                self._fail(stage, item)
+                continue
+            try:
+                handler(item)
+            except Exception as e:
+                # Handlers report their own failures; this keeps a bug from stalling the release
+                logger.error(f"Release pipeline {stage} stage failed: {str(e)}")
+                self._fail(stage, item)
+
+    def _start_stages(self) -> Dict[str, List[threading.Thread]]:
+        threads = {
+            stage: [threading.Thread(target=self._worker, args=(stage,), daemon=True,
+                                     name=f"release-{stage}-{i}")
+                    for i in range(self.stats[stage].workers)]
+            for stage in self._queues
+        }
+        for stage_threads in threads.values():
+            for thread in stage_threads:
+                thread.start()
+        return threads
+
+    def _stop_stages(self, threads: Dict[str, List[threading.Thread]]) -> None:
+        """Shut the stages down in order, each after the one feeding it"""
+        for stage, stage_threads in threads.items():
+            for _ in stage_threads:
+                self._queues[stage].put(_END)
+            for thread in stage_threads:
+                thread.join()
+
+    def _deliver(self, state: _UnitState,
+                 on_image_processed: Optional[Callable[[str, List[AugmentationResult]], None]],
+                 on_stats: Optional[Callable[[Dict[str, Any]], None]]) -> None:
+        """Take one finished image and hand every image that is now next in input order to the caller"""
+        self._completed[state.index] = state
+        while self._next_index in self._completed:
+            state = self._completed.pop(self._next_index)
+            self._next_index += 1
+            self._in_flight.release()
+            if self._error is not None or state.failed:
+                continue
+            # Encoders and writers finish out of order; keep the configs' order
+            order = {config.get("config_id"): i for i, config in enumerate(state.unit["transformation_configs"])}
+            state.results.sort(key=lambda result: order.get(result.config_id, len(order)))
+            try:
+                if on_image_processed:
+                    on_image_processed(state.unit["image_path"], state.results)
+                else:
+                    self._results[state.unit["image_path"]] = state.results
+                if on_stats:
+                    on_stats(self.stats_snapshot())
+            except Exception as e:
+                # Stop feeding and let the stages drain before re-raising
+                self._error = e
+                self._aborted.set()
+
+    def stats_snapshot(self) -> Dict[str, Any]:
+        """Per-stage throughput counters since the pipeline started"""
+        elapsed = time.perf_counter() - (self._started_at or time.perf_counter())
+        return {
+            "elapsed_seconds": round(elapsed, 2),
+            "in_flight_limit": self.max_in_flight,
+            "stages": {
+                name: stats.snapshot(elapsed, self._queues[name].qsize())
+                for name, stats in self.stats.items()
+            }
+        }
+
+    def run(self, work_units: Iterable[Dict[str, Any]],
+            on_image_processed: Optional[Callable[[str, List[AugmentationResult]], None]] = None,
+            on_stats: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, List[AugmentationResult]]:
+        """
+        Run every work unit through the stages
+
+        Args:
+            work_units: Units as built by image_generator._build_release_work_units
+                        (any iterable; a generator is consumed lazily)
+            on_image_processed: Called with (image_path, results) as each source image
+                                completes, in input order, on the calling thread
+            on_stats: Called with stats_snapshot() after each delivered image
+
+        Returns:
+            Dictionary mapping image_path to list of AugmentationResult objects
+            (empty when on_image_processed is given: results go to it and are not kept)
+        """
+        self._started_at = time.perf_counter()
+        threads = self._start_stages()
+
+        count = 0
+        feed_error = None
+        try:
+            for index, unit in enumerate(work_units):
+                # Backpressure: deliver finished images until one frees a slot
+                while not self._in_flight.acquire(blocking=False):
+                    self._deliver(self._done.get(), on_image_processed, on_stats)
+                if self._aborted.is_set():
+                    self._in_flight.release()
+                    break
+                self._queues["load"].put(_UnitState(index, unit))
+                count += 1
+        except Exception as e:
+            # Images already fed are still finished and delivered
+            logger.error(f"Failed to enumerate release work units: {str(e)}")
+            feed_error = e
+
+        while self._next_index < count:
+            self._deliver(self._done.get(), on_image_processed, on_stats)
+        self._stop_stages(threads)
+        if self._error is not None:
+            raise self._error
+        if feed_error is not None:
+            raise feed_error
+
+        stats = self.stats_snapshot()
+        logger.info(f"Release pipeline finished in {stats['elapsed_seconds']}s: " + ", ".join(
+            f"{name} {stage['items_per_second']}/s ({stage['utilization']:.0%} busy)"
+            for name, stage in stats["stages"].items()
+        ))
+        return self._results
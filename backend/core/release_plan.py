@@ -0,0 +1,241 @@
+"""
+Release Plan for Auto-Labeling Tool Release Pipeline
+Transformation schema compiled once per release version and shared by every image
+"""
+
+import json
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Tuple
+
+from core.transformation_schema import TransformationSchema, create_schema_from_database
+from core.transformation_config import is_dual_value_transformation, generate_auto_value, calculate_max_images_per_original
+from core.image_generator import resolve_dual_value_parameters
+from core.random_state import derive_rng, derive_seed
+from database.models import ImageTransformation
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Compiled plans kept in memory (least recently used plans are dropped first)
+RELEASE_PLAN_CACHE_SIZE = 32
+
+
+@dataclass
+class PlanSlot:
+    """
+    One combination of a release plan, resolved once and shared by every image that samples it
+
+    Slots hold resolved parameters rather than bound transform callables: the
+    configs built from them are pickled to release worker processes, and the
+    engine plans each chain as a whole (fused warps, shared prefixes).
+    """
+    position: int
+    transformations: Dict[str, Any]  # As stored (may hold dual-value parameters)
+    resolved_transformations: Dict[str, Any]  # Single values, ready for the transformer
+    dual_value_count: int
+
+
+class ReleasePlan:
+    """
+    Transformation schema of one release version, compiled once
+
+    The schema, its combination pool, the resolved parameters of every sampled
+    slot and the UI summaries are computed on first use and reused, so the per
+    image work of a release is sampling slot positions and looking them up.
+    """
+
+    def __init__(self, release_version: str, transformation_records: List[Dict[str, Any]],
+                 fingerprint: Optional[str] = None):
+        self.release_version = release_version
+        self.transformation_records = transformation_records
+        self.fingerprint = fingerprint or release_plan_fingerprint(transformation_records)
+        self.schema: TransformationSchema = create_schema_from_database(transformation_records)
+        self.has_dual_value = self.schema.has_dual_value_transformations()
+        self._slots: Dict[int, PlanSlot] = {}
+        self._max_images: Optional[Dict[str, Any]] = None
+        self._priority_preview: Optional[Dict[str, Any]] = None
+
+    def validate(self) -> None:
+        """Raise ValueError if the schema cannot generate a release"""
+        is_valid, errors = self.schema.validate_configuration()
+        if not is_valid:
+            raise ValueError(f"Invalid schema configuration: {errors}")
+
+    def slot(self, position: int) -> PlanSlot:
+        """Compiled slot for a position in the schema's combination pool"""
+        slot = self._slots.get(position)
+        if slot is None:
+            transformations = self.schema.combination_pool()[position]
+            slot = PlanSlot(
+                position=position,
+                transformations=transformations,
+                resolved_transformations=resolve_dual_value_parameters(transformations),
+                dual_value_count=sum(1 for tool_type in transformations if is_dual_value_transformation(tool_type))
+            )
+            self._slots[position] = slot
+        return slot
+
+    def configs_for_image(self, image_id: str, images_per_original: int = 4,
+                          release_seed: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Transformation configs for one image (same shape as TransformationSchema produces)
+
+        With a release seed, the sampled slots and each config's "random_seed"
+        (used for its random transforms) depend only on (release seed, image id,
+        config slot), not on which process handles the image or in what order.
+        """
+        rng = derive_rng(release_seed, image_id, "sampling") if release_seed is not None else None
+        configs = []
+        for i, position in enumerate(self.schema.sample_combination_positions(rng, images_per_original)):
+            slot = self.slot(position)
+            configs.append({
+                "config_id": f"{image_id}_config_{i+1}",
+                "image_id": image_id,
+                "transformations": slot.transformations,
+                "resolved_transformations": slot.resolved_transformations,
+                "order": i + 1,
+                "random_seed": derive_seed(release_seed, image_id, i + 1),
+                "priority_type": (TransformationSchema.priority_type_for(slot.dual_value_count, i)
+                                  if self.has_dual_value else "single_value")
+            })
+        return configs
+
+    def max_images(self) -> Dict[str, Any]:
+        """Minimum/maximum images per original for UI display"""
+        if self._max_images is None:
+            self._max_images = calculate_max_images_per_original([
+                {
+                    "transformation_type": record["transformation_type"],
+                    "enabled": record.get("is_enabled", True),
+                    "parameters": record["parameters"]
+                }
+                for record in self.transformation_records
+            ])
+        return dict(self._max_images)
+
+    def priority_preview(self) -> Dict[str, Any]:
+        """Priority order of the dual-value transformations (user values, then auto values)"""
+        if self._priority_preview is None:
+            dual_value_records = [
+                record for record in self.transformation_records
+                if is_dual_value_transformation(record["transformation_type"])
+            ]
+            priority_order = []
+
+            # Priority 1: User values
+            for i, record in enumerate(dual_value_records, 1):
+                priority_order.append({
+                    "priority": 1,
+                    "order": i,
+                    "type": "user_value",
+                    "transformation": record["transformation_type"],
+                    "parameters": record["parameters"],
+                    "description": f"User selected {record['transformation_type']}"
+                })
+
+            # Priority 2: Auto values
+            for i, record in enumerate(dual_value_records, len(dual_value_records) + 1):
+                auto_params = {}
+                for param_name, param_value in record["parameters"].items():
+                    if isinstance(param_value, dict) and 'user_value' in param_value:
+                        auto_params[param_name] = param_value.get('auto_value',
+                                                               generate_auto_value(record["transformation_type"], param_value['user_value']))
+                    else:
+                        auto_params[param_name] = generate_auto_value(record["transformation_type"], param_value)
+
+                priority_order.append({
+                    "priority": 2,
+                    "order": i,
+                    "type": "auto_value",
+                    "transformation": record["transformation_type"],
+                    "parameters": auto_params,
+                    "description": f"Auto-generated {record['transformation_type']} (opposite value)"
+                })
+
+            self._priority_preview = {
+                "release_version": self.release_version,
+                "has_dual_value": bool(dual_value_records),
+                "priority_order": priority_order,
+                "total_guaranteed_images": len(priority_order)
+            }
+        return dict(self._priority_preview)
+
+
+def load_plan_records(db: Session, release_version: str) -> List[Dict[str, Any]]:
+    """
+    Enabled transformations of a release version, in the record format plans are compiled from
+
+    Release generation and the preview endpoints both load records here, so
+    they compile (and share) the same plan. Releases use the version's
+    COMPLETED transformations; until a version has any, its pending ones are
+    what a release of it will use, so previews see those.
+    """
+    transformations = db.query(ImageTransformation).filter(
+        ImageTransformation.release_version == release_version,
+        ImageTransformation.is_enabled == True
+    ).order_by(ImageTransformation.order_index).all()
+    if any(t.status == "COMPLETED" for t in transformations):
+        transformations = [t for t in transformations if t.status == "COMPLETED"]
+
+    return [
+        {
+            "id": t.id,
+            "transformation_type": t.transformation_type,
+            "parameters": t.parameters if isinstance(t.parameters, dict) else json.loads(t.parameters),
+            "is_enabled": t.is_enabled,
+            "order_index": t.order_index,
+            "release_version": t.release_version,
+            "status": t.status
+        }
+        for t in transformations
+    ]
+
+
+def release_plan_fingerprint(transformation_records: List[Dict[str, Any]]) -> str:
+    """Hash of everything in the transformation records that changes the plan"""
+    payload = [
+        [record["transformation_type"], record["parameters"],
+         record.get("is_enabled", True), record.get("order_index", 0)]
+        for record in transformation_records
+    ]
+    return hashlib.sha1(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+_plan_cache: "OrderedDict[Tuple[str, str], ReleasePlan]" = OrderedDict()
+_plan_cache_lock = threading.Lock()
+
+
+def get_release_plan(release_version: str, transformation_records: List[Dict[str, Any]]) -> ReleasePlan:
+    """
+    Compiled plan for a release version, shared by releases and the preview endpoints
+
+    Plans are cached per (version, fingerprint), so editing a transformation
+    (type, parameters, enabled flag or order) compiles a new plan.
+    """
+    key = (release_version, release_plan_fingerprint(transformation_records))
+    with _plan_cache_lock:
+        plan = _plan_cache.get(key)
+        if plan is not None:
+            _plan_cache.move_to_end(key)
+            return plan
+
+    plan = ReleasePlan(release_version, transformation_records, key[1])
+    logger.info(f"Compiled release plan for version {release_version} ({len(transformation_records)} transformations)")
+
+    with _plan_cache_lock:
+        _plan_cache[key] = plan
+        while len(_plan_cache) > RELEASE_PLAN_CACHE_SIZE:
+            _plan_cache.popitem(last=False)
+    return plan
+
+
+def invalidate_release_plan(release_version: Optional[str] = None) -> None:
+    """Drop the cached plans of one release version (or every plan)"""
+    with _plan_cache_lock:
+        for key in list(_plan_cache):
+            if release_version is None or key[0] == release_version:
+                del _plan_cache[key]
@@ -4,11 +4,11 @@ Handles transformation tool combinations and sampling strategies
 """
 
 import itertools
-import random
 import logging
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Iterator, Sequence, Union
 from dataclasses import dataclass
 import json
+import numpy as np
 
 # Import dual-value transformation functions
 from core.transformation_config import (
@@ -35,6 +35,55 @@ class SamplingConfig:
     fixed_combinations: int = 2  # Always include first N combinations
     random_seed: Optional[int] = None
 
+def _sample_positions(rng: np.random.Generator, population: int, count: int) -> List[int]:
+    """`count` distinct positions out of range(population), in draw order (all of them if fewer)"""
+    count = min(count, population)
+    if count <= 0:
+        return []
+    return rng.choice(population, size=count, replace=False).tolist()
+
+
+class CombinationSpace(Sequence):
+    """
+    Lazy, index-addressable view of all non-empty transformation subsets
+    
+    Combination `index` is the subset whose bitmask is `index + 1` (bit j set =
+    j-th transformation included), which is the order the combinations were
+    always generated in. Nothing is materialized: a combination dict is built
+    only when its index is read, so sampling k of 2**n - 1 combinations costs
+    O(k * n) instead of O(2**n * n).
+    """
+    
+    def __init__(self, transformations: List[TransformationConfig]):
+        self.transformations = list(transformations)
+        
+    def __len__(self) -> int:
+        return 2 ** len(self.transformations) - 1
+    
+    def mask(self, index: int) -> int:
+        """Bitmask of the transformations in combination `index`"""
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f"Combination index {index} out of range")
+        return index + 1
+    
+    def __getitem__(self, index: Union[int, slice]) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        
+        mask = self.mask(index)
+        return {
+            transformation.tool_type: transformation.parameters
+            for j, transformation in enumerate(self.transformations)
+            if mask & (1 << j)
+        }
+    
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for index in range(len(self)):
+            yield self[index]
+
+
 class TransformationSchema:
     """
     Manages transformation combinations and sampling for release generation
@@ -44,6 +93,8 @@ class TransformationSchema:
     def __init__(self):
         self.transformations: List[TransformationConfig] = []
         self.sampling_config = SamplingConfig()
+        # Combination spaces depend only on the transformations; built once per release
+        self._combination_cache: Dict[str, Any] = {}
         
     def add_transformation(self, tool_type: str, parameters: Dict[str, Any], 
                           enabled: bool = True, order_index: int = 0) -> None:
@@ -55,6 +106,7 @@ class TransformationSchema:
             order_index=order_index
         )
         self.transformations.append(config)
+        self._combination_cache.clear()
         logger.info(f"Added transformation: {tool_type} with parameters: {parameters}")
     
     def load_from_database_records(self, db_transformations: List[Dict]) -> None:
@@ -81,65 +133,84 @@ class TransformationSchema:
         
         # Sort by order_index
         self.transformations.sort(key=lambda x: x.order_index)
+        self._combination_cache.clear()
         logger.info(f"Loaded {len(self.transformations)} transformations from database")
         
         # Calculate and log combination count
         combination_count = self.get_combination_count_estimate()
         logger.info(f"Maximum possible combinations: {combination_count}")
     
+    def single_value_combination_space(self) -> Sequence[Dict[str, Any]]:
+        """
+        Lazy space of all combinations of single-value transformations
+        
+        Built once and reused for every image until the transformations change.
+        """
+        if 'single_value' not in self._combination_cache:
+            enabled_transformations = [t for t in self.transformations if t.enabled]
+            if not enabled_transformations:
+                logger.warning("No enabled transformations found")
+                self._combination_cache['single_value'] = [{}]  # Empty config for no transformations
+            else:
+                # Every subset (2^n - 1 of them) is addressable by index, none is stored
+                space = CombinationSpace(enabled_transformations)
+                logger.info(f"Single-value combination space: {len(space)} combinations")
+                self._combination_cache['single_value'] = space
+        return self._combination_cache['single_value']
+    
     def generate_single_value_combinations(self) -> List[Dict[str, Any]]:
         """
         Generate all possible combinations from single-value transformations
         Phase 1: Uses current single-value system
-        """
-        if not self.transformations:
-            logger.warning("No transformations available for combination generation")
-            return [{}]  # Return empty config for no transformations
-        
-        # Get enabled transformations only
-        enabled_transformations = [t for t in self.transformations if t.enabled]
-        
-        if not enabled_transformations:
-            logger.warning("No enabled transformations found")
-            return [{}]
-        
-        # For single-value system, each transformation contributes one value
-        # Generate combinations by including/excluding each transformation
-        combinations = []
-        
-        # Generate all possible combinations (2^n where n is number of transformations)
-        for i in range(1, 2 ** len(enabled_transformations)):
-            combination = {}
-            
-            for j, transformation in enumerate(enabled_transformations):
-                # Check if this transformation is included in current combination
-                if i & (1 << j):
-                    combination[transformation.tool_type] = transformation.parameters
-            
-            combinations.append(combination)
         
+        Materializes the whole space; release generation samples from
+        single_value_combination_space() instead.
+        """
+        combinations = list(self.single_value_combination_space())
         logger.info(f"Generated {len(combinations)} single-value combinations")
         return combinations
     
-    def generate_dual_value_combinations(self) -> List[Dict[str, Any]]:
+    def generate_dual_value_combinations(self, rng: Optional[np.random.Generator] = None) -> List[Dict[str, Any]]:
         """
         Generate combinations using dual-value priority order system
         
         Priority Order:
         1st: User Selected Values (individual transformations)
         2nd: Auto-Generated Values (opposite values)
-        3rd: Random Combinations (fill remaining slots)
+        3rd: Random Combinations (fill remaining slots, drawn from `rng`)
         """
-        if not self.transformations:
-            logger.warning("No transformations available for dual-value combination generation")
-            return [{}]
+        rng = rng or self._sampling_rng()
+        priority_combinations, random_candidates = self._dual_value_combination_pool()
+        combinations = [dict(combination) for combination in priority_combinations]
+        
+        # PRIORITY 3: Random Combinations (if more images needed)
+        if len(combinations) < self.sampling_config.images_per_original:
+            remaining_slots = self.sampling_config.images_per_original - len(combinations)
+            combinations.extend(
+                dict(random_candidates[position]) for position in
+                _sample_positions(rng, len(random_candidates), remaining_slots)
+            )
+        
+        logger.debug(f"Generated {len(combinations)} dual-value combinations with priority order")
+        return combinations
+    
+    def _dual_value_combination_pool(self) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Priority 1 + 2 combinations and the Priority 3 candidates, built once per release
+        
+        Returns:
+            (user and auto value combinations in priority order, random combination candidates)
+        """
+        if 'dual_value' in self._combination_cache:
+            return self._combination_cache['dual_value']
         
         # Get enabled transformations only
         enabled_transformations = [t for t in self.transformations if t.enabled]
         
         if not enabled_transformations:
             logger.warning("No enabled transformations found")
-            return [{}]
+            self._combination_cache['dual_value'] = ([{}], [])
+            return self._combination_cache['dual_value']
         
         combinations = []
         
@@ -191,75 +262,77 @@ class TransformationSchema:
             combinations.append(combination)
             logger.debug(f"Added auto value combination: {combination}")
         
-        # PRIORITY 3: Random Combinations (if more images needed)
-        logger.info("Generating Priority 3: Random Combinations")
-        if len(combinations) < self.sampling_config.images_per_original:
-            remaining_slots = self.sampling_config.images_per_original - len(combinations)
-            
-            # Generate combinations of both user and auto values
-            all_values = []
-            
-            # Collect all user and auto values
-            for transformation in dual_value_transformations:
-                user_params = transformation.parameters.copy()
-                auto_params = {}
-                
-                for param_name, param_value in transformation.parameters.items():
-                    if isinstance(param_value, dict) and 'user_value' in param_value:
-                        user_params[param_name] = param_value['user_value']
-                        auto_params[param_name] = param_value.get('auto_value', 
-                                                               generate_auto_value(transformation.tool_type, param_value['user_value']))
-                    else:
-                        auto_params[param_name] = generate_auto_value(transformation.tool_type, param_value)
-                
-                all_values.append((transformation.tool_type, user_params, auto_params))
-            
-            # Generate combinations
-            additional_combinations = []
-            
-            # Both user values combination
-            if len(dual_value_transformations) >= 2:
-                both_user_combo = {}
-                for tool_type, user_params, _ in all_values:
-                    both_user_combo[tool_type] = user_params
-                additional_combinations.append(both_user_combo)
-            
-            # Both auto values combination
-            if len(dual_value_transformations) >= 2:
-                both_auto_combo = {}
-                for tool_type, _, auto_params in all_values:
-                    both_auto_combo[tool_type] = auto_params
-                additional_combinations.append(both_auto_combo)
+        # PRIORITY 3 candidates: combinations of both user and auto values
+        logger.info("Generating Priority 3 candidates: Random Combinations")
+        all_values = []
+        
+        # Collect all user and auto values
+        for transformation in dual_value_transformations:
+            user_params = transformation.parameters.copy()
+            auto_params = {}
             
-            # Mixed combinations (user + auto)
-            if len(dual_value_transformations) >= 2:
-                for i, (tool_type1, user_params1, auto_params1) in enumerate(all_values):
-                    for j, (tool_type2, user_params2, auto_params2) in enumerate(all_values):
-                        if i != j:
-                            mixed_combo = {
-                                tool_type1: user_params1,
-                                tool_type2: auto_params2
-                            }
-                            additional_combinations.append(mixed_combo)
+            for param_name, param_value in transformation.parameters.items():
+                if isinstance(param_value, dict) and 'user_value' in param_value:
+                    user_params[param_name] = param_value['user_value']
+                    auto_params[param_name] = param_value.get('auto_value', 
+                                                           generate_auto_value(transformation.tool_type, param_value['user_value']))
+                else:
+                    auto_params[param_name] = generate_auto_value(transformation.tool_type, param_value)
             
-            # Add random combinations up to the limit
-            random.shuffle(additional_combinations)
-            combinations.extend(additional_combinations[:remaining_slots])
-        
-        logger.info(f"Generated {len(combinations)} dual-value combinations with priority order")
-        return combinations
+            all_values.append((transformation.tool_type, user_params, auto_params))
+        
+        # Generate combinations
+        additional_combinations = []
+        
+        # Both user values combination
+        if len(dual_value_transformations) >= 2:
+            both_user_combo = {}
+            for tool_type, user_params, _ in all_values:
+                both_user_combo[tool_type] = user_params
+            additional_combinations.append(both_user_combo)
+        
+        # Both auto values combination
+        if len(dual_value_transformations) >= 2:
+            both_auto_combo = {}
+            for tool_type, _, auto_params in all_values:
+                both_auto_combo[tool_type] = auto_params
+            additional_combinations.append(both_auto_combo)
+        
+        # Mixed combinations (user + auto)
+        if len(dual_value_transformations) >= 2:
+            for i, (tool_type1, user_params1, auto_params1) in enumerate(all_values):
+                for j, (tool_type2, user_params2, auto_params2) in enumerate(all_values):
+                    if i != j:
+                        mixed_combo = {
+                            tool_type1: user_params1,
+                            tool_type2: auto_params2
+                        }
+                        additional_combinations.append(mixed_combo)
+        
+        logger.info(f"Dual-value combination pool: {len(combinations)} priority combinations, "
+                    f"{len(additional_combinations)} random candidates")
+        self._combination_cache['dual_value'] = (combinations, additional_combinations)
+        return self._combination_cache['dual_value']
+    
+    def _sampling_rng(self) -> np.random.Generator:
+        """Generator for callers that pass none (seeded from sampling_config.random_seed if set)"""
+        return np.random.default_rng(self.sampling_config.random_seed)
     
-    def apply_intelligent_sampling(self, combinations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def apply_intelligent_sampling(self, combinations: Sequence[Dict[str, Any]],
+                                   rng: Optional[np.random.Generator] = None,
+                                   images_per_original: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Apply intelligent sampling to reduce combination count
-        """
-        if len(combinations) <= self.sampling_config.images_per_original:
-            return combinations
         
-        # Set random seed for reproducible results
-        if self.sampling_config.random_seed:
-            random.seed(self.sampling_config.random_seed)
+        Works on positions, so a lazy CombinationSpace is never materialized.
+        Random picks are drawn from `rng`; the global random state is never touched.
+        images_per_original overrides the sampling config's count for this call.
+        """
+        images_per_original = images_per_original or self.sampling_config.images_per_original
+        if len(combinations) <= images_per_original:
+            return list(combinations)
         
+        rng = rng or self._sampling_rng()
         sampled = []
         
         # Always include fixed combinations (first N)
@@ -267,53 +340,93 @@ class TransformationSchema:
         sampled.extend(combinations[:fixed_count])
         
         # Randomly sample remaining combinations
-        remaining_combinations = combinations[fixed_count:]
-        remaining_needed = self.sampling_config.images_per_original - fixed_count
+        remaining_positions = range(fixed_count, len(combinations))
+        remaining_needed = images_per_original - fixed_count
         
-        if remaining_needed > 0 and remaining_combinations:
-            additional_samples = random.sample(
-                remaining_combinations, 
-                min(remaining_needed, len(remaining_combinations))
-            )
-            sampled.extend(additional_samples)
+        if remaining_needed > 0 and remaining_positions:
+            additional_positions = _sample_positions(rng, len(remaining_positions), remaining_needed)
+            sampled.extend(combinations[remaining_positions[position]] for position in additional_positions)
         
         logger.info(f"Sampled {len(sampled)} combinations from {len(combinations)} total")
         return sampled
     
-    def generate_transformation_configs_for_image(self, image_id: str) -> List[Dict[str, Any]]:
+    def has_dual_value_transformations(self) -> bool:
+        """Whether any enabled transformation uses the dual-value system"""
+        if 'has_dual_value' not in self._combination_cache:
+            self._combination_cache['has_dual_value'] = any(
+                is_dual_value_transformation(t.tool_type)
+                for t in self.transformations if t.enabled
+            )
+        return self._combination_cache['has_dual_value']
+    
+    def combination_pool(self) -> Sequence[Dict[str, Any]]:
         """
-        Generate transformation configurations for a single image
-        Returns list of configs to apply to the image
+        Every combination a sampled config can point at, built once per release
+        
+        Dual-value: priority combinations followed by the random candidates.
+        Single-value: the lazy space of all transformation subsets.
         """
-        # Check if we have dual-value transformations
-        has_dual_value_transformations = any(
-            is_dual_value_transformation(t.tool_type) 
-            for t in self.transformations if t.enabled
-        )
+        if not self.has_dual_value_transformations():
+            return self.single_value_combination_space()
         
-        # Generate combinations based on system type
-        if has_dual_value_transformations:
-            logger.info(f"Using dual-value combination generation for image {image_id}")
-            all_combinations = self.generate_dual_value_combinations()
+        if 'dual_value_pool' not in self._combination_cache:
+            priority_combinations, random_candidates = self._dual_value_combination_pool()
+            self._combination_cache['dual_value_pool'] = priority_combinations + random_candidates
+        return self._combination_cache['dual_value_pool']
+    
+    def sample_combination_positions(self, rng: Optional[np.random.Generator] = None,
+                                     images_per_original: Optional[int] = None) -> List[int]:
+        """
+        Positions in combination_pool() chosen for one image
+        
+        Follows the dual-value priority order and the sampling strategy, but only
+        ever touches positions, so no combination is built to be thrown away.
+        Every random pick is drawn from `rng`, so a per-image generator makes the
+        choice reproducible and independent of the order images are processed in.
+        images_per_original overrides the sampling config's count for this call
+        only, so callers sharing a schema never change each other's sampling.
+        """
+        rng = rng or self._sampling_rng()
+        images_per_original = images_per_original or self.sampling_config.images_per_original
+        if self.has_dual_value_transformations():
+            priority_combinations, random_candidates = self._dual_value_combination_pool()
+            positions = list(range(len(priority_combinations)))
+            
+            # PRIORITY 3: Random Combinations (if more images needed)
+            if len(positions) < images_per_original:
+                remaining_slots = images_per_original - len(positions)
+                positions.extend(
+                    len(priority_combinations) + candidate for candidate in
+                    _sample_positions(rng, len(random_candidates), remaining_slots)
+                )
         else:
-            logger.info(f"Using single-value combination generation for image {image_id}")
-            all_combinations = self.generate_single_value_combinations()
+            positions = range(len(self.single_value_combination_space()))
         
         # Apply sampling strategy
         if self.sampling_config.strategy == "intelligent":
-            sampled_combinations = self.apply_intelligent_sampling(all_combinations)
+            return self.apply_intelligent_sampling(positions, rng, images_per_original)
         elif self.sampling_config.strategy == "random":
-            sampled_combinations = random.sample(
-                all_combinations, 
-                min(self.sampling_config.images_per_original, len(all_combinations))
-            )
+            return [
+                positions[position] for position in
+                _sample_positions(rng, len(positions), images_per_original)
+            ]
         elif self.sampling_config.strategy == "uniform":
             # Take evenly spaced combinations
-            step = max(1, len(all_combinations) // self.sampling_config.images_per_original)
-            sampled_combinations = all_combinations[::step][:self.sampling_config.images_per_original]
+            step = max(1, len(positions) // images_per_original)
+            return list(positions[::step][:images_per_original])
         else:
             # Default to intelligent
-            sampled_combinations = self.apply_intelligent_sampling(all_combinations)
+            return self.apply_intelligent_sampling(positions, rng, images_per_original)
+    
+    def generate_transformation_configs_for_image(self, image_id: str,
+                                                  rng: Optional[np.random.Generator] = None) -> List[Dict[str, Any]]:
+        """
+        Generate transformation configurations for a single image
+        Returns list of configs to apply to the image
+        """
+        has_dual_value_transformations = self.has_dual_value_transformations()
+        combinations = self.combination_pool()
+        sampled_combinations = [dict(combinations[position]) for position in self.sample_combination_positions(rng)]
         
         # Add metadata to each configuration
         configs_with_metadata = []
@@ -327,13 +440,17 @@ class TransformationSchema:
             }
             configs_with_metadata.append(config_with_metadata)
         
-        logger.info(f"Generated {len(configs_with_metadata)} transformation configs for image {image_id}")
+        logger.debug(f"Generated {len(configs_with_metadata)} transformation configs for image {image_id}")
         return configs_with_metadata
     
     def _get_priority_type(self, config: Dict[str, Any], order: int) -> str:
         """Determine the priority type of a configuration"""
         dual_value_count = sum(1 for tool_type in config.keys() if is_dual_value_transformation(tool_type))
-        
+        return self.priority_type_for(dual_value_count, order)
+    
+    @staticmethod
+    def priority_type_for(dual_value_count: int, order: int) -> str:
+        """Priority type of a configuration with `dual_value_count` dual-value tools at `order`"""
         if dual_value_count == 1:
             # Single transformation - could be user or auto value
             if order < dual_value_count:
@@ -439,6 +556,7 @@ class TransformationSchema:
     def from_dict(self, data: Dict[str, Any]) -> None:
         """Load schema configuration from dictionary"""
         self.transformations.clear()
+        self._combination_cache.clear()
         
         for t_data in data.get("transformations", []):
             self.add_transformation(
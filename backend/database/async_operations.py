@@ -0,0 +1,227 @@
+"""
+Async database operations for the Auto-Labeling Tool
+Awaitable versions of the hot operations in database/operations.py, for async route handlers
+"""
+
+import random
+from sqlalchemy import select, func, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from typing import List, Optional, Dict, Any, Tuple
+from datetime import datetime
+
+from .models import Project, Dataset, Image, Annotation, Label
+from .operations import IMAGE_PAGE_ORDER, keyset_condition, keyset_page, keyset_columns
+
+
+async def keyset_paginate(db: AsyncSession, statement, order_columns: List[Any], limit: int,
+                          cursor: Optional[str] = None, offset: int = 0) -> Tuple[List[Any], Optional[str]]:
+    """Async operations.keyset_paginate for a select() statement"""
+    statement = statement.add_columns(*keyset_columns(order_columns)).order_by(*order_columns)
+    if cursor:
+        statement = statement.where(keyset_condition(order_columns, cursor))
+    elif offset:
+        statement = statement.offset(offset)
+
+    result = await db.execute(statement.limit(limit + 1))
+    return keyset_page(list(result.all()), order_columns, limit)
+
+
+class AsyncProjectOperations:
+    """Async read operations for Project model"""
+
+    @staticmethod
+    async def get_project(db: AsyncSession, project_id: Any) -> Optional[Project]:
+        """Get project by ID"""
+        return await db.scalar(select(Project).where(Project.id == project_id))
+
+
+class AsyncDatasetOperations:
+    """Async operations for Dataset model"""
+
+    @staticmethod
+    async def get_dataset(db: AsyncSession, dataset_id: str) -> Optional[Dataset]:
+        """Get dataset by ID"""
+        return await db.get(Dataset, dataset_id)
+
+    @staticmethod
+    async def update_dataset_stats(db: AsyncSession, dataset_id: str) -> Optional[Dataset]:
+        """Update dataset statistics"""
+        dataset = await db.get(Dataset, dataset_id)
+        if dataset:
+            total_images = await db.scalar(
+                select(func.count(Image.id)).where(Image.dataset_id == dataset_id)
+            )
+            labeled_images = await db.scalar(
+                select(func.count(Image.id)).where(and_(Image.dataset_id == dataset_id, Image.is_labeled == True))
+            )
+
+            dataset.total_images = total_images
+            dataset.labeled_images = labeled_images
+            dataset.unlabeled_images = total_images - labeled_images
+            dataset.updated_at = datetime.utcnow()
+            await db.commit()
+        return dataset
+
+
+class AsyncImageOperations:
+    """Async operations for Image model"""
+
+    @staticmethod
+    async def get_image(db: AsyncSession, image_id: str) -> Optional[Image]:
+        """Get image by ID"""
+        return await db.get(Image, image_id)
+
+    @staticmethod
+    async def get_images_by_dataset_page(
+        db: AsyncSession,
+        dataset_id: str,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        skip: int = 0,
+        labeled_only: bool = None,
+        split_section: Optional[str] = None
+    ) -> Tuple[List[Image], Optional[str]]:
+        """
+        One page of a dataset's images, oldest first
+
+        Returns:
+            (images, cursor of the next page or None)
+        """
+        statement = select(Image).where(Image.dataset_id == dataset_id)
+
+        if labeled_only is not None:
+            statement = statement.where(Image.is_labeled == labeled_only)
+        if split_section:
+            statement = statement.where(Image.split_section == split_section)
+
+        return await keyset_paginate(db, statement, IMAGE_PAGE_ORDER, limit, cursor, skip)
+
+    @staticmethod
+    async def get_project_images_page(
+        db: AsyncSession,
+        project_id: Any,
+        limit: int = 50,
+        offset: int = 0,
+        split_type: Optional[str] = None,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Tuple[Image, str]], int, Optional[str]]:
+        """
+        One page of a project's images, oldest first, with annotations loaded
+
+        Returns:
+            ([(image, dataset_name), ...], total matching images, next page cursor or None)
+        """
+        conditions = [Dataset.project_id == project_id]
+        if split_type:
+            conditions.append(Image.split_type == split_type)
+
+        total = await db.scalar(
+            select(func.count(Image.id)).join(Dataset, Image.dataset_id == Dataset.id).where(*conditions)
+        ) or 0
+        statement = select(Image, Dataset.name).join(Dataset, Image.dataset_id == Dataset.id).where(
+            *conditions
+        ).options(selectinload(Image.annotations))
+        rows, next_cursor = await keyset_paginate(
+            db, statement, IMAGE_PAGE_ORDER, limit, cursor, offset
+        )
+        return [(image, dataset_name) for image, dataset_name in rows], total, next_cursor
+
+    @staticmethod
+    async def update_image_status(
+        db: AsyncSession,
+        image_id: str,
+        is_labeled: bool = None,
+        is_auto_labeled: bool = None,
+        is_verified: bool = None
+    ) -> Optional[Image]:
+        """Update image labeling status"""
+        image = await db.get(Image, image_id)
+        if image:
+            if is_labeled is not None:
+                image.is_labeled = is_labeled
+            if is_auto_labeled is not None:
+                image.is_auto_labeled = is_auto_labeled
+            if is_verified is not None:
+                image.is_verified = is_verified
+
+            image.updated_at = datetime.utcnow()
+            await db.commit()
+
+            # Update dataset stats
+            await AsyncDatasetOperations.update_dataset_stats(db, image.dataset_id)
+        return image
+
+
+class AsyncAnnotationOperations:
+    """Async operations for Annotation model"""
+
+    @staticmethod
+    async def get_annotations_by_image(db: AsyncSession, image_id: str) -> List[Annotation]:
+        """Get all annotations for an image"""
+        result = await db.execute(select(Annotation).where(Annotation.image_id == image_id))
+        return list(result.scalars().all())
+
+    @staticmethod
+    async def create_annotations(db: AsyncSession, image_id: str,
+                                 annotations: List[Dict[str, Any]]) -> List[Annotation]:
+        """
+        Add annotations to an image in one transaction
+
+        Each dict holds the Annotation columns (class_name, class_id, x_min,
+        y_min, x_max, y_max, ...). The image's labeled status and its
+        dataset's stats are updated afterwards.
+        """
+        created = [Annotation(image_id=image_id, **annotation) for annotation in annotations]
+        db.add_all(created)
+        await db.commit()
+
+        await AsyncImageOperations.update_image_status(db, image_id, is_labeled=bool(created))
+        return created
+
+
+class AsyncLabelOperations:
+    """Async operations for Label model"""
+
+    @staticmethod
+    async def get_labels_by_project(db: AsyncSession, project_id: Any) -> List[Label]:
+        """Get all labels of a project"""
+        result = await db.execute(select(Label).where(Label.project_id == project_id))
+        return list(result.scalars().all())
+
+    @staticmethod
+    async def get_project_class_names(db: AsyncSession, project_id: Any) -> List[str]:
+        """Distinct annotation class names used anywhere in a project"""
+        result = await db.execute(
+            select(Annotation.class_name).distinct().join(
+                Image, Annotation.image_id == Image.id
+            ).join(
+                Dataset, Image.dataset_id == Dataset.id
+            ).where(Dataset.project_id == project_id)
+        )
+        return [class_name for class_name in result.scalars().all() if class_name]
+
+    @staticmethod
+    async def ensure_labels(db: AsyncSession, project_id: Any, class_names: List[str],
+                            colors: Optional[Dict[str, str]] = None) -> List[Label]:
+        """
+        Create the labels of class_names a project does not have yet
+
+        New labels get the color given in colors, or a random one.
+
+        Returns:
+            The labels created
+        """
+        existing = {label.name for label in await AsyncLabelOperations.get_labels_by_project(db, project_id)}
+        created = []
+        for class_name in dict.fromkeys(class_names):
+            if class_name in existing:
+                continue
+            color = (colors or {}).get(class_name)
+            if not color:
+                color = f"#{random.randint(0, 255):02x}{random.randint(0, 255):02x}{random.randint(0, 255):02x}"
+            created.append(Label(name=class_name, color=color, project_id=project_id))
+        if created:
+            db.add_all(created)
+            await db.commit()
+        return created
@@ -3,20 +3,135 @@ Database configuration and initialization
 """
 
 import os
-from sqlalchemy import create_engine
+from typing import List, Tuple, Dict, Any, Optional, AsyncIterator
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
 from core.config import settings
 from .base import Base
 
+
+def sqlite_pragmas() -> List[Tuple[str, str]]:
+    """The SQLite performance profile from settings, as (pragma, value) pairs"""
+    return [
+        ("journal_mode", settings.DATABASE_SQLITE_JOURNAL_MODE),
+        ("synchronous", settings.DATABASE_SQLITE_SYNCHRONOUS),
+        ("busy_timeout", str(settings.DATABASE_SQLITE_BUSY_TIMEOUT_MS)),
+        ("mmap_size", str(settings.DATABASE_SQLITE_MMAP_SIZE)),
+        ("cache_size", str(-settings.DATABASE_SQLITE_CACHE_SIZE_KB)),  # Negative = KiB rather than pages
+        ("temp_store", settings.DATABASE_SQLITE_TEMP_STORE),
+    ]
+
+
+def _pool_options(url, queue_pool_class) -> Dict[str, Any]:
+    """Pool sized for many threads or tasks (in-memory SQLite keeps SQLAlchemy's default pool)"""
+    if url.drivername.startswith("sqlite") and (
+        url.database in (None, "", ":memory:") or url.query.get("mode") == "memory"
+    ):
+        return {}
+    return {
+        "poolclass": queue_pool_class,
+        "pool_size": settings.DATABASE_POOL_SIZE,
+        "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+        "pool_timeout": settings.DATABASE_POOL_TIMEOUT
+    }
+
+
+def _apply_sqlite_profile(sync_engine: Engine) -> None:
+    """Run the sqlite_pragmas() profile on every new connection of an engine"""
+    pragmas = sqlite_pragmas()
+    
+    @event.listens_for(sync_engine, "connect")
+    def apply_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas:
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+def create_database_engine(database_url: str, sqlite_tuned: Optional[bool] = None) -> Engine:
+    """
+    Engine for database_url, pooled for many threads
+    
+    SQLite files get a QueuePool sized by DATABASE_POOL_SIZE and, unless
+    sqlite_tuned is False (default: DATABASE_SQLITE_TUNED), the pragmas of
+    sqlite_pragmas() on every new connection: WAL so readers never wait for
+    the writer, and a busy timeout so concurrent writers from uploads,
+    auto-labeling and releases queue for the lock instead of failing.
+    """
+    url = make_url(database_url)
+    is_sqlite = url.drivername.startswith("sqlite")
+    sync_engine = create_engine(
+        database_url,
+        connect_args={"check_same_thread": False} if is_sqlite else {},
+        **_pool_options(url, QueuePool)
+    )
+    if is_sqlite and (settings.DATABASE_SQLITE_TUNED if sqlite_tuned is None else sqlite_tuned):
+        _apply_sqlite_profile(sync_engine)
+    return sync_engine
+
+
+def async_database_url(database_url: str) -> str:
+    """DATABASE_ASYNC_URL, or database_url with the aiosqlite driver for SQLite"""
+    if settings.DATABASE_ASYNC_URL:
+        return settings.DATABASE_ASYNC_URL
+    url = make_url(database_url)
+    if url.drivername in ("sqlite", "sqlite+pysqlite"):
+        return url.set(drivername="sqlite+aiosqlite").render_as_string(hide_password=False)
+    if url.get_dialect().is_async:
+        return database_url
+    raise ValueError(f"Set DATABASE_ASYNC_URL to an async driver URL for {url.drivername}")
+
+
+def create_async_database_engine(database_url: str, sqlite_tuned: Optional[bool] = None) -> AsyncEngine:
+    """
+    Async engine for the same database as create_database_engine(database_url)
+    
+    Same pool sizing and SQLite profile; route handlers that await queries on
+    it leave the event loop free for other requests while SQLite works.
+    """
+    url = make_url(async_database_url(database_url))
+    is_sqlite = url.drivername.startswith("sqlite")
+    async_engine = create_async_engine(url, **_pool_options(url, AsyncAdaptedQueuePool))
+    if is_sqlite and (settings.DATABASE_SQLITE_TUNED if sqlite_tuned is None else sqlite_tuned):
+        _apply_sqlite_profile(async_engine.sync_engine)
+    return async_engine
+
+
 # Create database engine
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
-)
+engine = create_database_engine(settings.DATABASE_URL)
 
-# Create session factory
+# Create session factories
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# The async engine is created on first use, so processes that never await a
+# query (release worker, migration scripts) neither need an async driver nor
+# fail on a DATABASE_URL that has no async counterpart
+_async_engine: Optional[AsyncEngine] = None
+_async_session_factory: Optional[async_sessionmaker] = None
+
+
+def get_async_session_factory() -> async_sessionmaker:
+    """Session factory of the async engine, creating the engine on first call"""
+    global _async_engine, _async_session_factory
+    if _async_session_factory is None:
+        _async_engine = create_async_database_engine(settings.DATABASE_URL)
+        _async_session_factory = async_sessionmaker(_async_engine, autoflush=False, expire_on_commit=False)
+    return _async_session_factory
+
+
+async def dispose_async_engine() -> None:
+    """Close the async engine's pooled connections, if it was ever created"""
+    global _async_engine, _async_session_factory
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = _async_session_factory = None
+
+
 async def init_db():
     """Initialize database tables"""
     # Import all models here to ensure they are registered
@@ -24,11 +139,16 @@ async def init_db():
         Project, Dataset, Image, Annotation, 
         ModelUsage, AutoLabelJob,
         Label, DatasetSplit, LabelAnalytics,
-        Release, ImageTransformation  # Include new models
+        Release, ImageTransformation, ReleaseJob,  # Include new models
+        DerivedBlob, DerivedBlobReference, DerivedBlobKey
     )
     
     # Create all tables
     Base.metadata.create_all(bind=engine)
+    
+    # Indexes declared after a database was created are added here
+    from .index_migrations import create_missing_indexes
+    create_missing_indexes(engine)
     print("Database initialized successfully")
     
     # Create directories if they don't exist
@@ -42,4 +162,10 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """Get async database session (for async def route handlers)"""
+    async with get_async_session_factory()() as db:
+        yield db
@@ -0,0 +1,60 @@
+"""
+Index migration for Auto-Labeling-Tool
+Creates the indexes declared on the models that an existing database is missing
+"""
+
+import sys
+import logging
+from pathlib import Path
+from typing import List, Optional
+
+# Add backend directory to Python path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.engine import Engine
+
+from core.config import settings
+from database.base import Base
+import database.models  # noqa: F401  (registers the tables on Base.metadata)
+
+logger = logging.getLogger(__name__)
+
+
+def create_missing_indexes(engine: Optional[Engine] = None) -> List[str]:
+    """
+    Create every index declared in database/models.py that the database lacks
+
+    create_all only indexes tables it creates, so databases made before an
+    index was declared need this. Tables that do not exist yet are skipped
+    (create_all builds them with their indexes).
+
+    Returns:
+        Names of the indexes created
+    """
+    engine = engine or create_engine(settings.DATABASE_URL)
+    created = []
+    with engine.begin() as connection:
+        inspector = inspect(connection)
+        existing_tables = set(inspector.get_table_names())
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            existing_indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+            for index in sorted(table.indexes, key=lambda index: index.name):
+                if index.name in existing_indexes:
+                    continue
+                logger.info(f"Creating index {index.name} on {table.name}")
+                index.create(bind=connection)
+                created.append(index.name)
+
+    if created:
+        logger.info(f"Created {len(created)} missing indexes")
+    return created
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    names = create_missing_indexes()
+    print(f"Created {len(names)} indexes: {', '.join(names)}" if names else "All indexes already exist")
@@ -146,7 +146,22 @@ def run_migrations():
             else:
                 logger.info("export_jobs table does not exist, skipping")
             
+            # Migration 7: Add pipeline_stats column to release_jobs table
+            result = session.execute(text("PRAGMA table_info(release_jobs)"))
+            job_columns = [row[1] for row in result.fetchall()]
+            
+            if job_columns and 'pipeline_stats' not in job_columns:
+                logger.info("Adding pipeline_stats column to release_jobs table")
+                session.execute(text("ALTER TABLE release_jobs ADD COLUMN pipeline_stats JSON"))
+                logger.info("pipeline_stats column added to release_jobs table successfully")
+            else:
+                logger.info("pipeline_stats column already exists in release_jobs table (or no table yet), skipping")
+            
             session.commit()
+            
+            # Migration 8: Indexes declared on the models (image pagination included) that the database lacks
+            from database.index_migrations import create_missing_indexes
+            create_missing_indexes(engine)
             logger.info("All migrations completed successfully")
                 
         except Exception as e:
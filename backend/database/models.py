@@ -3,7 +3,7 @@ Database models for the Auto-Labeling Tool
 Defines all database tables and relationships
 """
 
-from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, Text, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, Text, ForeignKey, JSON, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from datetime import datetime
@@ -104,6 +104,16 @@ class Image(Base):
     # Relationships
     annotations = relationship("Annotation", back_populates="image", cascade="all, delete-orphan")
     
+    # Keyset pagination of image listings (database.operations.IMAGE_PAGE_ORDER),
+    # release image selection and split/labeled counts; every index leads with
+    # dataset_id, so plain dataset_id lookups use them too
+    __table_args__ = (
+        Index("ix_images_dataset_created", "dataset_id", "created_at", "id"),
+        Index("ix_images_created", "created_at", "id"),
+        Index("ix_images_dataset_split", "dataset_id", "split_type", "split_section"),
+        Index("ix_images_dataset_labeled", "dataset_id", "is_labeled"),
+    )
+    
     @property
     def normalized_file_path(self):
         """
@@ -150,10 +160,10 @@ class Annotation(Base):
     __tablename__ = "annotations"
     
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    image_id = Column(String, ForeignKey("images.id"), nullable=False)
+    image_id = Column(String, ForeignKey("images.id"), nullable=False, index=True)
     
     # Annotation data
-    class_name = Column(String(100), nullable=False)
+    class_name = Column(String(100), nullable=False, index=True)
     class_id = Column(Integer, nullable=False)
     confidence = Column(Float, default=1.0)
     
@@ -262,6 +272,11 @@ class ImageTransformation(Base):
     # Relationship to Release
     release = relationship("Release", back_populates="transformations")
     
+    # Loading a release version's (enabled, completed) transformations
+    __table_args__ = (
+        Index("ix_image_transformations_version", "release_version", "status", "is_enabled"),
+    )
+    
     def __repr__(self):
         return f"<ImageTransformation(id='{self.id}', type='{self.transformation_type}', version='{self.release_version}', status='{self.status}', dual_value='{self.is_dual_value}')>"
 
@@ -305,6 +320,77 @@ class AutoLabelJob(Base):
         return f"<AutoLabelJob(id='{self.id}', dataset='{self.dataset_id}', status='{self.status}')>"
 
 
+class ReleaseJob(Base):
+    """Queued release generation job, claimed and run by a release worker process"""
+    __tablename__ = "release_jobs"
+    
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
+    release_id = Column(String, ForeignKey("releases.id"), nullable=True)  # Set once the release record exists
+    
+    # Job configuration
+    release_version = Column(String(100), nullable=False)
+    config = Column(JSON, nullable=False)  # Serialized ReleaseConfig
+    
+    # Job status
+    status = Column(String(20), default="queued", index=True)  # queued, running, completed, failed
+    worker_id = Column(String(100), nullable=True)
+    attempts = Column(Integer, default=0)
+    
+    # Progress (published by the worker, readable from any API process)
+    progress_percentage = Column(Float, default=0.0)
+    current_step = Column(String(50), default="queued")
+    total_images = Column(Integer, default=0)
+    processed_images = Column(Integer, default=0)
+    generated_images = Column(Integer, default=0)
+    pipeline_stats = Column(JSON, nullable=True)  # Per-stage throughput counters of the release pipeline
+    
+    # Error handling
+    error_message = Column(Text, nullable=True)
+    
+    # Timestamps
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
+    completed_at = Column(DateTime, nullable=True)
+    
+    def __repr__(self):
+        return f"<ReleaseJob(id='{self.id}', release='{self.release_id}', status='{self.status}')>"
+
+
+class DerivedBlob(Base):
+    """Content-addressed derived image (release output, converted original or preview) in the blob store"""
+    __tablename__ = "derived_blobs"
+    
+    digest = Column(String(64), primary_key=True)  # SHA-256 of the file content
+    extension = Column(String(10), nullable=False)  # e.g. ".jpg"
+    size_bytes = Column(Integer, nullable=False)
+    ref_count = Column(Integer, default=0, index=True)  # Owners (releases) still using the blob
+    
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_accessed_at = Column(DateTime, default=datetime.utcnow, index=True)  # Garbage collection evicts LRU first
+    
+    def __repr__(self):
+        return f"<DerivedBlob(digest='{self.digest}', refs={self.ref_count}, size={self.size_bytes})>"
+
+
+class DerivedBlobReference(Base):
+    """One owner (e.g. "release:<id>") holding a derived blob"""
+    __tablename__ = "derived_blob_refs"
+    
+    owner = Column(String(100), primary_key=True)
+    digest = Column(String(64), ForeignKey("derived_blobs.digest"), primary_key=True, index=True)
+
+
+class DerivedBlobKey(Base):
+    """How a blob was derived (source + recipe hash), so the same derivation is computed once"""
+    __tablename__ = "derived_blob_keys"
+    
+    key = Column(String(64), primary_key=True)
+    digest = Column(String(64), ForeignKey("derived_blobs.digest"), nullable=False, index=True)
+    meta = Column(JSON, nullable=True)  # Extra facts about the derivation (e.g. preview dimensions)
+
+
 
 
 
@@ -3,12 +3,14 @@ Database operations for the Auto-Labeling Tool
 CRUD operations for all models
 """
 
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func, desc
-from typing import List, Optional, Dict, Any
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import and_, or_, func, desc, DateTime, String, type_coerce
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
 import uuid
 import os
+import json
+import base64
 from pathlib import Path
 
 from .models import (
@@ -19,6 +21,104 @@ from .models import (
 from core.config import settings
 
 
+def encode_cursor(values: List[Any]) -> str:
+    """Opaque page cursor holding the sort key of the last row of a page"""
+    payload = json.dumps([value.isoformat() if isinstance(value, datetime) else value for value in values])
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str, columns: List[Any]) -> List[Any]:
+    """Sort key stored in a cursor, converted back to the columns' types"""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, UnicodeError):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    if not isinstance(values, list) or len(values) != len(columns):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return [
+        datetime.fromisoformat(value) if isinstance(column.type, DateTime) and value is not None else value
+        for column, value in zip(columns, values)
+    ]
+
+
+def keyset_sort_keys(order_columns: List[Any]) -> List[Any]:
+    """
+    The sort columns as the database compares them
+    
+    SQLite keeps datetimes as text and sorts them as text, but not all with
+    the same precision: func.now() defaults are stored as
+    'YYYY-MM-DD HH:MM:SS' and Python datetimes with microseconds. A bound
+    datetime always carries microseconds, so cursors hold and compare the
+    stored text instead.
+    """
+    return [type_coerce(column, String) if isinstance(column.type, DateTime) else column
+            for column in order_columns]
+
+
+def keyset_columns(order_columns: List[Any]) -> List[Any]:
+    """keyset_sort_keys labeled for selecting next to a page's entities (cursor values)"""
+    return [key.label(f"keyset_{i}") for i, key in enumerate(keyset_sort_keys(order_columns))]
+
+
+def keyset_condition(order_columns: List[Any], cursor: str):
+    """
+    Filter selecting the rows after the cursor in order_columns order
+    
+    Row-value comparison (a, b) > (x, y), spelled out for every backend.
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    keys = keyset_sort_keys(order_columns)
+    values = decode_cursor(cursor, keys)
+    conditions = []
+    for i, key in enumerate(keys):
+        conditions.append(and_(*[keys[j] == values[j] for j in range(i)], key > values[i]))
+    return or_(*conditions)
+
+
+def keyset_page(rows: List[Any], order_columns: List[Any], limit: int) -> Tuple[List[Any], Optional[str]]:
+    """
+    Trim limit + 1 fetched rows to a page and the cursor of the next one (None on the last page)
+    
+    Rows are fetched with keyset_columns(order_columns) appended; those
+    columns are dropped again, leaving the entity (or tuple) selected.
+    """
+    key_count = len(order_columns)
+    next_cursor = encode_cursor(list(rows[limit - 1][-key_count:])) if len(rows) > limit else None
+    page = [row[0] if len(row) == key_count + 1 else tuple(row[:-key_count]) for row in rows[:limit]]
+    return page, next_cursor
+
+
+def keyset_paginate(query, order_columns: List[Any], limit: int, cursor: Optional[str] = None,
+                    offset: int = 0) -> Tuple[List[Any], Optional[str]]:
+    """
+    One page of an ascending query ordered by order_columns (the last one unique)
+    
+    With a cursor, the page starts right after the row the cursor was taken
+    from, which the database finds by index however deep the page is; without
+    one, offset is applied. Listings use IMAGE_PAGE_ORDER for images, backed
+    by the (dataset_id, created_at, id) and (created_at, id) indexes.
+    
+    Returns:
+        (rows, cursor of the next page or None on the last page)
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    query = query.add_columns(*keyset_columns(order_columns)).order_by(*order_columns)
+    if cursor:
+        query = query.filter(keyset_condition(order_columns, cursor))
+    elif offset:
+        query = query.offset(offset)
+    
+    return keyset_page(query.limit(limit + 1).all(), order_columns, limit)
+
+
+# Stable order of every image listing (oldest first); cursors hold these values
+IMAGE_PAGE_ORDER = [Image.created_at, Image.id]
+
+
 class ProjectOperations:
     """CRUD operations for Project model"""
     
@@ -271,15 +371,86 @@ class ImageOperations:
         dataset_id: str, 
         skip: int = 0, 
         limit: int = 100,
-        labeled_only: bool = None
+        labeled_only: bool = None,
+        cursor: Optional[str] = None
     ) -> List[Image]:
-        """Get images for a dataset with optional filtering"""
+        """Get images for a dataset with optional filtering (oldest first)"""
+        return ImageOperations.get_images_by_dataset_page(
+            db, dataset_id, limit=limit, cursor=cursor, skip=skip, labeled_only=labeled_only
+        )[0]
+    
+    @staticmethod
+    def get_images_by_dataset_page(
+        db: Session,
+        dataset_id: str,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        skip: int = 0,
+        labeled_only: bool = None,
+        split_section: Optional[str] = None
+    ) -> Tuple[List[Image], Optional[str]]:
+        """
+        One page of a dataset's images, oldest first
+        
+        Returns:
+            (images, cursor of the next page or None)
+        """
         query = db.query(Image).filter(Image.dataset_id == dataset_id)
         
         if labeled_only is not None:
             query = query.filter(Image.is_labeled == labeled_only)
+        if split_section:
+            query = query.filter(Image.split_section == split_section)
+        
+        return keyset_paginate(query, IMAGE_PAGE_ORDER, limit, cursor, skip)
+    
+    @staticmethod
+    def count_images_by_dataset(
+        db: Session,
+        dataset_id: str,
+        labeled_only: bool = None,
+        split_section: Optional[str] = None
+    ) -> int:
+        """Number of images get_images_by_dataset_page pages through"""
+        query = db.query(func.count(Image.id)).filter(Image.dataset_id == dataset_id)
         
-        return query.offset(skip).limit(limit).all()
+        if labeled_only is not None:
+            query = query.filter(Image.is_labeled == labeled_only)
+        if split_section:
+            query = query.filter(Image.split_section == split_section)
+        
+        return query.scalar() or 0
+    
+    @staticmethod
+    def get_project_images_page(
+        db: Session,
+        project_id: Any,
+        limit: int = 50,
+        offset: int = 0,
+        split_type: Optional[str] = None,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Tuple[Image, str]], int, Optional[str]]:
+        """
+        One page of a project's images, oldest first, with annotations loaded
+        
+        Filtering, counting and paging all run in SQL, and the annotations of
+        the page come from one extra IN query, so a page costs three queries
+        however large the project is.
+        
+        Returns:
+            ([(image, dataset_name), ...], total matching images, next page cursor or None)
+        """
+        query = db.query(Image, Dataset.name).join(Dataset, Image.dataset_id == Dataset.id).filter(
+            Dataset.project_id == project_id
+        )
+        if split_type:
+            query = query.filter(Image.split_type == split_type)
+        
+        total = query.with_entities(func.count(Image.id)).scalar() or 0
+        rows, next_cursor = keyset_paginate(
+            query.options(selectinload(Image.annotations)), IMAGE_PAGE_ORDER, limit, cursor, offset
+        )
+        return [(image, dataset_name) for image, dataset_name in rows], total, next_cursor
     
     @staticmethod
     def update_image_status(
@@ -25,7 +25,7 @@ from api.routes import analytics, augmentation, dataset_management
 from api.routes import image_transformations, logs
 from api import active_learning
 from core.config import settings
-from database.database import init_db
+from database.database import init_db, dispose_async_engine
 from utils.logger import sya_logger, log_info, log_error
 import time
 
@@ -318,11 +318,23 @@ async def startup_event():
     })
     await init_db()
     log_info("✅ Database initialized successfully")
+    
+    # Release jobs normally run in release_worker.py; embed one for single-process setups
+    if settings.RELEASE_EMBEDDED_WORKER:
+        from core.release_jobs import start_embedded_worker
+        app.state.release_worker = start_embedded_worker()
+        log_info("✅ Embedded release worker started")
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown"""
     log_info("🛑 SYA Backend shutting down")
+    release_worker = getattr(app.state, "release_worker", None)
+    if release_worker:
+        release_worker.stop()
+    
+    # Close pooled async connections (each holds a driver thread)
+    await dispose_async_engine()
 
 if __name__ == "__main__":
     # Run the application
@@ -0,0 +1,43 @@
+"""
+Release worker for Auto-Labeling-Tool
+Run this script next to the API server to process queued release generation jobs
+"""
+
+import argparse
+import asyncio
+import logging
+import signal
+import sys
+from pathlib import Path
+
+# Add the backend directory to Python path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from core.config import settings
+from core.release_jobs import ReleaseJobWorker
+from database.database import init_db
+
+
+def main():
+    """Start a release worker"""
+    parser = argparse.ArgumentParser(description="Process queued release generation jobs")
+    parser.add_argument("--concurrency", type=int, default=settings.RELEASE_JOB_CONCURRENCY,
+                        help="Release jobs to run at once")
+    parser.add_argument("--poll-interval", type=float, default=settings.RELEASE_JOB_POLL_INTERVAL,
+                        help="Seconds between queue polls when idle")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    # Make sure the job table exists
+    asyncio.run(init_db())
+
+    worker = ReleaseJobWorker(concurrency=args.concurrency, poll_interval=args.poll_interval)
+    signal.signal(signal.SIGTERM, lambda signum, frame: worker.stop())
+    signal.signal(signal.SIGINT, lambda signum, frame: worker.stop())
+    worker.run_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@ Ensures 100% compatibility across Windows, macOS, and Linux
 """
 
 import os
+import shutil
 from pathlib import Path
 from typing import Union, Optional
 from core.config import settings
@@ -125,6 +126,38 @@ class PathManager:
         path_obj.mkdir(parents=True, exist_ok=True)
         return path_obj
     
+    @staticmethod
+    def link_or_copy(source: Union[str, Path], destination: Union[str, Path]) -> str:
+        """
+        Materialize source at destination without duplicating bytes where possible
+        Tries a hardlink, then a copy-on-write reflink (Linux FICLONE), then a plain copy
+        Returns the method used: "hardlink", "reflink" or "copy"
+        """
+        source = str(source)
+        destination = str(destination)
+        if os.path.lexists(destination):
+            os.remove(destination)
+        
+        try:
+            os.link(source, destination)
+            return "hardlink"
+        except OSError:
+            pass
+        
+        try:
+            import fcntl
+            FICLONE = 0x40049409
+            with open(source, 'rb') as src, open(destination, 'wb') as dst:
+                fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            shutil.copystat(source, destination)
+            return "reflink"
+        except (ImportError, OSError):
+            if os.path.exists(destination):
+                os.remove(destination)
+        
+        shutil.copy2(source, destination)
+        return "copy"
+    
     @staticmethod
     def get_web_url(relative_path: str) -> str:
         """
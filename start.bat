@@ -34,6 +34,10 @@ timeout /t 5 /nobreak > nul
 
 echo ✅ Backend started on port 12000
 
+REM Start the release worker (runs queued release generation jobs)
+echo Starting release worker...
+start /B python release_worker.py > ..\logs\release_worker.log 2>&1
+
 REM Start frontend
 cd ..\frontend
 echo 2. Starting Frontend Server...
@@ -63,6 +67,7 @@ echo API Docs:     http://localhost:12000/docs
 echo.
 echo Logs:
 echo   Backend:  logs\backend.log
+echo   Release worker: logs\release_worker.log
 echo   Frontend: logs\frontend.log
 echo.
 echo Press any key to stop both servers...
@@ -18,6 +18,7 @@ from pathlib import Path
 class AutoLabelingToolLauncher:
     def __init__(self):
         self.backend_process = None
+        self.release_worker_process = None
         self.frontend_process = None
         self.is_windows = platform.system() == "Windows"
         self.project_root = Path(__file__).parent
@@ -351,6 +352,15 @@ class AutoLabelingToolLauncher:
             time.sleep(1)
             if self.check_port(12000):
                 self.print_colored("✅ Backend started successfully on port 12000", "green")
+                
+                # Release generation requests are queued; this process runs them
+                self.print_colored("Starting release worker...", "green")
+                self.release_worker_process = subprocess.Popen(
+                    [str(python_exe), "release_worker.py"],
+                    cwd=str(backend_dir),
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL
+                )
                 return True
         
         self.print_colored("❌ Backend failed to start", "red")
@@ -549,6 +559,13 @@ class AutoLabelingToolLauncher:
             except subprocess.TimeoutExpired:
                 self.backend_process.kill()
         
+        if self.release_worker_process:
+            self.release_worker_process.terminate()
+            try:
+                self.release_worker_process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.release_worker_process.kill()
+        
         if self.frontend_process:
             self.frontend_process.terminate()
             try:
@@ -607,6 +624,9 @@ class AutoLabelingToolLauncher:
                     if self.backend_process and self.backend_process.poll() is not None:
                         self.print_colored("Backend process died unexpectedly", "red")
                         break
+                    if self.release_worker_process and self.release_worker_process.poll() is not None:
+                        self.print_colored("Release worker process died unexpectedly", "red")
+                        break
                     if self.frontend_process and self.frontend_process.poll() is not None:
                         self.print_colored("Frontend process died unexpectedly", "red")
                         break